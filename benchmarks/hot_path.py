@@ -0,0 +1,184 @@
+'''
+Micro-benchmarks of the polling hot path, for all of the timer classes
+
+    python3 -m benchmarks.hot_path > bench.json # machine-readable results on stdout
+    python3 -m benchmarks.hot_path --compare old-bench.json # also, exit 1 on a regression
+    make bench
+
+For each case:
+    ns_per_call: best of several runs, with the loop overhead subtracted
+    retained_blocks_per_call: memory blocks still allocated after many calls (leaks)
+
+Temporary allocations aren't reported: CPython reuses freed floats (a freelist)
+without going through the allocator, so tracemalloc sees 0 bytes for a call that
+makes new floats. On circuitpython, gc.mem_free() around a loop shows them.
+
+Cases: not-due and firing calls for every.Every, every.Timer, a patterned Every,
+the lightweight Every and Timer; construction; and `.interval =`.
+"Firing" cases pass an explicit `now` that steps by the interval, so every call fires.
+'''
+
+import sys, time, json, platform, gc
+from every.every import Every, Timer, SlottedEvery
+from every import lightweight_every, lightweight_timer
+
+Calls = 20000
+Repeats = 7
+
+def looper(fn, args_list):
+    # returns a function that calls fn once per args, in a loop
+    def run():
+        for args in args_list:
+            fn(*args)
+    return run
+
+def best_ns(setup):
+    # setup() -> (function, list of args): a fresh state for each run
+    best = None
+    for repeat in range(Repeats):
+        fn, args_list = setup()
+        run = looper(fn, args_list)
+        empty = looper(lambda *args: None, args_list)
+        gc.disable()
+        try:
+            start = time.perf_counter_ns()
+            run()
+            elapsed = time.perf_counter_ns() - start
+            start = time.perf_counter_ns()
+            empty()
+            overhead = time.perf_counter_ns() - start
+        finally:
+            gc.enable()
+        ns = max(0, elapsed - overhead) / len(args_list)
+        best = ns if best is None else min(best, ns)
+    return best
+
+def retained_blocks(setup):
+    # net memory blocks per call, after many calls
+    fn, args_list = setup()
+    # warm up, e.g. lazy imports, caches
+    for args in args_list[:10]:
+        fn(*args)
+    args_list = args_list[10:]
+
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    results = [ fn(*args) for args in args_list ]
+    del results
+    gc.collect()
+    return (sys.getallocatedblocks() - blocks) / len(args_list)
+
+# Each case is a setup function returning (function, list of args)
+
+def not_due(make):
+    def setup():
+        an_every = make()
+        now = an_every.clock.now()
+        an_every.start(now) if hasattr(an_every, 'start') else an_every(now) # get past the instant fire
+        return an_every, [ () ] * Calls
+    return setup
+
+def firing(make, intervals):
+    # each call is given a `now` that is exactly the next interval later
+    def setup():
+        an_every = make()
+        now = 1000.0
+        an_every.start(now) if hasattr(an_every, 'start') else an_every(now)
+        an_every.last = now
+        nows = []
+        for x in range(Calls):
+            now += intervals[ x % len(intervals) ]
+            nows.append( (now,) )
+        return an_every, nows
+    return setup
+
+def timer_fire(make):
+    # a Timer only fires once, so: .start() then the call that fires
+    def setup():
+        a_timer = make()
+        def start_and_fire(now):
+            a_timer.start(now)
+            return a_timer(now + 1)
+        return start_and_fire, [ (1000.0 + x,) for x in range(Calls) ]
+    return setup
+
+def construct(a_class, *args):
+    def setup():
+        return a_class, [ args ] * Calls
+    return setup
+
+def set_interval(value):
+    def setup():
+        an_every = Every(0.5)
+        def assign(v):
+            an_every.interval = v
+        return assign, [ (value,) ] * Calls
+    return setup
+
+Cases = [
+    ( 'Every not-due', not_due( lambda: Every(1000) ) ),
+    ( 'Every firing', firing( lambda: Every(1), (1,) ) ),
+    ( 'Timer not-running', ( lambda: (Timer(1000), [ () ] * Calls) ) ),
+    ( 'Timer not-due', not_due( lambda: Timer(1000) ) ),
+    ( 'Timer start+fire', timer_fire( lambda: Timer(1) ) ),
+    ( 'Every pattern not-due', not_due( lambda: Every(1000, 0.1, 0.2, 0.3) ) ),
+    ( 'Every pattern firing', firing( lambda: Every(0.5, 0.1, 0.2, 0.3), (0.5, 0.1, 0.2, 0.3) ) ),
+    ( 'lightweight Every not-due', not_due( lambda: lightweight_every.Every(1000) ) ),
+    ( 'lightweight Every firing', firing( lambda: lightweight_every.Every(1), (1,) ) ),
+    ( 'lightweight Timer not-due', not_due( lambda: lightweight_timer.Timer(1000) ) ),
+    ( 'lightweight Timer start+fire', timer_fire( lambda: lightweight_timer.Timer(1) ) ),
+    ( 'construct Every(0.5)', construct(Every, 0.5) ),
+    ( 'construct Every(0.5, 0.1)', construct(Every, 0.5, 0.1) ),
+    ( 'construct SlottedEvery(0.5)', construct(SlottedEvery, 0.5) ),
+    ( 'construct Timer(1)', construct(Timer, 1) ),
+    ( 'construct lightweight Every', construct(lightweight_every.Every, 0.5) ),
+    ( 'construct lightweight Timer', construct(lightweight_timer.Timer, 1) ),
+    ( '.interval = 0.3', set_interval(0.3) ),
+    ( '.interval = (0.3, 0.1)', set_interval( (0.3, 0.1) ) ),
+    ]
+
+def run(cases=Cases):
+    results = {}
+    for name, setup in cases:
+        retained = retained_blocks(setup)
+        results[name] = {
+            'ns_per_call' : round( best_ns(setup), 1 ),
+            'retained_blocks_per_call' : round(retained, 3),
+            }
+        print( "%-30s %8.1f ns %8.3f blocks retained" % (name, results[name]['ns_per_call'], retained), file=sys.stderr )
+    return {
+        'python' : platform.python_version(),
+        'implementation' : platform.python_implementation(),
+        'machine' : platform.machine(),
+        'results' : results,
+        }
+
+def compare(old, new, threshold):
+    # names of cases that got slower by more than threshold (e.g. 1.25 = 25%), or started leaking
+    regressions = []
+    for name, result in new['results'].items():
+        was = old['results'].get(name)
+        if was is None:
+            continue
+        if result['ns_per_call'] > was['ns_per_call'] * threshold:
+            regressions.append( "%s: %s ns, was %s" % (name, result['ns_per_call'], was['ns_per_call']) )
+        if result['retained_blocks_per_call'] > was['retained_blocks_per_call'] + 0.5:
+            regressions.append( "%s: retains %s blocks per call, was %s" % (name, result['retained_blocks_per_call'], was['retained_blocks_per_call']) )
+    return regressions
+
+def main(argv):
+    results = run()
+    json.dump(results, sys.stdout, indent=2)
+    print()
+    if '--compare' in argv:
+        old_file = argv[ argv.index('--compare') + 1 ]
+        threshold = float( argv[ argv.index('--threshold') + 1 ] ) if '--threshold' in argv else 1.25
+        with open(old_file) as f:
+            regressions = compare( json.load(f), results, threshold )
+        for regression in regressions:
+            print("REGRESSION", regression, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit( main(sys.argv[1:]) )
@@ -0,0 +1,75 @@
+'''
+Benchmark: lateness of fast callbacks, when some callbacks are slow, inline vs. thread pool
+
+    python3 -m benchmarks.pool_lateness [seconds]
+
+Fast: 20 Every(0.01) with a trivial callback.
+Slow: 2 Every(0.1) whose callback sleeps 0.05 (like blocking I/O).
+Run for a few seconds with Scheduler (callbacks inline) and PoolScheduler (callbacks in threads).
+Lateness is measured when each fast callback starts: how long after its (most recent) deadline.
+Whole intervals that were missed don't show up in the lateness, but in the fire count.
+Prints the p50/p99/max lateness in milliseconds, and how many fast fires happened vs. expected.
+'''
+
+import sys, time
+from every.every import Every
+from every.scheduler import Scheduler
+from every.pool import PoolScheduler
+
+Fast = 20
+FastInterval = 0.01
+Slow = 2
+SlowInterval = 0.1
+SlowWork = 0.05
+
+def percentile(values, p):
+    if not values:
+        return 0
+    values = sorted(values)
+    return values[ min( len(values) - 1, int(p * len(values)) ) ]
+
+def run(scheduler, duration):
+    lateness = []
+    start = time.monotonic()
+
+    def fast(an_every):
+        # the deadlines are start + k * FastInterval
+        late = (time.monotonic() - start) % FastInterval
+        lateness.append(late)
+
+    def slow(an_every):
+        time.sleep(SlowWork)
+
+    everies = [ scheduler.add( Every(FastInterval), fast ) for x in range(Fast) ]
+    everies += [ scheduler.add( Every(SlowInterval), slow ) for x in range(Slow) ]
+    for an_every in everies:
+        scheduler.start(an_every, start)
+
+    while time.monotonic() - start < duration:
+        scheduler.run_pending()
+        scheduler.wait(max_sleep=0.01)
+    if isinstance(scheduler, PoolScheduler):
+        scheduler.shutdown()
+
+    expected = Fast * int(duration / FastInterval)
+    return lateness, expected
+
+def main(argv):
+    duration = float(argv[0]) if argv else 3.0
+    print( "%-28s %8s %8s %8s %14s" % ('', 'p50 ms', 'p99 ms', 'max ms', 'fast fires') )
+    for name, scheduler in (
+            ('Scheduler (inline)', Scheduler()),
+            ('PoolScheduler(4 workers)', PoolScheduler(max_workers=4)),
+            ):
+        lateness, expected = run(scheduler, duration)
+        print( "%-28s %8.3f %8.3f %8.3f %6d/%-7d" % (
+            name,
+            percentile(lateness, 0.5) * 1000,
+            percentile(lateness, 0.99) * 1000,
+            max(lateness, default=0) * 1000,
+            len(lateness), expected,
+            ))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit( main(sys.argv[1:]) )
@@ -0,0 +1,59 @@
+'''
+Benchmark: throughput of CPU-heavy callbacks, vs. the number of shards (processes)
+
+    python3 -m benchmarks.shards_throughput [seconds]
+
+32 Every(0.01), each callback burns about 2 ms of CPU, so they want ~6 cores.
+Runs with ShardedScheduler(processes=1, 2, 4, ... up to os.cpu_count()),
+and prints callbacks per second, the speedup over 1 shard, and the worst p99 lateness of the shards.
+It should scale roughly linearly till it runs out of cores (or out of demand).
+'''
+
+import sys, os, time
+from every.every import Every
+from every.shards import ShardedScheduler
+
+Jobs = 32
+Interval = 0.01
+Work = 0.002 # seconds of CPU per callback
+
+def burn(an_every):
+    end = time.process_time() + Work
+    while time.process_time() < end:
+        pass
+    return 1
+
+def run(processes, duration):
+    shards = ShardedScheduler(processes=processes, report=0.25)
+    try:
+        for x in range(Jobs):
+            shards.add( Every(Interval), burn )
+        shards.results(timeout=0.5) # let them get going
+        start = time.monotonic()
+        count = 0
+        while time.monotonic() - start < duration:
+            count += len( shards.results(timeout=0.05) )
+        elapsed = time.monotonic() - start
+    finally:
+        shards.shutdown()
+    p99 = max( [ snapshot['p99'] for snapshot in shards.stats().values() ], default=0 )
+    return count / elapsed, p99
+
+def main(argv):
+    duration = float(argv[0]) if argv else 3.0
+    counts = []
+    processes = 1
+    while processes <= (os.cpu_count() or 1):
+        counts.append(processes)
+        processes *= 2
+    print( "demand: %d callbacks/sec" % (Jobs / Interval) )
+    print( "%9s %14s %8s %12s" % ('processes', 'callbacks/sec', 'speedup', 'p99 late ms') )
+    single = None
+    for processes in counts:
+        rate, p99 = run(processes, duration)
+        single = rate if single is None else single
+        print( "%9d %14.0f %8.2f %12.3f" % (processes, rate, rate / single, p99 * 1000) )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit( main(sys.argv[1:]) )
@@ -0,0 +1,58 @@
+'''
+Benchmark: reading the clock once per pass of the loop, vs. once per object
+
+    python3 -m benchmarks.shared_now
+
+A loop with 200 objects, most of them not due. Each "pass" polls all of them:
+    own clock: yourobject() reads time.monotonic() itself, 200 reads per pass
+    shared now: now = time.monotonic(); yourobject(now), 1 read per pass
+Prints ns per pass, and the saving.
+'''
+
+import sys, time
+from every.every import Every
+from every.lightweight_every import Every as LightweightEvery
+from every.lightweight_timer import Timer as LightweightTimer
+
+Count = 200
+Passes = 2000
+
+def own_clock(everies):
+    for x in range(Passes):
+        for an_every in everies:
+            an_every()
+
+def shared_now(everies):
+    monotonic = time.monotonic
+    for x in range(Passes):
+        now = monotonic()
+        for an_every in everies:
+            an_every(now)
+
+def per_pass(fn, everies):
+    best = None
+    for trial in range(3):
+        start = time.perf_counter()
+        fn(everies)
+        elapsed = (time.perf_counter() - start) * 1e9 / Passes
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def make(a_class):
+    everies = [ a_class(10 + x) for x in range(Count) ]
+    for an_every in everies:
+        # get past the instant first fire, so they aren't due
+        an_every.start() if hasattr(an_every, 'start') else an_every()
+    return everies
+
+def main():
+    print("%d objects, ns per pass" % Count)
+    print("%-26s %12s %12s %8s" % ('class', 'own clock', 'shared now', 'saving'))
+    for name, a_class in ( ('every.Every', Every), ('lightweight_every.Every', LightweightEvery), ('lightweight_timer.Timer', LightweightTimer) ):
+        everies = make(a_class)
+        own = per_pass(own_clock, everies)
+        shared = per_pass(shared_now, everies)
+        print("%-26s %12.0f %12.0f %7.0f%%" % (name, own, shared, 100.0 * (own - shared) / own))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+'''
+Benchmark: large populations of one-shot timers
+    naive polling of every.Timer, vs. the every.scheduler heap, vs. the every.wheel timing wheel
+
+    python3 -m benchmarks.timer_population # 10^3 .. 10^5 timers
+    python3 -m benchmarks.timer_population 6 # up to 10^6 (needs a few GB of RAM)
+
+For each population, in ns per timer:
+    start: .start() every timer
+    restart: .start() every timer again, abandoning the first one
+    idle poll: one poll of the whole population when nothing is due (ns total, not per timer)
+    expire: one poll when every timer has expired
+'''
+
+import sys, time, random
+from every.every import Timer
+from every.scheduler import Scheduler
+from every.wheel import TimingWheel
+
+def ignore(a_timer):
+    pass
+
+class Naive(object):
+    # the usual main loop: call every Timer
+    def __init__(self, durations):
+        self.timers = [ Timer(d) for d in durations ]
+    def start(self, a_timer):
+        a_timer.start()
+    def poll(self):
+        for a_timer in self.timers:
+            a_timer()
+
+class Heap(object):
+    def __init__(self, durations):
+        self.scheduler = Scheduler()
+        self.timers = [ self.scheduler.add( Timer(d), ignore ) for d in durations ]
+    def start(self, a_timer):
+        self.scheduler.start(a_timer)
+    def poll(self):
+        self.scheduler.run_pending()
+
+class Wheel(object):
+    def __init__(self, durations):
+        self.wheel = TimingWheel(resolution=0.001)
+        self.timers = [ self.wheel.timer(d) for d in durations ]
+    def start(self, a_timer):
+        a_timer.start()
+    def poll(self):
+        self.wheel.advance()
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1e9
+
+def start_all(engine):
+    start = engine.start
+    for a_timer in engine.timers:
+        start(a_timer)
+
+def bench(engine_class, n):
+    results = {}
+
+    # long timeouts, so nothing expires while we measure
+    engine = engine_class( [ random.uniform(30, 60) for x in range(n) ] )
+    results['start'] = timed( lambda: start_all(engine) ) / n
+    results['restart'] = timed( lambda: start_all(engine) ) / n
+    results['idle poll'] = timed( engine.poll )
+    del engine
+
+    # short timeouts, then let them all expire
+    engine = engine_class( [ random.uniform(0.001, 0.02) for x in range(n) ] )
+    start_all(engine)
+    time.sleep(0.03)
+    results['expire'] = timed( engine.poll ) / n
+    return results
+
+def main(max_power=5):
+    print("%-8s %-6s %12s %12s %14s %12s" % ('n', 'engine', 'start ns', 'restart ns', 'idle poll ns', 'expire ns'))
+    for power in range(3, max_power+1):
+        n = 10 ** power
+        for engine_class in (Naive, Heap, Wheel):
+            results = bench(engine_class, n)
+            print("%-8s %-6s %12.0f %12.0f %14.0f %12.0f" % (
+                n, engine_class.__name__, results['start'], results['restart'], results['idle poll'], results['expire'] 
+                ))
+
+if __name__ == "__main__":
+    main( int(sys.argv[1]) if len(sys.argv) > 1 else 5 )
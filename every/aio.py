@@ -0,0 +1,64 @@
+'''
+# asyncio integration
+#
+# Instead of polling an Every in a `while True: await asyncio.sleep(0.001)` task,
+# wait for it with one event-loop timer (loop.call_at) per wait.
+
+from every.every import Every, Timer
+
+timeout = Timer(5)
+timeout.start()
+await timeout # returns .i, like after `if timeout():`
+
+async for i in Every(0.5, 0.1): # i is .i after each fire
+    if i == 0:
+        ...
+
+The object is still called to decide that it fired, so the drift-correction
+and pattern stepping are exactly those of Every.__call__.
+This is for regular python's asyncio (it needs loop.call_at()).
+'''
+
+import asyncio
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+async def next_fire(an_every):
+    # Wait till an_every fires, and return its .i
+    # Raises RuntimeError if it won't fire (a timer that isn't running).
+    # Works for anything with .remaining(), e.g. the lightweight versions.
+    loop = asyncio.get_running_loop()
+    while True:
+        remaining = an_every.remaining()
+        if remaining is None:
+            raise RuntimeError("Won't fire: not running (call .start())")
+        if remaining == 0 and an_every():
+            return getattr(an_every, 'i', None)
+        # the loop's clock may not be an_every's clock, so schedule relative to now.
+        # We may wake slightly early (loop clock resolution), then we just go around again.
+        future = loop.create_future()
+        handle = loop.call_at(loop.time() + remaining, _wake, future)
+        try:
+            await future
+        finally:
+            handle.cancel()
+
+class Steps(object):
+    # async iterator: each fire of an_every, till it stops (for timers)
+
+    def __init__(self, an_every):
+        self.an_every = an_every
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.an_every.remaining() is None:
+            raise StopAsyncIteration
+        try:
+            return await next_fire(self.an_every)
+        except RuntimeError:
+            # something else finished it while we waited
+            raise StopAsyncIteration
@@ -0,0 +1,113 @@
+'''
+# EveryArray
+#
+# A bank of N Every's, each with its own interval or pattern, polled with one call.
+# For big LED/actuator arrays, where calling N Every objects per frame is too slow.
+# Needs numpy (regular python).
+
+from every.array import EveryArray
+
+channels = EveryArray( [0.5, (0.5, 0.1), (1, 0)] ) # like Every(0.5), Every(0.5,0.1), Every(1,0)
+
+while(1):
+    fired = channels.poll() # boolean mask of the channels that fired
+    for channel in fired.nonzero()[0]:
+        ...channels.i[channel] is the .i of that channel...
+
+Each channel acts exactly like the Every made from the same pattern,
+including drift-correction, .i, and timers (trailing 0) that need .start().
+Patterns of different lengths are padded with 0 in the .intervals array (see .lengths).
+The state is in contiguous arrays: .intervals (N x longest), .lengths, .i, .last, .running
+'''
+
+import numpy
+from every.clock import monotonic_clock
+
+class EveryArray(object):
+    def __init__(self, patterns, now=None, clock=None):
+        # patterns: a list of numbers or tuples, each like the arguments to Every()
+        # clock: from every.clock, float seconds that don't wrap (the default, or VirtualClock)
+        self.clock = monotonic_clock if clock is None else clock
+        if now is None:
+            now = self.clock.now()
+        patterns = [ self._as_tuple(a_pattern) for a_pattern in patterns ]
+        count = len(patterns)
+        self.lengths = numpy.array( [ len(a_pattern) for a_pattern in patterns ], dtype=numpy.intp )
+        self.intervals = numpy.zeros( (count, max(self.lengths, default=1)), dtype=numpy.float64 )
+        for channel, a_pattern in enumerate(patterns):
+            self.intervals[channel, :len(a_pattern)] = a_pattern
+        self.rows = numpy.arange(count)
+
+        # like Every(): we pretend to start at the last interval, for the immediate-expire case
+        self.i = self.lengths - 1
+        self.last = now - self.intervals[self.rows, self.i]
+        # timers (final 0) don't run till .start
+        self.running = self.intervals[self.rows, self.i] != 0
+
+    @staticmethod
+    def _as_tuple(a_pattern):
+        if isinstance(a_pattern, tuple):
+            return a_pattern
+        elif isinstance(a_pattern, int) or isinstance(a_pattern, float):
+            return (a_pattern,)
+        raise Exception("each pattern must be a number or tuple")
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def set_interval(self, channel, a_pattern, now=None):
+        # like `.interval = a_pattern` for one channel
+        if now is None:
+            now = self.clock.now()
+        a_pattern = self._as_tuple(a_pattern)
+        if len(a_pattern) > self.intervals.shape[1]:
+            wider = numpy.zeros( (len(self), len(a_pattern)), dtype=numpy.float64 )
+            wider[:, :self.intervals.shape[1]] = self.intervals
+            self.intervals = wider
+        self.intervals[channel] = 0
+        self.intervals[channel, :len(a_pattern)] = a_pattern
+        self.lengths[channel] = len(a_pattern)
+        self.i[channel] = 0
+        self.last[channel] = now - a_pattern[0] # start immediatly
+        self.running[channel] = a_pattern[-1] != 0
+
+    def start(self, channels=None, now=None):
+        # like .start(), for some channels (an index, list, or mask), or all
+        if now is None:
+            now = self.clock.now()
+        if channels is None:
+            channels = slice(None)
+        self.last[channels] = now
+        self.running[channels] = True
+        self.i[channels] = 0
+
+    def deadlines(self):
+        # like .deadline() for each channel, but nan for "won't fire"
+        this_interval = self.intervals[self.rows, self.i]
+        when = self.last + this_interval
+        when[ ~self.running | (this_interval == 0) ] = numpy.nan
+        return when
+
+    def poll(self, now=None):
+        # Like calling each Every: returns a boolean mask of the channels whose interval expired
+        if now is None:
+            now = self.clock.now()
+        this_interval = self.intervals[self.rows, self.i]
+        diff = now - self.last
+        fired = self.running & (this_interval != 0) & (diff >= this_interval)
+
+        # only do the work for the ones that fired
+        channels = numpy.flatnonzero(fired)
+        if len(channels):
+            last_interval = this_interval[channels]
+            drift = numpy.remainder( diff[channels], last_interval )
+            next_i = (self.i[channels] + 1) % self.lengths[channels]
+            self.i[channels] = next_i
+            repeats = self.intervals[channels, next_i] != 0
+            self.last[channels] = numpy.where( repeats, now - drift, now )
+            self.running[channels] = repeats
+        return fired
+
+    def poll_indices(self, now=None):
+        # like .poll(), but the indices of the channels that fired
+        return numpy.flatnonzero( self.poll(now) )
@@ -0,0 +1,143 @@
+'''
+# Batcher
+#
+# "Flush the buffer every N seconds", with the bookkeeping done:
+# collect items, and hand them to your flush function as one list (one bulk write)
+# when the interval is up, or there are too many items (or bytes), whichever is first.
+
+from every.batch import Batcher
+
+def write_out(items):
+    log_file.write( "".join(items) )
+
+batch = Batcher( write_out, interval=1.0, max_items=500, max_bytes=64*1024, max_latency=0.25 )
+
+while(1):
+    if reading:
+        batch.add(reading) # may flush, when it's full
+    batch() # flushes when the interval is up, or an item has waited max_latency
+...
+batch.close() # the rest
+
+max_latency: a Timer, started by the first item into an empty batch, so no item waits
+longer than that (plus however late your loop calls batch()).
+Each flush restarts the interval.
+
+Back-pressure: normally flush() runs inline, so a slow flush just slows down your loop.
+With executor= (e.g. concurrent.futures.ThreadPoolExecutor), flushes run in the background,
+one at a time, and items keep collecting meanwhile. If they reach high_water,
+.add() waits for the running flush before starting the next: the producer slows to the speed of the flush.
+If an inline flush() raises, the items are put back, and the exception is raised by the
+.add()/batch()/.flush() that called it: the next flush tries them again.
+An exception in a background flush is raised by the next .add()/batch()/.flush() that looks at it
+(those items are gone: flush() had them).
+'''
+
+from every.every import Every, Timer
+from every.clock import monotonic_clock
+
+class Batcher(object):
+    def __init__(self, flush, interval=1.0, max_items=None, max_bytes=None, max_latency=None, executor=None, high_water=None, size=len, clock=None):
+        # flush( [item, ...] ) writes a batch
+        # interval: seconds between flushes, max_items/max_bytes: flush when there are this many
+        # max_latency: seconds an item may wait
+        # executor: run flushes in it, high_water: items before .add() waits for a running flush
+        # size(item) is its bytes, for max_bytes
+        self.flush_items = flush
+        self.clock = clock = monotonic_clock if clock is None else clock
+        self.every = Every(interval, clock=clock)
+        self.every.start() # no point in the instant fire, it's empty
+        self.latency = None if max_latency is None else Timer(max_latency, clock=clock)
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.size = size
+        self.executor = executor
+        self.high_water = high_water
+        self.items = []
+        self.bytes = 0 # only counted for max_bytes
+        self.wanted = False # a flush is due, but waiting for the running one
+        self.in_flight = None # the executor's future for the running flush
+        self.flushes = 0
+        self.stalls = 0 # times .add() had to wait for a running flush (back-pressure)
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, item, now=None):
+        # collect an item, True if that caused a flush
+        items = self.items
+        items.append(item)
+        if self.max_bytes is not None:
+            self.bytes += self.size(item)
+        if len(items) == 1 and self.latency is not None:
+            self.latency.start(now)
+
+        if self.high_water is not None and len(items) >= self.high_water:
+            return self._flush(now, wait=True)
+        if self.wanted or (self.max_items is not None and len(items) >= self.max_items) or (self.max_bytes is not None and self.bytes >= self.max_bytes):
+            return self._flush(now)
+        return False
+
+    def __call__(self, now=None):
+        # poll: flush if the interval is up, or an item has waited max_latency. True if it flushed
+        if now is None:
+            now = self.clock.now()
+        due = self.every(now)
+        if self.latency is not None and self.latency(now):
+            due = True
+        if (due or self.wanted) and self.items:
+            return self._flush(now)
+        return False
+
+    def flush(self, now=None):
+        # flush now (waits for a running flush first). True if there was anything to flush
+        if self.items:
+            return self._flush(now, wait=True)
+        self._wait()
+        return False
+
+    def close(self):
+        # flush the rest, and wait for it
+        self.flush()
+        self._wait()
+
+    def _wait(self):
+        # wait for the running flush, raises its exception
+        in_flight = self.in_flight
+        if in_flight is not None:
+            self.in_flight = None
+            in_flight.result()
+
+    def _flush(self, now, wait=False):
+        in_flight = self.in_flight
+        if in_flight is not None:
+            if not in_flight.done():
+                if not wait:
+                    # let the items collect, try again on the next .add() or poll
+                    self.wanted = True
+                    return False
+                self.stalls += 1
+            self._wait()
+
+        items = self.items
+        byte_count = self.bytes
+        self.items = []
+        self.bytes = 0
+        self.wanted = False
+        if self.latency is not None:
+            self.latency.running = False
+        self.every.start(now)
+        try:
+            if self.executor is None:
+                self.flush_items(items)
+            else:
+                self.in_flight = self.executor.submit(self.flush_items, items)
+        except Exception:
+            # not written: put them back (ahead of any added meanwhile), for the next flush
+            self.items = items + self.items
+            self.bytes += byte_count
+            if self.latency is not None:
+                self.latency.start(now)
+            raise
+        self.flushes += 1
+        return True
@@ -0,0 +1,116 @@
+# `clock
+# ====================================================
+#
+# Clocks (time sources) for Every/Timer, and the lightweight versions.
+#
+# The default is time.monotonic(), float seconds.
+# Integer clocks avoid float math: on circuitpython every float operation allocates,
+# and floats lose precision as uptime grows (after a few days, milliseconds are gone).
+#
+# from every.clock import NsClock, TicksMsClock
+# blink = Every(0.5, clock=TicksMsClock()) # micropython/circuitpython, integer milliseconds
+# blink = Every(0.5, clock=NsClock()) # regular python, integer nanoseconds
+#
+# For tests and simulations, VirtualClock only moves when you say:
+# clock = VirtualClock()
+# blink = Every(0.5, clock=clock)
+# clock.advance(0.5) # no waiting
+#
+# Intervals are still given in seconds. But, `.last`, `.deadline()`, and any `now` you pass in,
+# are in the clock's ticks (clock.now()).
+#
+# A clock has:
+#   .now() the current ticks
+#   .ticks(seconds), .seconds(ticks) to convert
+#   .period: 0 for clocks that never wrap around, else ticks wrap around to 0 at .period
+#   .diff(a, b) is a - b, and .add(a, b) is a + b, but wraparound-safe
+#   .sleep(seconds), used by wait() and Scheduler.wait()
+# Every checks .period, and only uses .diff/.add for clocks that wrap.
+
+import time
+
+class MonotonicClock(object):
+    # time.monotonic(), float seconds. The default.
+    period = 0
+    now = staticmethod(time.monotonic)
+    sleep = staticmethod(time.sleep)
+
+    def ticks(self, seconds):
+        return seconds
+
+    def seconds(self, ticks):
+        return ticks
+
+    def diff(self, a, b):
+        return a - b
+
+    def add(self, a, b):
+        return a + b
+
+class NsClock(MonotonicClock):
+    # time.monotonic_ns(), integer nanoseconds. Never loses precision, integer drift math.
+    def __init__(self):
+        self.now = time.monotonic_ns
+
+    def ticks(self, seconds):
+        return int(round(seconds * 1000000000))
+
+    def seconds(self, ticks):
+        return ticks / 1000000000
+
+class TicksMsClock(MonotonicClock):
+    # Integer milliseconds that wrap around:
+    # circuitpython's supervisor.ticks_ms(), or micropython's time.ticks_ms().
+    # They stay "small" ints, so no allocation, but they wrap (every ~6 days for circuitpython).
+    # Works across the wrap, as long as intervals are less than half the period.
+
+    def __init__(self, ticks_ms=None, period=None):
+        # you can supply your own ticks_ms function, and its period (a power of 2)
+        if ticks_ms is None:
+            try:
+                from supervisor import ticks_ms
+                period = 1 << 29
+            except ImportError:
+                ticks_ms = time.ticks_ms # micropython
+                period = time.ticks_add(0, -1) + 1
+        self.now = ticks_ms
+        self.period = period
+        self.mask = period - 1
+        self.half = period // 2
+
+    def ticks(self, seconds):
+        return int(round(seconds * 1000))
+
+    def seconds(self, ticks):
+        return ticks / 1000
+
+    def diff(self, a, b):
+        # signed a - b, across the wraparound
+        return ((a - b + self.half) & self.mask) - self.half
+
+    def add(self, a, b):
+        return (a + b) & self.mask
+
+class VirtualClock(MonotonicClock):
+    # Float seconds, like the default, but time only passes by .advance() (or .sleep()).
+    # For tests, and simulating hours of schedule in no time.
+    # Intervals that are exact in binary (0.5, 0.25, 1, 3...) keep the float math exact.
+    # Starting at 0.0 (the default) also helps: near 0, floats have lots of precision,
+    # so e.g. now - (now - 0.05) is still 0.05, and the instant first fire happens.
+
+    def __init__(self, start=0.0):
+        self.time = start
+
+    def now(self):
+        return self.time
+
+    def advance(self, seconds):
+        # returns the new now
+        self.time += seconds
+        return self.time
+
+    def sleep(self, seconds):
+        # so wait(..., clock=) and Scheduler.wait() advance the virtual time, instead of sleeping
+        self.time += seconds
+
+monotonic_clock = MonotonicClock() # the default
@@ -0,0 +1,114 @@
+# `debounce
+# ====================================================
+#
+# Edges from a noisy/held input, polled in your loop: Debounce and Throttle.
+# Built on the lightweight Timer, and nothing is allocated per call
+# (with an integer clock, e.g. TicksMsClock, on micro/circuit-python), so you can have dozens.
+#
+# touched = Debounce(0.05) # the pad has to be steady for 0.05 seconds
+# beep = Throttle(1.0) # at most once a second
+# while (1):
+#     if touched(cp.touch_A1): # True once, when the (debounced) value changes
+#         if touched.value:
+#             ...just touched...
+#         else:
+#             ...just released...
+#     if beep(cp.button_a): # True at most once a second, while held
+#         cp.play_tone(440, 0.1)
+#
+# Debounce(settle, leading=False): True when the input has changed, and stayed changed, for `settle` seconds.
+#   leading=True: True as soon as it changes (no delay), then ignores it for `settle` seconds.
+#   Works for any value (compared with !=), not just True/False. .value is the debounced value.
+# Throttle(interval, leading=True, trailing=True): True at most once per `interval`, when triggered.
+#   leading: the first trigger is True right away.
+#   trailing: if it was triggered again during the interval, it is True (once) at the end of the interval.
+
+from every.lightweight_timer import SlottedTimer
+
+class SlottedDebounce(object):
+    # No per-object __dict__, so smaller, but you can't add your own attributes.
+
+    __slots__ = ('timer', 'raw', 'value', 'leading')
+
+    def __init__(self, settle, value=False, leading=False, clock=None):
+        # Make an instance.
+        #   :settle in seconds
+        #   :value the initial value
+        #   :leading report the change immediately, then ignore changes for `settle`
+        #   :clock from every.clock, default is time.monotonic()
+        self.timer = SlottedTimer(settle, clock)
+        self.raw = value # the last input
+        self.value = value # the debounced one
+        self.leading = leading
+
+    def __call__(self, raw, now=None):
+        # True when the debounced .value changes
+        # now: a clock.now() you already have
+        timer = self.timer
+        if self.leading:
+            if timer.running:
+                timer(now) # the lockout may be over
+            if not timer.running and raw != self.value:
+                self.value = raw
+                timer.start(now) # lockout
+                return True
+            return False
+
+        # trailing: wait till it holds still
+        if raw != self.raw:
+            self.raw = raw
+            timer.start(now)
+            return False
+        if timer(now) and raw != self.value:
+            self.value = raw
+            return True
+        return False
+
+class Debounce(SlottedDebounce):
+    # The usual Debounce: you can add your own attributes
+    pass
+
+class SlottedThrottle(object):
+    # No per-object __dict__, so smaller, but you can't add your own attributes.
+
+    __slots__ = ('timer', 'leading', 'trailing', 'pending')
+
+    def __init__(self, interval, leading=True, trailing=True, clock=None):
+        # Make an instance.
+        #   :interval in seconds, at most one True per interval
+        #   :leading the first trigger is True right away
+        #   :trailing triggers during the interval give a True at its end
+        #   :clock from every.clock, default is time.monotonic()
+        if not (leading or trailing):
+            raise Exception("Throttle needs leading or trailing")
+        self.timer = SlottedTimer(interval, clock)
+        self.leading = leading
+        self.trailing = trailing
+        self.pending = False # triggered during the interval
+
+    def __call__(self, trigger=True, now=None):
+        # True at most once per interval
+        # trigger: e.g. a button, or event, this time through the loop
+        # now: a clock.now() you already have
+        timer = self.timer
+        if timer.running:
+            if trigger:
+                self.pending = True
+            if not timer(now):
+                return False
+            # the interval is over
+            if self.pending and self.trailing:
+                self.pending = False
+                timer.start(now)
+                return True
+            self.pending = False
+        if trigger:
+            timer.start(now)
+            if self.leading:
+                return True
+            self.pending = True
+        return False
+
+class Throttle(SlottedThrottle):
+    # The usual Throttle: you can add your own attributes
+    pass
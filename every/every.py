@@ -50,66 +50,401 @@ while (1):
 
 __version__ = "1.0"
 
-import time
+from every.clock import monotonic_clock
 
-class Every(object):
-    def __init__(self, *interval):
+# catch-up policies, for when a call is late by more than an interval (e.g. the loop stalled)
+COALESCE = 0 # fire once, drop the missed intervals (drift-correction), report them in .missed
+BURST = 1 # fire once per missed interval: each call is True till caught up
+SKIP = 2 # fire once, and jump .i straight to the step that "now" falls in
+
+class SlottedEvery(object):
+    # Every, without a per-object __dict__, so each object is smaller.
+    # But, you can't add your own attributes to it. Every and Timer are the usual (non-slotted) ones.
+
+    __slots__ = ('running', '__interval', 'i', 'last', 'clock', '_ticks', '_extra')
+
+    # True: every object gets .stats (every.stats.TimerStats) on its next fire
+    collect_stats = False
+
+    def __init__(self, *interval, clock=None, catchup=COALESCE):
         # Make an instance.
         #   :interval in seconds
+        #   :clock from every.clock, default is time.monotonic()
+        #   :catchup COALESCE, BURST, or SKIP
 
+        self.clock = monotonic_clock if clock is None else clock
+        self._extra = None # .stats, .catchup, .missed and ._offsets, only when they are needed
+        if catchup != COALESCE:
+            self.catchup = catchup
         self.running = True # modified by .interval=
         self.interval = interval
         # we pretend to start at last, for the immediate-expire case
-        self.i = len(self.interval)-1
-        self.last = time.monotonic() - interval[self.i] # start immediatly
+        self.i = len(self._ticks)-1
+        self.last = self.clock.add( self.clock.now(), -self._ticks[self.i] ) # start immediatly
 
     @property
     def interval(self):
         return self.__interval
 
+    # The rarely used state is kept in a side object (_Extra), made the first time one isn't the default
+    # (or the prefix sums are needed), so most objects don't pay for it.
+
+    def _more(self):
+        # the side object, made if needed
+        extra = self._extra
+        if extra is None:
+            extra = self._extra = _Extra()
+        return extra
+
+    @property
+    def stats(self):
+        # None, or every.stats.TimerStats(), to record lateness
+        extra = self._extra
+        return None if extra is None else extra.stats
+
+    @stats.setter
+    def stats(self, v):
+        if v is not None or self._extra is not None:
+            self._more().stats = v
+
+    @property
+    def catchup(self):
+        # COALESCE, BURST, or SKIP
+        extra = self._extra
+        return COALESCE if extra is None else extra.catchup
+
+    @catchup.setter
+    def catchup(self, v):
+        if v != COALESCE or self._extra is not None:
+            self._more().catchup = v
+
+    @property
+    def missed(self):
+        # intervals dropped at the last fire
+        extra = self._extra
+        return 0 if extra is None else extra.missed
+
+    @missed.setter
+    def missed(self, v):
+        if v or self._extra is not None:
+            self._more().missed = v
+
     @interval.setter
     def interval(self,v):
-        '''tolerate single value or tuple-pattern'''
+        '''tolerate single value or tuple-pattern, or a lazy source (iterable or function), or (source, 0)'''
         if isinstance(v,tuple):
             self.__interval = v
-        elif isinstance(v, int) or isinstance(v, float):
+        elif isinstance(v, int) or isinstance(v, float) or _is_source(v):
             self.__interval = (v,) # allways tuples
         else:
-            raise Exception(".interval must be a number or tuple")
+            raise TypeError(".interval must be a number, tuple, iterable or function, saw %r" % (v,))
+        clock = self.clock
+        first = self.__interval[0]
+        if _is_source(first):
+            # lazy: _ticks is a 1 element list, that each fire replaces from the source
+            interval = self.__interval
+            if len(interval) > 2 or interval[-1] is not first and interval[-1] != 0:
+                raise Exception("a lazy .interval is (source,) or (source, 0), saw %s" % (interval,))
+            self._ticks = [0]
+            lazy = self._more().offsets = _LazyPattern( first, clock, len(interval) == 1 )
+            lazy.reset(self._ticks)
+        else:
+            # in the clock's ticks, which are just seconds for the default clock
+            self._ticks = self.__interval if clock is monotonic_clock else tuple( clock.ticks(x) for x in self.__interval )
+            if self._extra is not None:
+                self._extra.offsets = None # compiled again when needed
         self.i=0
-        self.last = time.monotonic() - self.interval[self.i] # start immediatly
+        self.last = clock.add( clock.now(), -self._ticks[self.i] ) # start immediatly
         # timers (final 0) don't run till .start
         self.running = self.interval[-1] != 0
         return self
 
-    def start(self):
-        self.last = time.monotonic()
+    @property
+    def _offsets(self):
+        # the prefix sums of the pattern (see _compile), None for a single interval.
+        # Only .seek(), .align() and SKIP use them, so they are made on first use,
+        # and kept in the side object. (A lazy .interval keeps its _LazyPattern there instead)
+        extra = self._extra
+        if extra is not None and extra.offsets is not None:
+            return extra.offsets
+        if len(self._ticks) == 1:
+            return None
+        offsets = self._more().offsets = self._compile()
+        return offsets
+
+    def _compile(self):
+        # prefix sums of the pattern: offsets[k] is when step k starts (ticks after step 0 starts).
+        # They stop at the first 0 (where a timer stops), else the last one is the whole period.
+        ticks = self._ticks
+        offsets = [0]
+        for x in ticks:
+            if x == 0:
+                break
+            offsets.append( offsets[-1] + x )
+        return tuple(offsets)
+
+    def _step_at(self, position):
+        # for a position (ticks after step 0 started): (whole periods, step, ticks into that step)
+        # a binary search of the prefix sums, so long patterns are O(log m). (micropython has no bisect)
+        ticks = self._ticks
+        offsets = self._offsets
+        if offsets is None:
+            if ticks[0] == 0:
+                return 0, 0, position
+            periods = int(position // ticks[0])
+            return periods, 0, position - periods * ticks[0]
+
+        end = offsets[-1]
+        periods = 0
+        if len(offsets) > len(ticks):
+            # repeating
+            periods = int(position // end)
+            position -= periods * end
+        elif position >= end:
+            # a timer: finished, at its 0
+            return 0, len(offsets)-1, position - end
+
+        # the last step that starts at or before position
+        low = 0
+        high = len(offsets) - 2
+        while low < high:
+            mid = (low + high + 1) // 2
+            if offsets[mid] <= position:
+                low = mid
+            else:
+                high = mid - 1
+        return periods, low, position - offsets[low]
+
+    def seek(self, seconds, now=None):
+        # jump to where the pattern would be, `seconds` after .start() (if it never fired late):
+        # .i is the step that time is in, and it fires at the end of that step.
+        # A timer that would have finished is stopped.
+        return self._seek( self.clock.ticks(seconds), now )
+
+    def align(self, epoch=0, now=None):
+        # put the phase on a shared grid: as if it was .start()'ed at `epoch` (a clock.now()).
+        # Objects aligned to the same epoch, with compatible periods, fire at the same times,
+        # so the loop wakes up less often. For repeating patterns.
+        # With a wrapping clock (TicksMsClock), the epoch has to be less than half a clock.period ago.
+        if 0 in self._ticks:
+            raise Exception("align() is for repeating patterns, not timers")
+        clock = self.clock
+        if now is None:
+            now = clock.now()
+        return self._seek( clock.diff(now, epoch) if clock.period else now - epoch, now )
+
+    def _seek(self, position, now):
+        # position: ticks after the pattern started
+        if self._ticks.__class__ is list:
+            raise Exception("seek() and align() need a tuple .interval, not a lazy one")
+        clock = self.clock
+        if now is None:
+            now = clock.now()
+        periods, self.i, into = self._step_at(position)
+        if self._ticks[self.i] != 0:
+            self.last = clock.add(now, -into)
+            self.running = True
+        else:
+            self.last = now
+            self.running = False
+        return self
+
+    def start(self, now=None):
+        # now: a clock.now() you already have
+        self.last = self.clock.now() if now is None else now
         self.running = True
         self.i=0
+        if self._ticks.__class__ is list:
+            # a lazy pattern starts over, unless it hasn't been used yet (a generator just carries on)
+            lazy = self._offsets
+            if lazy.started and lazy.it is not lazy.source:
+                lazy.reset(self._ticks)
+            lazy.started = True
         return self
 
-    def __call__(self):
+    def deadline(self):
+        # the clock.now() (i.e. time.monotonic()) when the current interval expires
+        # None if it won't (a timer that isn't running)
+        this_interval = self._ticks[self.i]
+        if self.running and this_interval != 0:
+            return self.clock.add(self.last, this_interval)
+        return None
+
+    def remaining(self, now=None):
+        # seconds till the current interval expires (0 if it already has)
+        # None if it won't (a timer that isn't running)
+        this_interval = self._ticks[self.i]
+        if self.running and this_interval != 0:
+            clock = self.clock
+            if now is None:
+                now = clock.now()
+            return max(0, clock.seconds( clock.diff( clock.add(self.last, this_interval), now ) ))
+        return None
+
+    def __call__(self, now=None):
         # true when the current interval expires
-        now = time.monotonic()
-        diff = now - self.last
+        # now: a clock.now() you already have, e.g. one per pass of the loop for all objects
+        clock = self.clock
+        if now is None:
+            now = clock.now()
+        diff = clock.diff(now, self.last) if clock.period else now - self.last
 
-        this_interval = self.interval[self.i]
+        ticks = self._ticks
+        this_interval = ticks[self.i]
         if (self.running and this_interval != 0 and diff >= this_interval):
-            self.last = now
-            last_interval = self.interval[self.i]
-            self.i = (self.i + 1) % len(self.interval)
-            next_interval = self.interval[self.i]
-            if next_interval != 0:
-                drift = diff % last_interval
-                self.last -= drift
+            extra = self._extra
+            if extra is not None and extra.catchup:
+                self._catch_up(now, diff, this_interval)
             else:
-                self.running = False
+                if ticks.__class__ is list:
+                    extra.offsets.pull(ticks) # lazy
+                self.i = (self.i + 1) % len(ticks)
+                next_interval = ticks[self.i]
+                if next_interval != 0:
+                    # the drift-correction drops the whole intervals that went by
+                    missed = int(diff // this_interval) - 1
+                    if missed or extra is not None:
+                        self.missed = missed
+                    drift = diff % this_interval
+                    self.last = clock.add(now, -drift) if clock.period else now - drift
+                else:
+                    if extra is not None:
+                        extra.missed = 0
+                    self.last = now
+                    self.running = False
+            if self.collect_stats or extra is not None and extra.stats is not None:
+                self._record(diff, this_interval)
             return True
         else:
             return False
 
+    def _catch_up(self, now, diff, this_interval):
+        # fire, for the BURST and SKIP policies
+        clock = self.clock
+        ticks = self._ticks
+        lazy = ticks.__class__ is list
+        if lazy:
+            self._offsets.pull(ticks)
+        if self.catchup == BURST or lazy:
+            # just this one interval, the next call will fire if we are still behind
+            # (a lazy pattern can't jump ahead, so SKIP acts like BURST)
+            self.missed = 0
+            self.i = (self.i + 1) % len(ticks)
+            if ticks[self.i] != 0:
+                self.last = clock.add(self.last, this_interval)
+            else:
+                self.last = now
+                self.running = False
+            return
+
+        # SKIP: jump to the step that now is in
+        offsets = self._offsets
+        position = (0 if offsets is None else offsets[self.i]) + diff
+        periods, i, into = self._step_at(position)
+        self.missed = periods * len(ticks) + i - self.i - 1 # the one we are firing for doesn't count
+        self.i = i
+        if ticks[i] != 0:
+            self.last = clock.add(now, -into)
+        else:
+            self.last = now
+            self.running = False
+
+    def _record(self, diff, this_interval):
+        # lateness stats, only when firing
+        stats = self.stats
+        if stats is None:
+            from every.stats import TimerStats
+            stats = self.stats = TimerStats()
+        stats.record( self.clock.seconds(diff - this_interval), self.missed )
+
+    def __await__(self):
+        # `await yourobject`: till it fires, gives .i. asyncio only, see every.aio
+        from every.aio import next_fire
+        return next_fire(self).__await__()
+
+    def __aiter__(self):
+        # `async for i in yourobject:` each fire, gives .i. asyncio only, see every.aio
+        from every.aio import Steps
+        return Steps(self)
+
+class _Extra(object):
+    # the rarely used state of an Every, see SlottedEvery._more()
+    __slots__ = ('stats', 'catchup', 'missed', 'offsets')
+
+    def __init__(self):
+        self.stats = None
+        self.catchup = COALESCE
+        self.missed = 0
+        self.offsets = None
+
+def _is_source(x):
+    # a lazy .interval: a function, or something iterable (a number, of any type, isn't)
+    # A string is iterable too, but is a mistake (e.g. an unconverted config value), not a pattern
+    if isinstance(x, str) or isinstance(x, bytes) or isinstance(x, bytearray):
+        return False
+    return callable(x) or hasattr(x, '__iter__')
+
+def _calls(function):
+    # a pattern function, as a generator: function(0), function(1), ...
+    step = 0
+    while True:
+        yield function(step)
+        step += 1
+
+class _LazyPattern(object):
+    # the source of a lazy .interval: an iterable, iterator/generator, or function(step)
+    # Kept in ._offsets (which a lazy pattern doesn't need), i.e. in the side object
+    __slots__ = ('source', 'it', 'clock', 'repeat', 'started')
+
+    def __init__(self, source, clock, repeat):
+        # repeat: start the source over when it runs out (if it can be, e.g. a list)
+        self.source = source
+        self.clock = clock
+        self.repeat = repeat
+
+    def reset(self, ticks):
+        # from the start of the source, ticks[0] is the first interval
+        source = self.source
+        self.it = _calls(source) if callable(source) else iter(source)
+        self.started = False # the immediate first fire doesn't use up the first interval
+        ticks[0] = self._next()
+
+    def _next(self):
+        # the next interval, in ticks. 0 when it's done
+        try:
+            x = next(self.it)
+        except StopIteration:
+            x = None
+            if self.repeat and self.it is not self.source:
+                # a list, range, etc. repeats, like a tuple pattern
+                self.it = iter(self.source)
+                try:
+                    x = next(self.it)
+                except StopIteration:
+                    pass
+        return 0 if x is None else self.clock.ticks(x)
+
+    def pull(self, ticks):
+        # a fire: the next interval into ticks[0]
+        if not self.started:
+            self.started = True
+            return
+        ticks[0] = self._next()
+
+class SlottedTimer(SlottedEvery):
+    # Timer, without a per-object __dict__
+    __slots__ = ()
+
+    def __init__(self, *interval, clock=None, catchup=COALESCE):
+        # add the ,0
+        super().__init__( *( tuple(list(interval) + [0]) ), clock=clock, catchup=catchup)
+
+class Every(SlottedEvery):
+    # The usual Every: you can add your own attributes
+    pass
+
 class Timer(Every):
     # convenience for Every(a,b,0), i.e. one-shot
-    def __init__(self, *interval):
+    def __init__(self, *interval, clock=None, catchup=COALESCE):
         # add the ,0
-        super().__init__( *( tuple(list(interval) + [0]) ))
+        super().__init__( *( tuple(list(interval) + [0]) ), clock=clock, catchup=catchup)
@@ -11,25 +11,49 @@
 
 # imports
 
-import time
+from every.clock import monotonic_clock
 
-class Every(object):
+class SlottedEvery(object):
     # True on every interval
+    # No per-object __dict__, so smaller, but you can't add your own attributes.
 
-    def __init__(self, interval):
+    __slots__ = ('interval', 'last', 'clock')
+
+    def __init__(self, interval, clock=None):
         # Make an instance.
         #   :interval in seconds
+        #   :clock from every.clock, default is time.monotonic()
+        # lightweight! no @property, so .interval is in the clock's ticks
+        # (seconds for the default clock, else use clock.ticks(seconds) to change it)
+
+        self.clock = clock = monotonic_clock if clock is None else clock
+        self.interval = clock.ticks(interval)
+        self.last = clock.add( clock.now(), -self.interval ) # start immediatly
 
-        self.interval = interval
-        self.last = time.monotonic() - interval # start immediatly
+    def deadline(self):
+        # the clock.now() (i.e. time.monotonic()) when the interval expires
+        return self.clock.add(self.last, self.interval)
 
-    def __call__(self):
-        now = time.monotonic()
-        diff = now - self.last
+    def remaining(self, now=None):
+        # seconds till the interval expires (0 if it already has)
+        clock = self.clock
+        if now is None:
+            now = clock.now()
+        return max(0, clock.seconds( clock.diff( clock.add(self.last, self.interval), now ) ))
+
+    def __call__(self, now=None):
+        # now: a clock.now() you already have
+        clock = self.clock
+        if now is None:
+            now = clock.now()
+        diff = clock.diff(now, self.last) if clock.period else now - self.last
         if (diff >= self.interval):
             drift = diff % self.interval
-            self.last = now
-            self.last -= drift
+            self.last = clock.add(now, -drift) if clock.period else now - drift
             return True
         else:
             return False
+
+class Every(SlottedEvery):
+    # The usual Every: you can add your own attributes
+    pass
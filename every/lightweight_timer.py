@@ -11,31 +11,61 @@
 
 # imports
 
-import time
+from every.clock import monotonic_clock
 
-class Timer(object):
+class SlottedTimer(object):
     # True after a duration, once
+    # No per-object __dict__, so smaller, but you can't add your own attributes.
 
-    def __init__(self, interval):
+    __slots__ = ('interval', 'last', 'running', 'clock')
+
+    def __init__(self, interval, clock=None):
         # Make an instance.
         #   :interval in seconds
+        #   :clock from every.clock, default is time.monotonic()
         # "interval" to be parallel with Every wording,
         # but actually a duration.
 
-        # lightweight! no @property
-        self.interval = interval
+        # lightweight! no @property, so .interval is in the clock's ticks
+        # (seconds for the default clock, else use clock.ticks(seconds) to change it)
+        self.clock = clock = monotonic_clock if clock is None else clock
+        self.interval = clock.ticks(interval)
         self.last = 0
         self.running = False # we aren't usable till .start()
 
-    def start(self):
+    def start(self, now=None):
+        # now: a clock.now() you already have
         self.running = True
-        self.last = time.monotonic()
+        self.last = self.clock.now() if now is None else now
+
+    def deadline(self):
+        # the clock.now() (i.e. time.monotonic()) when the duration expires, None if not running
+        if (self.running):
+            return self.clock.add(self.last, self.interval)
+        return None
 
-    def __call__(self):
+    def remaining(self, now=None):
+        # seconds till the duration expires (0 if it already has), None if not running
         if (self.running):
-            now = time.monotonic()
-            if ((now - self.last) >= self.interval):
+            clock = self.clock
+            if now is None:
+                now = clock.now()
+            return max(0, clock.seconds( clock.diff( clock.add(self.last, self.interval), now ) ))
+        return None
+
+    def __call__(self, now=None):
+        # now: a clock.now() you already have
+        if (self.running):
+            clock = self.clock
+            if now is None:
+                now = clock.now()
+            diff = clock.diff(now, self.last) if clock.period else now - self.last
+            if (diff >= self.interval):
                 self.last = now # record of when we expired
                 self.running = False
                 return True
         return False
+
+class Timer(SlottedTimer):
+    # The usual Timer: you can add your own attributes
+    pass
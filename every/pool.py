@@ -0,0 +1,108 @@
+'''
+# PoolScheduler
+#
+# A Scheduler that runs the callbacks in a thread pool (concurrent.futures.ThreadPoolExecutor),
+# so a slow callback (I/O, network) doesn't make the other objects late.
+# The polling loop only decides what fired, and hands the callback to a worker thread.
+
+from every.every import Every
+from every.pool import PoolScheduler, SKIP_IF_RUNNING, QUEUE, CONCURRENT
+
+scheduler = PoolScheduler(max_workers=4)
+scheduler.add( Every(0.5), blink )
+scheduler.add( Every(10), upload_readings, overlap=QUEUE )
+
+while(1):
+    scheduler.run_pending() # doesn't wait for upload_readings()
+    scheduler.wait(max_sleep=0.05)
+...
+scheduler.shutdown() # waits for running callbacks
+
+When an object fires while its previous callback is still running, its overlap policy says what happens:
+    SKIP_IF_RUNNING (the default): drop this one (counted in scheduler.skipped[an_every])
+    QUEUE: run it after the running one finishes, one at a time, in order
+    CONCURRENT: run it in another worker, at the same time
+
+Callbacks run in other threads: an_every.i etc. may have moved on by the time your callback looks.
+An exception in a callback is given to .error(an_every, exception), which prints it.
+Regular python only (threads).
+'''
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from every.scheduler import Scheduler
+
+# overlap policies
+SKIP_IF_RUNNING = 0
+QUEUE = 1
+CONCURRENT = 2
+
+class PoolScheduler(Scheduler):
+    def __init__(self, clock=None, executor=None, max_workers=None):
+        # executor: your own concurrent.futures executor, else we make a ThreadPoolExecutor(max_workers)
+        super().__init__(clock=clock)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers) if executor is None else executor
+        self.overlaps = {} # an_every : overlap policy
+        self.active = {} # an_every : callbacks running now
+        self.queued = {} # an_every : fires waiting for the running one (QUEUE)
+        self.skipped = {} # an_every : fires dropped because it was still running (SKIP_IF_RUNNING)
+        self.lock = threading.Lock() # for active/queued: the workers change them too
+
+    def add(self, an_every, callback, overlap=SKIP_IF_RUNNING, slack=0):
+        # callback( an_every ) is called in a worker thread each time an_every fires
+        self.overlaps[an_every] = overlap
+        self.skipped[an_every] = 0
+        return super().add(an_every, callback, slack)
+
+    def remove(self, an_every):
+        # a running callback finishes, but queued ones are dropped
+        super().remove(an_every)
+        del self.overlaps[an_every]
+        del self.skipped[an_every]
+        with self.lock:
+            self.queued.pop(an_every, None)
+
+    def _fire(self, an_every):
+        overlap = self.overlaps[an_every]
+        with self.lock:
+            active = self.active.get(an_every, 0)
+            if active and overlap != CONCURRENT:
+                if overlap == QUEUE:
+                    self.queued[an_every] = self.queued.get(an_every, 0) + 1
+                else:
+                    self.skipped[an_every] += 1
+                return
+            self.active[an_every] = active + 1
+        try:
+            self.executor.submit( self._run, an_every, self.callbacks[an_every] )
+        except Exception:
+            # e.g. after .shutdown(): it isn't running after all
+            with self.lock:
+                self.active[an_every] -= 1
+                if not self.active[an_every]:
+                    del self.active[an_every]
+            raise
+
+    def _run(self, an_every, callback):
+        # in a worker: the callback, then any that queued up behind it
+        while True:
+            try:
+                callback(an_every)
+            except Exception as e:
+                self.error(an_every, e)
+            with self.lock:
+                if self.queued.get(an_every):
+                    self.queued[an_every] -= 1
+                    continue
+                self.active[an_every] -= 1
+                if not self.active[an_every]:
+                    del self.active[an_every]
+                return
+
+    def busy(self, an_every):
+        # how many of an_every's callbacks are running now
+        return self.active.get(an_every, 0)
+
+    def shutdown(self, wait=True):
+        # no more callbacks, wait=True: till the running (and queued) ones finish
+        self.executor.shutdown(wait=wait)
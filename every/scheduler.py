@@ -0,0 +1,185 @@
+'''
+# Scheduler
+#
+# Poll only the Every/Timer objects that are actually due.
+# Each object is registered with a callback, and kept in a min-heap keyed on its next deadline.
+# A tick costs O(k log n) for the k expired objects, instead of calling all n of them.
+
+from every.scheduler import Scheduler
+
+def blink(an_every):
+    cp.red_led = not cp.red_led
+
+scheduler = Scheduler()
+scheduler.add( Every(0.5), blink )
+beep = scheduler.add( Timer(2), stop_beep ) # returns the Every/Timer
+
+while(1):
+    scheduler.run_pending() # calls blink(), etc., when due
+    scheduler.wait(max_sleep=0.05) # don't spin, but notice the button
+
+    if cp.button_a:
+        scheduler.start( beep ) # instead of beep.start()
+
+If you change an object behind the scheduler's back (.start(), .interval=),
+tell it with scheduler.reschedule(an_every). Old heap entries are not removed,
+they are just ignored when they come to the top (lazy invalidation).
+
+Fewer wakeups: give objects some slack, e.g. scheduler.add( Every(10), log, slack=0.5 ),
+it may fire up to 0.5 seconds late. .wait() sleeps till the last moment that is still
+within everybody's slack, and then everything that is due fires together.
+Also see Every.align(), so objects with compatible periods are due at the same times.
+'''
+
+import sys, heapq
+from every.wait import sleep_for
+from every.clock import monotonic_clock
+
+class Scheduler(object):
+    def __init__(self, clock=None):
+        # clock: from every.clock, must be the clock of all the objects you add.
+        # The heap needs deadlines that don't wrap around, so not TicksMsClock.
+        self.clock = monotonic_clock if clock is None else clock
+        self.heap = [] # (deadline, seq, version, an_every)
+        self.callbacks = {} # an_every : callback
+        self.versions = {} # an_every : version of its valid heap entry
+        self.slacks = {} # an_every : ticks it may be late, if any
+        self.seq = 0 # tie-breaker, so we never compare Every objects
+
+    def __len__(self):
+        return len(self.callbacks)
+
+    def add(self, an_every, callback, slack=0):
+        # callback( an_every ) is called each time an_every fires
+        # slack: seconds it may fire late, so its wakeup can be shared with others
+        self.callbacks[an_every] = callback
+        if slack:
+            self.slacks[an_every] = self.clock.ticks(slack)
+        self.reschedule(an_every)
+        return an_every
+
+    def remove(self, an_every):
+        # its heap entries become stale
+        del self.callbacks[an_every]
+        del self.versions[an_every]
+        self.slacks.pop(an_every, None)
+
+    def start(self, an_every, now=None):
+        # an_every.start(), and fix up the heap
+        an_every.start(now)
+        self.reschedule(an_every)
+        return an_every
+
+    def reschedule(self, an_every):
+        # After .start(), .interval=, etc.: invalidate old heap entries, and push the new deadline
+        version = self.versions.get(an_every, 0) + 1
+        self.versions[an_every] = version
+        self._push(an_every, version)
+
+    def _push(self, an_every, version):
+        when = an_every.deadline()
+        if when is not None: # not running: nothing to schedule till .start
+            self.seq += 1
+            heapq.heappush(self.heap, (when, self.seq, version, an_every))
+
+    def next_deadline(self):
+        # earliest deadline (a clock.now(), i.e. time.monotonic()), or None if nothing is scheduled
+        heap = self.heap
+        versions = self.versions
+        # discard stale entries so the answer is truthful
+        while heap and versions.get(heap[0][3]) != heap[0][2]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def next_wakeup(self):
+        # when to wake up: the earliest deadline + slack, or None if nothing is scheduled.
+        # Everything due by then fires together.
+        if self.next_deadline() is None:
+            return None
+        if not self.slacks:
+            return self.heap[0][0]
+        # only entries with deadlines before the best so far can matter, and a heap's children
+        # are never earlier than their parent: so we only visit the few near the top
+        heap = self.heap
+        versions = self.versions
+        slacks = self.slacks
+        best = None
+        to_visit = [0]
+        while to_visit:
+            index = to_visit.pop()
+            when, seq, version, an_every = heap[index]
+            if best is not None and when >= best:
+                continue
+            if versions.get(an_every) == version:
+                latest = when + slacks.get(an_every, 0)
+                if best is None or latest < best:
+                    best = latest
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    to_visit.append(child)
+        return best
+
+    def wait(self, max_sleep=None):
+        # sleep till the next wakeup (deadline, + slack), but no more than max_sleep. Returns seconds slept.
+        when = self.next_wakeup()
+        clock = self.clock
+        if when is None:
+            return sleep_for(None, max_sleep, clock.sleep)
+        return sleep_for( clock.seconds( clock.diff(when, clock.now()) ), max_sleep, clock.sleep )
+
+    def _fire(self, an_every):
+        # run the callback, inline. See every.pool for running them in threads
+        try:
+            self.callbacks[an_every](an_every)
+        except Exception as e:
+            self.error(an_every, e)
+
+    def error(self, an_every, exception):
+        # a callback raised (an_every stays scheduled), override to do something else
+        print("Callback for %s failed:" % an_every, file=sys.stderr)
+        try:
+            import traceback
+            traceback.print_exception(type(exception), exception, exception.__traceback__)
+        except ImportError:
+            sys.print_exception(exception) # micropython
+
+    def run_pending(self, now=None):
+        # Fire the callbacks of everything that is due, returns how many fired
+        # The clock is read once, and every due object is tested against that same `now`
+        if now is None:
+            now = self.clock.now()
+        heap = self.heap
+        versions = self.versions
+        fired = 0
+        retry = []
+
+        try:
+            while heap and heap[0][0] <= now:
+                when, seq, version, an_every = heapq.heappop(heap)
+                if versions.get(an_every) != version:
+                    continue # stale
+
+                actual = an_every.deadline()
+                if actual is None:
+                    continue # stopped behind our back, wait for .reschedule()
+                if actual > now:
+                    # changed behind our back (e.g. .start()), push the real deadline
+                    self.seq += 1
+                    heapq.heappush(heap, (actual, self.seq, version, an_every))
+                    continue
+
+                # pushed back in the `finally` if something raises before it is rescheduled
+                retry.append( (an_every, version) )
+                if an_every(now):
+                    fired += 1
+                    self._fire(an_every)
+                    retry.pop()
+                    # the callback may have removed/rescheduled it
+                    if versions.get(an_every) == version:
+                        self._push(an_every, version)
+                # else: float rounding can disagree with the deadline by an ulp, try next tick
+        finally:
+            for an_every, version in retry:
+                if versions.get(an_every) == version:
+                    self._push(an_every, version)
+        return fired
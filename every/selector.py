@@ -0,0 +1,117 @@
+'''
+# selectors integration
+#
+# An I/O loop (sockets, pipes) that also has Every/Timer objects,
+# blocks in one select(), and wakes up for I/O or for the next deadline, whichever is first.
+# No short select timeout to poll the timers.
+
+import selectors
+from every.every import Every
+from every.selector import TimerSelector
+
+sel = TimerSelector() # wraps a selectors.DefaultSelector()
+sel.scheduler.add( Every(10), send_keepalive ) # an every.scheduler.Scheduler
+sel.register( server_socket, selectors.EVENT_READ, accept )
+
+while True:
+    for key, events in sel.select(): # runs the due callbacks, returns only the I/O
+        key.data(key.fileobj)
+
+On Linux with python 3.13+ (os.timerfd_create), one timerfd is registered in the selector,
+and re-armed to the scheduler's next wakeup (deadline + slack) before each select().
+So sel.fileno() can also go into some other loop (e.g. asyncio's add_reader()):
+it is readable when something is due, then call sel.run_pending().
+Otherwise, and for clocks other than the default time.monotonic(), the select() timeout
+is computed from the next wakeup instead (sel.timerfd is None, and sel.fileno() is the selector's).
+
+If you change an object behind the scheduler's back, call sel.scheduler.reschedule(an_every) as usual.
+The next select() arms for the new deadline, but a select() that is already blocked doesn't notice.
+Regular python only.
+'''
+
+import os, time, selectors
+from every.scheduler import Scheduler
+from every.clock import MonotonicClock
+
+class TimerSelector(selectors.BaseSelector):
+    def __init__(self, scheduler=None, selector=None, timerfd=None):
+        # scheduler: an every.scheduler.Scheduler (or PoolScheduler), default is a new one
+        # selector: default is a selectors.DefaultSelector()
+        # timerfd: False to always compute the timeout, default is to use a timerfd if we can
+        self.scheduler = Scheduler() if scheduler is None else scheduler
+        self.selector = selectors.DefaultSelector() if selector is None else selector
+        self.timerfd = None
+        if timerfd is None:
+            # timerfd's CLOCK_MONOTONIC is time.monotonic(), so only for the default clock
+            timerfd = hasattr(os, 'timerfd_create') and type(self.scheduler.clock) is MonotonicClock
+        if timerfd:
+            self.timerfd = os.timerfd_create( time.CLOCK_MONOTONIC, flags=os.TFD_NONBLOCK | os.TFD_CLOEXEC )
+            self.selector.register( self.timerfd, selectors.EVENT_READ )
+        self.armed = None # what the timerfd is set to
+
+    def fileno(self):
+        # the timerfd, else the selector's (if it has one)
+        if self.timerfd is not None:
+            return self.timerfd
+        return self.selector.fileno()
+
+    def register(self, fileobj, events, data=None):
+        return self.selector.register(fileobj, events, data)
+
+    def unregister(self, fileobj):
+        return self.selector.unregister(fileobj)
+
+    def modify(self, fileobj, events, data=None):
+        return self.selector.modify(fileobj, events, data)
+
+    def get_map(self):
+        # includes the timerfd
+        return self.selector.get_map()
+
+    def timeout(self, timeout=None):
+        # seconds till the next wakeup, for your own select()/poll(): no more than `timeout`, None is forever
+        when = self.scheduler.next_wakeup()
+        if when is None:
+            return timeout
+        clock = self.scheduler.clock
+        remaining = max( 0, clock.seconds( clock.diff(when, clock.now()) ) )
+        return remaining if timeout is None else min(remaining, timeout)
+
+    def arm(self):
+        # set the timerfd to the next wakeup, or disarm it
+        when = self.scheduler.next_wakeup()
+        if when != self.armed:
+            # an absolute time of 0 would disarm, anything in the past expires immediately
+            initial = 0 if when is None else max(when, 1e-9)
+            os.timerfd_settime( self.timerfd, flags=os.TFD_TIMER_ABSTIME, initial=initial )
+            self.armed = when
+
+    def run_pending(self):
+        # fire the due callbacks (and clear the timerfd), returns how many fired
+        if self.timerfd is not None:
+            try:
+                os.read(self.timerfd, 8)
+                self.armed = None # it expired, so it is disarmed
+            except BlockingIOError:
+                pass
+        return self.scheduler.run_pending()
+
+    def select(self, timeout=None):
+        # block till there is I/O, or something is due, but no more than `timeout` (None is forever)
+        # Runs the due callbacks, and returns the I/O events: [(key, events), ...]
+        if self.timerfd is not None:
+            self.arm()
+        else:
+            timeout = self.timeout(timeout)
+        ready = self.selector.select(timeout)
+        if self.timerfd is not None:
+            ready = [ (key, events) for key, events in ready if key.fd != self.timerfd ]
+        self.run_pending()
+        return ready
+
+    def close(self):
+        # closes the selector, and the timerfd
+        self.selector.close()
+        if self.timerfd is not None:
+            os.close(self.timerfd)
+            self.timerfd = None
@@ -0,0 +1,204 @@
+'''
+# ShardedScheduler
+#
+# For CPU-heavy callbacks: spread the Every/Timer objects over several worker processes ("shards"),
+# so they aren't all stuck on one core (the GIL). Each shard runs its own Scheduler loop.
+
+from every.every import Every
+from every.shards import ShardedScheduler
+
+def filter_block(an_every): # must be picklable: a module-level function
+    ...crunch...
+    return level # results come back to the parent (not None's)
+
+if __name__ == '__main__':
+    shards = ShardedScheduler(processes=4) # default: one per cpu
+    channel1 = shards.add( Every(0.01), filter_block )
+    shards.add( Every(0.01), filter_block )
+    ...
+    while(1):
+        for an_every, i, result in shards.results(): # what the callbacks returned
+            ...
+        shards.set_interval( channel1, 0.02 )
+        print( shards.stats() ) # {shard : lateness snapshot}, see every.stats
+    shards.shutdown()
+
+The object you add is copied to a shard: the parent's copy doesn't change when it fires.
+Control it through the scheduler: .start(an_every), .set_interval(an_every, v), .remove(an_every).
+Each object goes to the shard with the fewest objects.
+Each shard records the lateness of all of its objects in one every.stats.TimerStats,
+and sends a snapshot every `report` seconds (and when it stops).
+An exception in a callback is given to .error(an_every, text) in the parent, which prints it.
+Regular python only (multiprocessing).
+'''
+
+import sys, os, traceback
+import multiprocessing
+from queue import Empty
+from every.every import Every
+from every.scheduler import Scheduler
+from every.stats import TimerStats
+from every.clock import monotonic_clock
+
+def _shard(shard, control, results, report):
+    # the loop in each worker process: run what's due, else wait for the next deadline or a control message
+    scheduler = Scheduler()
+    stats = TimerStats()
+    everies = {} # job : an_every
+    reporting = Every(report)
+    reporting.start()
+
+    def fire(job, callback, an_every):
+        try:
+            result = callback(an_every)
+        except Exception:
+            results.put( ('error', job, an_every.i, traceback.format_exc()) )
+        else:
+            if result is not None:
+                results.put( ('result', job, an_every.i, result) )
+
+    while True:
+        scheduler.run_pending()
+        if reporting():
+            results.put( ('stats', shard, stats.snapshot()) )
+
+        timeout = reporting.remaining()
+        when = scheduler.next_deadline()
+        if when is not None:
+            timeout = min( timeout, max(0, when - monotonic_clock.now()) )
+        if not control.poll(timeout):
+            continue
+
+        message = control.recv()
+        command = message[0]
+        if command == 'add':
+            job, an_every, callback = message[1:]
+            an_every.stats = stats # all of this shard's objects together
+            everies[job] = an_every
+            scheduler.add( an_every, lambda an_every, job=job, callback=callback: fire(job, callback, an_every) )
+        elif command == 'remove':
+            scheduler.remove( everies.pop(message[1]) )
+        elif command == 'start':
+            scheduler.start( everies[message[1]], message[2] )
+        elif command == 'interval':
+            an_every = everies[message[1]]
+            an_every.interval = message[2]
+            scheduler.reschedule(an_every)
+        elif command == 'stop':
+            results.put( ('stats', shard, stats.snapshot()) )
+            results.put( ('stopped', shard) )
+            return
+
+class ShardedScheduler(object):
+    def __init__(self, processes=None, report=1.0):
+        # processes: how many shards, default os.cpu_count()
+        # report: seconds between each shard's stats
+        if processes is None:
+            processes = os.cpu_count() or 1
+        self.results_queue = multiprocessing.Queue()
+        self.controls = [] # our end of each shard's Pipe
+        self.processes = []
+        for shard in range(processes):
+            ours, theirs = multiprocessing.Pipe()
+            process = multiprocessing.Process( target=_shard, args=(shard, theirs, self.results_queue, report), daemon=True )
+            process.start()
+            self.controls.append(ours)
+            self.processes.append(process)
+        self.jobs = {} # an_every : job
+        self.everies = {} # job : an_every
+        self.placement = {} # job : shard
+        self.loads = [0] * processes # objects per shard
+        self.next_job = 0
+        self.latest_stats = {} # shard : snapshot
+        self.pending = [] # results read while waiting for something else
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def _send(self, an_every, *message):
+        job = self.jobs[an_every]
+        self.controls[ self.placement[job] ].send( (message[0], job) + message[1:] )
+
+    def add(self, an_every, callback):
+        # callback( an_every ) is called in a shard each time (its copy of) an_every fires.
+        # Returns an_every, use it for .start() etc.
+        job = self.next_job
+        self.next_job += 1
+        shard = self.loads.index( min(self.loads) )
+        self.loads[shard] += 1
+        self.jobs[an_every] = job
+        self.everies[job] = an_every
+        self.placement[job] = shard
+        self.controls[shard].send( ('add', job, an_every, callback) )
+        return an_every
+
+    def remove(self, an_every):
+        self._send(an_every, 'remove')
+        job = self.jobs.pop(an_every)
+        del self.everies[job]
+        self.loads[ self.placement.pop(job) ] -= 1
+
+    def start(self, an_every, now=None):
+        # .start() the shard's copy. now: a time.monotonic(), default is now
+        # (time.monotonic() is the same clock in all processes)
+        self._send(an_every, 'start', monotonic_clock.now() if now is None else now)
+        return an_every
+
+    def set_interval(self, an_every, interval):
+        # `.interval = interval` for the shard's copy
+        self._send(an_every, 'interval', interval)
+
+    def _drain(self, timeout=0):
+        # read everything the shards sent so far, wait up to timeout for the first one
+        try:
+            message = self.results_queue.get(timeout=timeout) if timeout else self.results_queue.get_nowait()
+            while True:
+                kind = message[0]
+                if kind == 'stats':
+                    self.latest_stats[ message[1] ] = message[2]
+                elif kind == 'error':
+                    job, i, text = message[1:]
+                    self.error( self.everies.get(job), text )
+                else:
+                    self.pending.append(message)
+                message = self.results_queue.get_nowait()
+        except Empty:
+            pass
+
+    def results(self, timeout=0):
+        # [ (an_every, i, result), ... ] since the last call: what callbacks returned (not None), and an_every.i then.
+        # timeout: seconds to wait for something
+        self._drain(timeout)
+        results = []
+        for message in self.pending:
+            if message[0] == 'result':
+                job, i, value = message[1:]
+                results.append( (self.everies.get(job), i, value) )
+        self.pending = [ message for message in self.pending if message[0] != 'result' ]
+        return results
+
+    def stats(self):
+        # { shard : every.stats snapshot } the latest lateness stats from each shard
+        self._drain()
+        return dict(self.latest_stats)
+
+    def error(self, an_every, text):
+        # a callback raised in a shard, text is the traceback. Override to do something else
+        print("Callback for %s failed:" % an_every, file=sys.stderr)
+        print(text, file=sys.stderr)
+
+    def shutdown(self, timeout=5):
+        # stop the shards, after they send their last stats (see .stats())
+        for control in self.controls:
+            control.send( ('stop',) )
+        stopped = 0
+        # keep reading, or a shard can block on a full queue
+        deadline = monotonic_clock.now() + timeout
+        while stopped < len(self.processes) and monotonic_clock.now() < deadline:
+            self._drain(0.1)
+            stopped += sum( 1 for message in self.pending if message[0] == 'stopped' )
+            self.pending = [ message for message in self.pending if message[0] != 'stopped' ]
+        for process in self.processes:
+            process.join( max(0, deadline - monotonic_clock.now()) )
+            if process.is_alive():
+                process.terminate()
@@ -0,0 +1,208 @@
+'''
+# SharedTimers
+#
+# A table of Every/Timer-like gates in shared memory (multiprocessing.shared_memory),
+# for several processes on one host: each fire is observed ("claimed") by exactly one process.
+# E.g. "only one worker flushes every 5 seconds".
+
+from every.shared import SharedTimers
+
+if __name__ == '__main__':
+    table = SharedTimers( [5, (1, 0.5), (10, 0)] ) # like Every(5), Every(1,0.5), Timer(10)
+    workers = [ multiprocessing.Process( target=work, args=(table,) ) for x in range(4) ]
+    ...
+    table.unlink() # when everybody is done
+
+def work(table):
+    flush = table.gate(0) # acts like an Every
+    while(1):
+        if flush(): # True in only one of the processes
+            ...flush...
+
+Polling doesn't do any IPC: the not-due case just reads the shared memory.
+When it looks due, we take the table's lock, check again, and update the gate (claim it):
+the other processes then see it as not due. A read that races with an update may be stale,
+which only means that process notices the next state on its next poll (the lock decides who fires).
+
+Gates act like Every with the default catchup (COALESCE), including drift-correction, .i,
+and timers (trailing 0) that need .start(). All processes share time.monotonic(), which is
+one system-wide clock (CLOCK_MONOTONIC on linux), so deadlines mean the same thing everywhere.
+Patterns are at most `steps` long (set when the table is made).
+
+Pass the table to the processes when you make them (Process(args=...), or fork):
+the lock (a multiprocessing.Lock) can't be sent later.
+Regular python only.
+'''
+
+import struct
+import multiprocessing
+from multiprocessing import shared_memory
+from every.clock import monotonic_clock
+
+class SharedTimers(object):
+    # the header of each slot: .last, .i, .running, pattern length. Then the pattern
+    HEAD = '<dIBB2x'
+
+    def __init__(self, patterns, steps=None, lock=None, clock=None, name=None):
+        # patterns: a list of numbers or tuples, each like the arguments to Every()
+        # steps: the longest pattern that will fit, default is the longest one now (for .set_interval())
+        # lock: default is a new multiprocessing.Lock()
+        # clock: float seconds that don't wrap, and is the same for all processes. Default is time.monotonic()
+        # name: of the shared memory, default is a made-up one
+        patterns = [ self._as_tuple(a_pattern) for a_pattern in patterns ]
+        self.steps = max( max( len(a_pattern) for a_pattern in patterns ), steps or 0 )
+        self.count = len(patterns)
+        self.lock = multiprocessing.Lock() if lock is None else lock
+        self.clock = monotonic_clock if clock is None else clock
+        self._layout()
+        self.shm = shared_memory.SharedMemory( name=name, create=True, size=max(1, self.count * self.size) )
+        now = self.clock.now()
+        for k, a_pattern in enumerate(patterns):
+            # like Every(): pretend we started at the last interval, for the immediate-expire case
+            self._set(k, a_pattern, now, len(a_pattern) - 1)
+
+    def _layout(self):
+        self.slot = struct.Struct( '%s%dd' % (self.HEAD, self.steps) )
+        self.size = self.slot.size
+
+    @staticmethod
+    def _as_tuple(a_pattern):
+        if isinstance(a_pattern, tuple):
+            return a_pattern
+        elif isinstance(a_pattern, int) or isinstance(a_pattern, float):
+            return (a_pattern,)
+        raise Exception("each pattern must be a number or tuple")
+
+    def __getstate__(self):
+        # sent to another process: attach to the same shared memory
+        return (self.shm.name, self.count, self.steps, self.lock, self.clock)
+
+    def __setstate__(self, state):
+        name, self.count, self.steps, self.lock, self.clock = state
+        self._layout()
+        self.shm = shared_memory.SharedMemory(name=name)
+
+    def __len__(self):
+        return self.count
+
+    def _read(self, k):
+        # (last, i, running, length, step0, step1...)
+        return self.slot.unpack_from(self.shm.buf, k * self.size)
+
+    def _write(self, k, last, i, running, length, pattern):
+        self.slot.pack_into( self.shm.buf, k * self.size, last, i, running, length, *pattern )
+
+    def _set(self, k, a_pattern, now, i):
+        # start immediately, at step i
+        if len(a_pattern) > self.steps:
+            raise Exception("pattern is longer than %s steps: %s" % (self.steps, a_pattern))
+        padded = a_pattern + (0,) * (self.steps - len(a_pattern))
+        # timers (final 0) don't run till .start
+        self._write( k, now - a_pattern[i], i, a_pattern[-1] != 0, len(a_pattern), padded )
+
+    def gate(self, k):
+        # an Every-like object for gate k
+        return SharedEvery(self, k)
+
+    def __call__(self, k, now=None):
+        # True when gate k fires, in only one process
+        if now is None:
+            now = self.clock.now()
+        slot = self._read(k)
+        last, i, running = slot[0:3]
+        this_interval = slot[4 + i]
+        if not (running and this_interval != 0 and now - last >= this_interval):
+            return False # the fast path: not due, no lock
+
+        with self.lock:
+            # again, another process may have claimed it
+            slot = self._read(k)
+            last, i, running, length = slot[0:4]
+            pattern = slot[4:]
+            this_interval = pattern[i]
+            diff = now - last
+            if not (running and this_interval != 0 and diff >= this_interval):
+                return False
+            i = (i + 1) % length
+            if pattern[i] != 0:
+                # drift-correction, like Every
+                last = now - diff % this_interval
+            else:
+                last = now
+                running = False
+            self._write(k, last, i, running, length, pattern)
+        return True
+
+    def start(self, k, now=None):
+        # like .start() for gate k
+        if now is None:
+            now = self.clock.now()
+        with self.lock:
+            slot = self._read(k)
+            self._write( k, now, 0, True, slot[3], slot[4:] )
+
+    def set_interval(self, k, a_pattern, now=None):
+        # like `.interval = a_pattern` for gate k
+        with self.lock:
+            self._set( k, self._as_tuple(a_pattern), self.clock.now() if now is None else now, 0 )
+
+    def state(self, k):
+        # (.last, .i, .running, pattern) of gate k
+        slot = self._read(k)
+        return slot[0], slot[1], bool(slot[2]), slot[4:4 + slot[3]]
+
+    def close(self):
+        # this process is done with it
+        self.shm.close()
+
+    def unlink(self):
+        # remove the shared memory (after everybody is done with it)
+        self.shm.close()
+        self.shm.unlink()
+
+class SharedEvery(object):
+    # one gate of a SharedTimers, acts like an Every
+    def __init__(self, table, k):
+        self.table = table
+        self.k = k
+
+    def __call__(self, now=None):
+        return self.table(self.k, now)
+
+    def start(self, now=None):
+        self.table.start(self.k, now)
+        return self
+
+    @property
+    def interval(self):
+        return self.table.state(self.k)[3]
+
+    @interval.setter
+    def interval(self, v):
+        self.table.set_interval(self.k, v)
+
+    @property
+    def i(self):
+        return self.table.state(self.k)[1]
+
+    @property
+    def last(self):
+        return self.table.state(self.k)[0]
+
+    @property
+    def running(self):
+        return self.table.state(self.k)[2]
+
+    def deadline(self):
+        # the clock.now() when the current interval expires, None if it won't
+        last, i, running, pattern = self.table.state(self.k)
+        if running and pattern[i] != 0:
+            return last + pattern[i]
+        return None
+
+    def remaining(self, now=None):
+        # seconds till the current interval expires (0 if it already has), None if it won't
+        deadline = self.deadline()
+        if deadline is None:
+            return None
+        return max( 0, deadline - (self.table.clock.now() if now is None else now) )
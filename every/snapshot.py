@@ -0,0 +1,159 @@
+'''
+# Snapshot/restore
+#
+# Save the state of lots of Every/Timer objects in a compact binary file, and restore it after a restart,
+# so they keep their phase: instead of all firing at once when they are re-made (a thundering herd).
+
+from every.snapshot import save, load
+
+save( everies, 'timers.snap' ) # a list of Every/Timer objects
+...restart...
+everies = [ Every(x) for x in config ] # the same objects, in the same order
+load( 'timers.snap', everies ) # mmap's the file, and restores them in place
+# or, make them from the snapshot:
+everies = load( 'timers.snap' )
+
+Each object comes back as if the process had never stopped:
+the time it was down is added to where it was in its pattern (like .seek()).
+So a periodic fires at its next grid point, not immediately, and the missed fires are not replayed.
+A running timer that would have finished while we were down is due immediately, and fires once.
+
+The file is a header, then a fixed-size record per object (so record k is at a known offset),
+then the table of distinct patterns (objects with the same .interval share one entry):
+    header: b'EVSN', version, pattern count, object count, time.monotonic() and time.time() when saved
+    record: seconds since .last, pattern index, .i, .running, .catchup
+    pattern: step count, then the steps in seconds
+Everything is little-endian. The records are read straight out of the buffer (struct.iter_unpack),
+so an mmap isn't copied. .stats and .missed aren't saved.
+
+The time we were down is from time.monotonic() if it is plausible (the same boot), else time.time().
+Regular python.
+'''
+
+import struct, time, mmap
+from every.every import Every
+
+MAGIC = b'EVSN'
+VERSION = 1
+HEADER = struct.Struct('<4sHxxIIdd')
+RECORD = struct.Struct('<dIIBB2x')
+STEPS = struct.Struct('<H')
+
+# time.monotonic() and time.time() have to agree this well (seconds) for the monotonic one to be used
+AGREE = 1.0
+
+def dumps(everies):
+    # the snapshot of everies, as bytes
+    patterns = {} # interval tuple : index
+    records = []
+    nows = {} # one clock.now() per clock
+    for an_every in everies:
+        clock = an_every.clock
+        now = nows.get( id(clock) )
+        if now is None:
+            now = nows[ id(clock) ] = clock.now()
+        if an_every._ticks.__class__ is list:
+            raise Exception("Can't snapshot a lazy .interval: %s" % (an_every.interval,))
+        pattern = patterns.setdefault( an_every.interval, len(patterns) )
+        since = clock.seconds( clock.diff(now, an_every.last) )
+        records.append( RECORD.pack( since, pattern, an_every.i, an_every.running, an_every.catchup ) )
+
+    parts = [ HEADER.pack( MAGIC, VERSION, len(patterns), len(records), time.monotonic(), time.time() ) ]
+    parts.extend(records)
+    for interval in patterns: # in index order
+        parts.append( STEPS.pack( len(interval) ) )
+        parts.append( struct.pack( '<%dd' % len(interval), *interval ) )
+    return b''.join(parts)
+
+def save(everies, path):
+    # write the snapshot to the file `path`
+    # (written to path + '.new' first, then renamed, so a crash doesn't leave half a snapshot)
+    import os
+    new = path + '.new'
+    with open(new, 'wb') as f:
+        f.write( dumps(everies) )
+    os.replace(new, path)
+
+def elapsed(buffer):
+    # seconds since the snapshot in buffer was made
+    magic, version, pattern_count, count, monotonic, wall = _header(buffer)
+    by_wall = max( 0, time.time() - wall )
+    by_monotonic = time.monotonic() - monotonic
+    if by_monotonic >= 0 and abs(by_monotonic - by_wall) < AGREE:
+        return by_monotonic # the same boot, and not fooled by the wall clock being set
+    return by_wall
+
+def _header(buffer):
+    header = HEADER.unpack_from(buffer, 0)
+    if header[0] != MAGIC:
+        raise Exception("Not an every snapshot")
+    if header[1] != VERSION:
+        raise Exception("Can't read snapshot version %s" % header[1])
+    return header
+
+def loads(buffer, everies=None, clock=None, down=None):
+    # restore from a snapshot in buffer (bytes, mmap, memoryview)
+    #   :everies objects to restore in place (the same ones, in the same order), else new ones are made
+    #   :clock for the new ones, default is time.monotonic()
+    #   :down seconds since the snapshot, default is elapsed(buffer)
+    # Returns the list of objects
+    magic, version, pattern_count, count, monotonic, wall = _header(buffer)
+    if down is None:
+        down = elapsed(buffer)
+    if everies is not None and len(everies) != count:
+        raise Exception("Snapshot has %s objects, but given %s" % (count, len(everies)))
+
+    records_end = HEADER.size + count * RECORD.size
+    with memoryview(buffer) as view, view[HEADER.size:records_end] as records:
+        return _restore(view, records, records_end, pattern_count, everies, clock, down)
+
+def _restore(view, records, records_end, pattern_count, everies, clock, down):
+    # the work of loads()
+
+    # the patterns
+    patterns = []
+    at = records_end
+    for x in range(pattern_count):
+        steps = STEPS.unpack_from(view, at)[0]
+        at += STEPS.size
+        patterns.append( struct.unpack_from( '<%dd' % steps, view, at ) )
+        at += 8 * steps
+
+    restored = [] if everies is None else everies
+    nows = {} # one clock.now() per clock
+    index = 0
+    for since, pattern, i, running, catchup in RECORD.iter_unpack(records):
+        interval = patterns[pattern]
+        if everies is None:
+            an_every = Every( *interval, clock=clock, catchup=catchup )
+            restored.append(an_every)
+        else:
+            an_every = everies[index]
+            an_every.interval = interval
+            an_every.catchup = catchup
+        index += 1
+
+        an_every_clock = an_every.clock
+        now = nows.get( id(an_every_clock) )
+        if now is None:
+            now = nows[ id(an_every_clock) ] = an_every_clock.now()
+        if not running:
+            # a timer that isn't started: .interval= already stopped it
+            an_every.i = i
+            continue
+
+        offsets = an_every._offsets
+        position = (0 if offsets is None else offsets[i]) + an_every_clock.ticks(since + down)
+        an_every._seek(position, now)
+        if not an_every.running:
+            # a timer that finished while we were down: due now, at its last step
+            an_every.i = len(offsets) - 2
+            an_every.last = an_every_clock.add( now, -an_every._ticks[an_every.i] )
+            an_every.running = True
+    return restored
+
+def load(path, everies=None, clock=None, down=None):
+    # restore from the snapshot file `path`, mmap'd. See loads()
+    with open(path, 'rb') as f:
+        with mmap.mmap( f.fileno(), 0, access=mmap.ACCESS_READ ) as buffer:
+            return loads(buffer, everies, clock, down)
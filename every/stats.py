@@ -0,0 +1,95 @@
+'''
+# Lateness/jitter statistics for Every/Timer
+#
+# Every fires late when the loop is slow, and then quietly corrects the drift.
+# Turn on stats to see how late, and how many intervals were skipped.
+
+from every.every import Every
+from every.stats import TimerStats
+
+flush = Every(1.0)
+flush.stats = TimerStats() # this one
+Every.collect_stats = True # or: all Every/Timer objects (lazily, on their next fire)
+
+...
+print( flush.stats.snapshot() )
+# {'fires': 120, 'missed': 2, 'p50': 0.000064, 'p99': 0.008192, 'max': 0.0075, ...}
+
+Only the firing path records anything. When stats are off, the cost is one attribute check per fire,
+and nothing when not due.
+Lateness is put in a histogram of power-of-2 buckets, from 1 microsecond up,
+so percentiles are the upper edge of their bucket (within a factor of 2).
+'''
+
+import math
+
+class TimerStats(object):
+    Base = 0.000001 # seconds, upper edge of the first bucket
+    Buckets = 32 # last bucket is "everything bigger", ~ 35 minutes
+
+    __slots__ = ('fires', 'missed', 'max_late', 'total_late', 'histogram')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.fires = 0
+        self.missed = 0 # whole intervals that went by without a fire
+        self.max_late = 0
+        self.total_late = 0
+        self.histogram = [0] * self.Buckets
+
+    def record(self, late, missed=0):
+        # late: seconds after the deadline that we fired
+        self.fires += 1
+        self.missed += missed
+        self.total_late += late
+        if late > self.max_late:
+            self.max_late = late
+        self.histogram[ self.bucket(late) ] += 1
+
+    def bucket(self, late):
+        if late <= self.Base:
+            return 0
+        exponent = math.frexp(late / self.Base)[1] # late/Base < 2**exponent
+        if math.ldexp(0.5, exponent) == late / self.Base:
+            exponent -= 1 # exact power of 2 is the upper edge of the lower bucket
+        return min(exponent, self.Buckets - 1)
+
+    def bucket_edge(self, index):
+        # upper edge, in seconds, of bucket[index]
+        return math.ldexp(self.Base, index)
+
+    def percentile(self, p):
+        # e.g. 0.99: the upper edge of the bucket that has the p'th fire, capped at max_late
+        if not self.fires:
+            return 0
+        want = p * self.fires
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= want:
+                return min( self.bucket_edge(index), self.max_late )
+        return self.max_late
+
+    def snapshot(self):
+        # a plain dict, for your metrics pipeline
+        return {
+            'fires' : self.fires,
+            'missed' : self.missed,
+            'mean' : self.total_late / self.fires if self.fires else 0,
+            'p50' : self.percentile(0.5),
+            'p99' : self.percentile(0.99),
+            'max' : self.max_late,
+            'histogram' : dict( (self.bucket_edge(index), count) for index, count in enumerate(self.histogram) if count ),
+            }
+
+def snapshots(everies, reset=False):
+    # {object : snapshot} for the objects that have stats. reset: start over, e.g. per reporting period
+    result = {}
+    for an_every in everies:
+        if an_every.stats is not None:
+            result[an_every] = an_every.stats.snapshot()
+            if reset:
+                an_every.stats.reset()
+    return result
@@ -0,0 +1,69 @@
+'''
+# fires(): the fires a group of Every/Timer objects would make, in time order
+#
+# For offline analysis, and replay: no sleeping, and no polling in between.
+
+from every.every import Every, Timer
+from every.stream import fires
+
+blink = Every(0.5, 0.1)
+beep = Timer(2)
+beep.start()
+
+for an_every, i, when in fires( [blink, beep], end=blink.clock.now() + 3600 ): # the next hour
+    ...an_every fired at `when`, and its .i became i...
+
+It is a k-way merge: a heap of one (next deadline) entry per object, so memory stays the same
+however long the window (end=None goes on forever, for the repeating ones).
+Each object is copied (yours don't change), and the copies are called with now=when,
+so the drift-correction, patterns, catchup, etc. are exactly Every.__call__'s.
+An object that is already due (e.g. a new Every fires instantly) fires at `start`.
+Ties fire in the order of the list, like a loop that calls them in that order.
+Like the Scheduler: regular python (heapq), and clocks that don't wrap around (not TicksMsClock).
+'''
+
+import heapq, copy, math
+
+def _nudge(now):
+    # the next possible time, for when float rounding says "not quite yet"
+    if isinstance(now, float):
+        return math.nextafter(now, math.inf)
+    return now + 1
+
+def fires(everies, start=None, end=None):
+    # yield (an_every, i, when) for each fire, from `start` till `end` (inclusive) in clock.now() ticks
+    # an_every is your object, i is the .i after that fire (the next step, None for lightweight ones),
+    # when is the time it fired
+    # start default: clock.now() of the first object
+    if not everies:
+        return
+    if start is None:
+        start = everies[0].clock.now()
+
+    heap = []
+    for order, an_every in enumerate(everies):
+        if getattr(an_every, '_ticks', None).__class__ is list:
+            raise Exception("fires() can't copy a lazy .interval: %s" % (an_every.interval,))
+        copied = copy.copy(an_every)
+        if getattr(copied, '_extra', None) is not None:
+            copied._extra = copy.copy(copied._extra) # its own .missed
+        if getattr(copied, 'stats', None) is not None:
+            copied.stats = None # don't record into yours
+        when = copied.deadline()
+        if when is not None:
+            heap.append( (max(when, start), order, copied, an_every) )
+    heapq.heapify(heap)
+
+    while heap:
+        when, order, copied, an_every = heap[0]
+        if end is not None and when > end:
+            return
+        while not copied(when):
+            when = _nudge(when)
+        yield an_every, getattr(copied, 'i', None), when
+
+        deadline = copied.deadline()
+        if deadline is None:
+            heapq.heappop(heap) # a timer that finished
+        else:
+            heapq.heapreplace( heap, (max(deadline, when), order, copied, an_every) )
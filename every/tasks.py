@@ -0,0 +1,167 @@
+# `tasks
+# ====================================================
+#
+# Several things at once, without asyncio: tasks are plain generators,
+# that `yield` to wait, and a Runner resumes each one when its wait is over.
+# Instead of writing the state machine with `if blink(): if blink.i % 2:...` etc.
+#
+# def blink():
+#     while True:
+#         cp.red_led = True
+#         yield 0.5 # seconds
+#         cp.red_led = False
+#         yield 0.1
+#
+# def beeper(pattern):
+#     while True:
+#         i = yield pattern # an Every/Timer: till it fires, gives its .i (None for lightweight ones)
+#         ...
+#
+# runner = Runner()
+# runner.add( blink() )
+# runner.add( beeper( Every(1, 0.1) ) )
+# runner.run() # till all the tasks finish
+# # or, with other things in your loop:
+# while (1):
+#     runner.run_once()
+#     ...
+#
+# A task can yield:
+#   a number: sleep that many seconds
+#   an Every/Timer (the full or lightweight ones, anything with .deadline() and __call__): till it fires
+#     (a Timer that isn't running is checked each pass, till something .start()'s it)
+#   None: let the others run, and resume on the next pass
+#
+# The waiting tasks are kept in order of their deadline (a linked list through the Task objects),
+# so a pass only looks at the ones that are due. Nothing is allocated per switch
+# (with an integer clock, e.g. TicksMsClock, on micro/circuit-python).
+# An exception in a task stops that task, and is given to runner.error(task, exception), which prints it.
+
+from every.clock import monotonic_clock
+
+class Task(object):
+    # A generator waiting in a Runner
+    __slots__ = ('gen', 'waiting', 'deadline', 'next')
+
+    def __init__(self, gen):
+        self.gen = gen
+        self.waiting = None # the Every/Timer we are waiting on, if any
+        self.deadline = None # clock.now() to look at us
+        self.next = None # the next task in the run queue
+
+class Runner(object):
+    __slots__ = ('clock', 'head', 'count')
+
+    def __init__(self, clock=None):
+        # clock: from every.clock, default is time.monotonic(). The clock of any Every/Timer the tasks yield
+        self.clock = monotonic_clock if clock is None else clock
+        self.head = None # the run queue, earliest deadline first
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, gen, now=None):
+        # run the generator, starting on the next pass. Returns its Task
+        task = Task(gen)
+        task.deadline = self.clock.now() if now is None else now
+        self._insert(task)
+        self.count += 1
+        return task
+
+    def _before(self, a, b):
+        # is deadline a earlier than b? (wraparound-safe)
+        clock = self.clock
+        return clock.diff(a, b) < 0 if clock.period else a < b
+
+    def _insert(self, task):
+        # after the tasks with the same or earlier deadline
+        deadline = task.deadline
+        if self.head is None or self._before(deadline, self.head.deadline):
+            task.next = self.head
+            self.head = task
+            return
+        at = self.head
+        while at.next is not None and not self._before(deadline, at.next.deadline):
+            at = at.next
+        task.next = at.next
+        at.next = task
+
+    def next_deadline(self):
+        # the earliest clock.now() that a task is due, None if there are no tasks
+        return None if self.head is None else self.head.deadline
+
+    def run_once(self, now=None):
+        # resume the tasks that are due, returns how many were resumed
+        # now: a clock.now() you already have
+        clock = self.clock
+        if now is None:
+            now = clock.now()
+
+        # take the due ones off the front, so a task that is due again (yield None) waits for the next pass
+        due = self.head
+        if due is None or self._before(now, due.deadline):
+            return 0
+        last = due
+        while last.next is not None and not self._before(now, last.next.deadline):
+            last = last.next
+        self.head = last.next
+        last.next = None
+
+        resumed = 0
+        while due is not None:
+            task = due
+            due = task.next
+            task.next = None
+            waiting = task.waiting
+            if waiting is None:
+                resumed += 1
+                self._resume(task, None, now)
+            elif waiting(now):
+                resumed += 1
+                self._resume(task, getattr(waiting, 'i', None), now)
+            else:
+                # not started, or float rounding disagreed with .deadline(): look again next pass
+                self._wait(task, waiting, now)
+        return resumed
+
+    def _resume(self, task, value, now):
+        try:
+            what = task.gen.send(value)
+        except StopIteration:
+            self.count -= 1
+            return
+        except Exception as e:
+            self.count -= 1
+            self.error(task, e)
+            return
+        self._wait(task, what, now)
+
+    def _wait(self, task, what, now):
+        # queue the task for what it yielded
+        if what is None:
+            task.waiting = None
+            task.deadline = now
+        elif isinstance(what, int) or isinstance(what, float):
+            task.waiting = None
+            clock = self.clock
+            task.deadline = clock.add( now, clock.ticks(what) )
+        else:
+            task.waiting = what
+            deadline = what.deadline()
+            task.deadline = now if deadline is None or self._before(deadline, now) else deadline
+        self._insert(task)
+
+    def error(self, task, exception):
+        # a task raised, override to do something else
+        print("Task %s failed: %r" % (task.gen, exception))
+
+    def run(self):
+        # run till all the tasks finish, sleeping (clock.sleep) till the next one is due
+        clock = self.clock
+        while self.head is not None:
+            self.run_once()
+            if self.head is not None:
+                remaining = clock.seconds( clock.diff( self.head.deadline, clock.now() ) )
+                if remaining > 0:
+                    clock.sleep(remaining)
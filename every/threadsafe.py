@@ -0,0 +1,72 @@
+'''
+# ConcurrentEvery
+#
+# An Every (or Timer) that several threads can poll at the same time:
+# each fire is True in exactly one thread, and .i doesn't skip steps.
+# E.g. one "flush every 1 second" gate shared by a pool of workers.
+
+from every.threadsafe import ConcurrentEvery, ConcurrentTimer
+
+flush = ConcurrentEvery(1)
+
+def worker():
+    while(1):
+        ...
+        if flush(): # True in only one of the threads, once a second
+            ...flush...
+
+A plain Every does a read-modify-write of .last and .i with no locking,
+so two threads can both see True (more likely on free-threaded, no-GIL, python).
+Here, the not-due case (almost every call) only reads, without the lock, so polling threads
+don't wait for each other. When it looks due, we take the object's lock, check again, and fire:
+only the thread that gets there first sees True. .start(), .interval=, .seek() and .align() take the lock too.
+Regular python (threading).
+'''
+
+import threading
+from every.every import Every, COALESCE
+
+class ConcurrentEvery(Every):
+    def __init__(self, *interval, clock=None, catchup=COALESCE):
+        # like Every()
+        self.lock = threading.Lock()
+        super().__init__(*interval, clock=clock, catchup=catchup)
+
+    def __call__(self, now=None):
+        # true, in one thread, when the current interval expires
+        clock = self.clock
+        if now is None:
+            now = clock.now()
+        # not due? Just reads, and a stale read only means we look again under the lock, or next time
+        ticks = self._ticks
+        i = self.i
+        last = self.last
+        if i < len(ticks): # else .interval= is changing it
+            this_interval = ticks[i]
+            if not (self.running and this_interval != 0 and (clock.diff(now, last) if clock.period else now - last) >= this_interval):
+                return False
+        with self.lock:
+            return super().__call__(now)
+
+    @property
+    def interval(self):
+        return Every.interval.fget(self)
+
+    @interval.setter
+    def interval(self, v):
+        with self.lock:
+            Every.interval.fset(self, v)
+
+    def start(self, now=None):
+        with self.lock:
+            return super().start(now)
+
+    def _seek(self, position, now):
+        with self.lock:
+            return super()._seek(position, now)
+
+class ConcurrentTimer(ConcurrentEvery):
+    # Timer: ConcurrentEvery(a,b,0), i.e. one-shot
+    def __init__(self, *interval, clock=None, catchup=COALESCE):
+        # add the ,0
+        super().__init__( *( tuple(list(interval) + [0]) ), clock=clock, catchup=catchup)
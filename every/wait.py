@@ -0,0 +1,50 @@
+# `wait
+# ====================================================
+# 
+# Sleep till the next Every/Timer (etc.) will fire, instead of spinning the loop.
+# Saves CPU/battery when nothing is due for a while.
+# Works with every.every, and the lightweight versions.
+# 
+# blink = Every(0.5)
+# beep = Timer(2)
+# while (1):
+#     if blink():
+#         do something
+#     if beep():
+#         do something else
+#     wait(blink, beep) # sleep till the earlier of them
+#
+# If you have to notice other things (buttons, sensors), limit the sleep:
+#     wait(blink, beep, max_sleep=0.05)
+#
+# With a clock from every.clock, its .sleep() is used, e.g. VirtualClock just advances:
+#     wait(blink, beep, clock=clock)
+
+import time
+
+def sleep_for(duration, max_sleep=None, sleep=None):
+    # Sleep `duration` seconds, but no more than max_sleep.
+    # `duration` of None means "nothing to wait for": sleeps max_sleep, or not at all.
+    # sleep: the function to do it, default time.sleep
+    # Returns the seconds we slept.
+    if duration is None:
+        duration = max_sleep or 0
+    elif max_sleep is not None and duration > max_sleep:
+        duration = max_sleep
+
+    if duration > 0:
+        (time.sleep if sleep is None else sleep)(duration)
+        return duration
+    return 0
+
+def wait(*everies, max_sleep=None, clock=None):
+    # Sleep till the earliest of everies is due, but no more than max_sleep.
+    # Doesn't sleep if one is already due, or if none will fire and there is no max_sleep.
+    # Each object may have its own clock (every.clock), we just ask for its .remaining() seconds.
+    # Returns the seconds we slept.
+    soonest = None
+    for an_every in everies:
+        remaining = an_every.remaining()
+        if remaining is not None and (soonest is None or remaining < soonest):
+            soonest = remaining
+    return sleep_for(soonest, max_sleep, None if clock is None else clock.sleep)
@@ -0,0 +1,185 @@
+'''
+# Timing wheel
+#
+# For huge populations of one-shot timers (e.g. per-request timeouts),
+# that are started, and often abandoned by a fresh .start().
+# A hierarchical timing wheel gives O(1) .start(), O(1) restart/cancel, and amortized O(1) expiry,
+# instead of polling every Timer.
+
+from every.wheel import TimingWheel
+
+wheel = TimingWheel(resolution=0.001, slots=256, levels=4)
+request_timeout = wheel.timer(5.0) # like Timer(5.0)
+
+    request_timeout.start()
+    ...
+    if request_timeout(): # same as Timer
+        give up
+
+Or, poll the wheel once, and get the expired timers:
+
+    for a_timer in wheel.advance():
+        ...
+
+The wheel has `levels` rings of `slots` buckets. Level 0 buckets are `resolution` seconds wide,
+level 1 buckets are `slots` level-0 rings wide, and so on.
+A timer is appended to the bucket for its expiry tick, and moved down a level ("cascade")
+as the wheel turns. Restart/cancel just bumps the timer's generation: the old bucket entry is
+ignored when its bucket comes up (lazy), so there is no searching.
+
+Timers fire up to 1 `resolution` late, never early.
+'''
+
+from every.clock import monotonic_clock
+
+class TimingWheel(object):
+    def __init__(self, resolution=0.001, slots=256, levels=4, clock=None):
+        # resolution in seconds. Can schedule up to resolution * slots**levels into the future
+        # before using the (slower) overflow list
+        # clock: from every.clock, float seconds that don't wrap (the default, or VirtualClock)
+        self.clock = monotonic_clock if clock is None else clock
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self.spans = [ slots ** level for level in range(levels) ] # ticks per bucket at each level
+        self.wheels = [ [ [] for s in range(slots) ] for level in range(levels) ]
+        self.overflow = [] # too far in the future for the top level
+        self.origin = self.clock.now()
+        self.tick = 0 # the last tick we processed
+        self.expired = [] # from the last .advance()
+
+    def timer(self, *interval):
+        # convenience
+        return WheelTimer(self, *interval)
+
+    def tick_at(self, when):
+        # the first tick at-or-after the clock.now() `when`
+        ticks = (when - self.origin) / self.resolution
+        whole = int(ticks)
+        return whole if whole == ticks else whole + 1
+
+    def _insert(self, a_timer, expires):
+        # expires is >= self.tick (during cascade, that's the tick we are processing)
+        delta = expires - self.tick
+        entry = (a_timer.gen, a_timer)
+        top = self.levels-1
+        if delta >= self.spans[top] * self.slots:
+            self.overflow.append(entry)
+            return
+        for level in range(top, 0, -1):
+            span = self.spans[level]
+            if delta >= span:
+                self.wheels[level][ (expires // span) % self.slots ].append(entry)
+                return
+        self.wheels[0][ expires % self.slots ].append(entry)
+
+    def schedule(self, a_timer):
+        # (re)schedule a_timer for its .due, any older entry becomes stale
+        expires = self.tick_at(a_timer.due)
+        if expires <= self.tick:
+            # already due
+            a_timer._expire(self)
+        else:
+            self._insert(a_timer, expires)
+
+    def _cascade(self, level):
+        # move a bucket's entries to lower levels
+        span = self.spans[level]
+        bucket = self.wheels[level][ (self.tick // span) % self.slots ]
+        if level == self.levels-1:
+            # and the overflow gets re-checked once per top-level bucket
+            bucket.extend(self.overflow)
+            self.overflow = []
+        self.wheels[level][ (self.tick // span) % self.slots ] = []
+        for gen, a_timer in bucket:
+            if gen == a_timer.gen:
+                self._insert(a_timer, self.tick_at(a_timer.due))
+
+    def advance(self, now=None):
+        # Turn the wheel up to now, and return the list of timers that expired
+        if now is None:
+            now = self.clock.now()
+        target = int( (now - self.origin) / self.resolution )
+        if target <= self.tick:
+            return () # nothing can have expired
+        self.expired = []
+        slots = self.slots
+        spans = self.spans
+        level0 = self.wheels[0]
+        while self.tick < target:
+            self.tick += 1
+            tick = self.tick
+            if tick % slots == 0:
+                # higher levels first, so their entries can land in the lower ones
+                for level in range(self.levels-1, 0, -1):
+                    if tick % spans[level] == 0:
+                        self._cascade(level)
+                if self.levels == 1:
+                    # nothing to cascade from, but the overflow still has to be re-checked
+                    self._cascade(0)
+            bucket = level0[ tick % slots ]
+            if bucket:
+                level0[ tick % slots ] = []
+                for gen, a_timer in bucket:
+                    if gen == a_timer.gen:
+                        a_timer._expire(self)
+        return self.expired
+
+class WheelTimer(object):
+    # Acts like Timer: one-shot interval, or pattern of intervals.
+    # But, is driven by a TimingWheel
+
+    __slots__ = ('wheel', 'interval', 'i', 'running', 'last', 'due', 'gen', 'fired')
+
+    def __init__(self, wheel, *interval):
+        self.wheel = wheel
+        self.interval = tuple(interval) + (0,) # like Timer
+        self.i = len(self.interval)-1
+        self.running = False # we aren't usable till .start()
+        self.last = 0
+        self.due = 0
+        self.gen = 0
+        self.fired = False
+
+    def start(self, now=None):
+        self.gen += 1 # the old wheel entry, if any, is now stale
+        self.running = True
+        self.i = 0
+        self.fired = False
+        self.last = self.wheel.clock.now() if now is None else now
+        self.due = self.last + self.interval[0]
+        self.wheel.schedule(self)
+        return self
+
+    def cancel(self):
+        # stop without firing
+        self.gen += 1
+        self.running = False
+        self.fired = False
+        return self
+
+    def _expire(self, wheel):
+        # the wheel says our current interval is done
+        self.fired = True
+        wheel.expired.append(self)
+        while True:
+            self.last = self.due
+            self.i = (self.i + 1) % len(self.interval)
+            next_interval = self.interval[self.i]
+            if next_interval == 0:
+                self.running = False
+                return
+            self.due += next_interval # no drift
+            expires = wheel.tick_at(self.due)
+            if expires > wheel.tick:
+                wheel._insert(self, expires)
+                return
+            # the wheel was late, and the next interval is done too: coalesce
+
+    def __call__(self, now=None):
+        # true when the current interval expires
+        self.wheel.advance(now)
+        if self.fired:
+            self.fired = False
+            return True
+        return False
@@ -1,5 +1,6 @@
 from adafruit_circuitplayground import cp
 from every.every import Every
+from every.wait import wait
 
 every_half_second = Every(0.5) # every 0.5 seconds
 
@@ -9,3 +10,6 @@ while(1):
     if every_half_second(): # note the "()" for the test
         # this block runs "every half second"
         cp.red_led = not cp.red_led # blink
+
+    # nothing else to do, so sleep till the next blink instead of spinning
+    wait(every_half_second)
@@ -3,6 +3,7 @@
 '''
 from adafruit_circuitplayground import cp
 from every.every import Every
+from every.wait import wait
 
 # globals
 led_duration = Every(1.0, 0)
@@ -19,3 +20,6 @@ while (True):
     if led_duration(): # won't start running till .start
         cp.red_led = False
 
+    # don't spin, but check the button at least every 0.05 seconds
+    wait(led_duration, max_sleep=0.05)
+
@@ -1,5 +1,6 @@
 from adafruit_circuitplayground import cp
 from every.every import Every
+from every.wait import wait
 
 long_short_blink = Every(0.5, 0.1)
 fancy_blink_interval = Every(0.5, 0.4, 0.2, 0.1)
@@ -28,3 +29,6 @@ while(1):
         # show each progressive color on different pixel
         cp.pixels[ fancy_blink_interval.i + 1 ] = colors[ fancy_blink_interval.i ]
 
+    # sleep till the earlier of them, instead of spinning
+    wait(long_short_blink, fancy_blink_interval)
+
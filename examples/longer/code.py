@@ -2,6 +2,7 @@
 
 from adafruit_circuitplayground import cp
 from every.every import Every
+from every.wait import wait
 
 # globals
 blink_interval = Every(0.5)
@@ -43,3 +44,6 @@ while(1): # typical "loop" for "keep doing stuff" in circuit/micro python
         else:
             # playing, so:
             cp.stop_tone()
+
+    # sleep till the next one is due, instead of spinning
+    wait(blink_interval, long_short_blink, fancy_blink_interval, sound_duration)
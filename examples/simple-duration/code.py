@@ -5,8 +5,10 @@
 
 from adafruit_circuitplayground import cp
 from every.every import Every
+from every.debounce import Debounce
 
 sound_duration = Every(2, 0)
+touched = Debounce(0.05, leading=True) # True once, right when touched
 
 blink = Every(0.5)
 tone = 100
@@ -23,7 +25,8 @@ while(1):
         cp.pixels[8] = (0,0,0) if cp.pixels[8] == blink_white else blink_white
 
     # Touch near the usb port starts a duration
-    if cp.touch_A3 or cp.touch_A2 or cp.touch_A5 or cp.touch_A4:
+    # just on the touch, not on every pass while it is held
+    if touched(cp.touch_A3 or cp.touch_A2 or cp.touch_A5 or cp.touch_A4) and touched.value:
         sound_duration.start()
         cp.start_tone(tone)
         cp.red_led = True
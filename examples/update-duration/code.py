@@ -4,11 +4,16 @@
 
 from adafruit_circuitplayground import cp
 from every.every import Every
+from every.debounce import Debounce
 
 rate_a = 0.5
 rate_b = 0.1
 blink = Every(rate_a)
 
+# the pads have to be steady for 0.05 seconds. True once, on the change
+slow_pads = Debounce(0.05)
+fast_pads = Debounce(0.05)
+
 cp.pixels.brightness = 0.1 # too bright otherwise
 blink_white = (30,30,30)
 
@@ -20,12 +25,11 @@ while(1):
         cp.pixels[1] = (30,30,30) if cp.pixels[1] == (0,0,0) else (0,0,0)
         cp.pixels[8] = (30,30,30) if cp.pixels[8] == (0,0,0) else (0,0,0)
 
-    # This acts funny WHILE you are touching (blinks real fast)
-    # Real code should detect touch as the _transition_ from not-touch to touch
-
     # Touch near the blinking leds changes rate
-    if cp.touch_A3 or cp.touch_A2:
+    # Only on the _transition_ from not-touch to touch:
+    # setting .interval restarts it, so doing it on every pass WHILE touching would blink real fast
+    if slow_pads(cp.touch_A3 or cp.touch_A2) and slow_pads.value:
         blink.interval = rate_a
 
-    if cp.touch_A5 or cp.touch_A4:
+    if fast_pads(cp.touch_A5 or cp.touch_A4) and fast_pads.value:
         blink.interval = rate_b
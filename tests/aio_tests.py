@@ -0,0 +1,83 @@
+import unittest
+import sys, os
+from every.every import Every, Timer
+from every.lightweight_timer import Timer as LightweightTimer
+from every.aio import next_fire
+import time, asyncio
+
+class AsyncioTests(unittest.TestCase):
+    # on the real event loop: only lower bounds (never early), a busy machine can be late
+
+    def testAwaitTimer(self):
+        async def run():
+            tester = Timer(0.05)
+            tester.start()
+            start = time.monotonic()
+            i = await tester
+            return i, time.monotonic()-start, tester.running
+
+        i, elapsed, running = asyncio.run( run() )
+        assert i == 1, "Gives .i, saw %s" % i
+        assert not running, "Finished"
+        assert 0.049 <= elapsed < 1, "Elapsed 0.05, actually %s" % elapsed
+
+    def testAwaitNotRunning(self):
+        async def run():
+            await Timer(0.05)
+        self.assertRaises(RuntimeError, asyncio.run, run())
+
+    def testAsyncForPattern(self):
+        async def run():
+            steps = []
+            start = time.monotonic()
+            async for i in Every(0.05, 0.03):
+                steps.append( (i, time.monotonic()-start) )
+                if len(steps) == 4:
+                    break
+            return steps
+
+        steps = asyncio.run( run() )
+        assert [ i for i,elapsed in steps ] == [0,1,0,1], "Steps through the pattern, saw %s" % steps
+        for (i,elapsed),want in zip(steps, (0, 0.05, 0.08, 0.13)):
+            assert elapsed >= want - 0.001, "Not before %s, saw %s" % (want, steps)
+        assert steps[-1][1] < 1, "Not very late, saw %s" % steps
+
+    def testAsyncForTimerStops(self):
+        async def run():
+            tester = Timer(0.02, 0.02)
+            tester.start()
+            return [ i async for i in tester ]
+        assert asyncio.run( run() ) == [1, 2], "Each step, then stops"
+
+    def testConcurrent(self):
+        # lots of periodics, each is one loop timer, not a polling task
+        async def count(an_every, counts, index):
+            async for i in an_every:
+                counts[index] += 1
+
+        async def run():
+            counts = [0] * 100
+            start = time.monotonic()
+            tasks = [ asyncio.ensure_future( count(Every(0.02), counts, x) ) for x in range(100) ]
+            await asyncio.sleep(0.05)
+            for task in tasks:
+                task.cancel()
+            elapsed = time.monotonic() - start
+            await asyncio.gather(*tasks, return_exceptions=True)
+            return counts, elapsed
+
+        counts, elapsed = asyncio.run( run() )
+        # at 0 and 0.02 at least (their loop timers come before the sleep's), and one per 0.02 at most
+        most = 1 + int(elapsed / 0.02)
+        assert all( 2 <= n <= most for n in counts ), "Each fired at 0, 0.02, 0.04, saw %s in %s" % (set(counts), elapsed)
+
+    def testLightweight(self):
+        async def run():
+            tester = LightweightTimer(0.02)
+            tester.start()
+            await next_fire(tester)
+            return tester.running
+        assert asyncio.run( run() ) == False
+
+if __name__ == "__main__":
+    unittest.main() # run all tests
@@ -0,0 +1,97 @@
+import unittest
+import sys, os
+from every.every import Every, Timer
+from every.scheduler import Scheduler
+from every.clock import VirtualClock, TicksMsClock
+import time, math, random
+
+class AlignTests(unittest.TestCase):
+
+    def testAlign(self):
+        clock = VirtualClock(100.25)
+        tester = Every(1, clock=clock)
+        assert tester.align() is tester
+        assert tester.last == 100.0 and tester.deadline() == 101.0, "On the whole seconds, saw %s" % tester.deadline()
+
+        tester = Every(0.5, 0.25, clock=clock) # period 0.75
+        tester.align(epoch=10)
+        # 90.25 seconds since the epoch = 120 periods, then 0.25 into the 0.5
+        assert tester.i == 0 and tester.deadline() == 100.5, "Saw %s %s" % (tester.i, tester.deadline())
+
+    def testSameGrid(self):
+        # made at different times, but they fire together
+        clock = VirtualClock()
+        everies = []
+        for x in range(10):
+            clock.advance(0.125)
+            everies.append( Every( (1, 2, 4)[x % 3], clock=clock ).align() )
+        deadlines = set( an_every.deadline() for an_every in everies )
+        assert deadlines == {1.0, 2.0, 4.0}, "On the whole seconds, saw %s" % deadlines
+
+    def testTicks(self):
+        clock = TicksMsClock( ticks_ms=lambda: 2500, period=1 << 16 ) # the epoch has to be within half a period
+        tester = Every(1, clock=clock).align()
+        assert tester.deadline() == 3000
+
+    def testTimerRefuses(self):
+        self.assertRaises( Exception, Timer(1).align )
+
+class SlackTests(unittest.TestCase):
+
+    def testNextWakeup(self):
+        clock = VirtualClock()
+        scheduler = Scheduler(clock=clock)
+        early = Every(1, clock=clock)
+        later = Every(1, clock=clock)
+        early.start(0.0)
+        later.start(0.5)
+        scheduler.add( early, lambda an_every: None, slack=0.75 )
+        scheduler.add( later, lambda an_every: None )
+        assert scheduler.next_deadline() == 1.0
+        assert scheduler.next_wakeup() == 1.5, "early can wait for later, saw %s" % scheduler.next_wakeup()
+
+        scheduler.wait()
+        assert clock.now() == 1.5
+        assert scheduler.run_pending() == 2, "One wakeup for both"
+
+    def testNoSlack(self):
+        clock = VirtualClock()
+        scheduler = Scheduler(clock=clock)
+        tester = Every(1, clock=clock)
+        tester.start()
+        scheduler.add( tester, lambda an_every: None )
+        assert scheduler.next_wakeup() == scheduler.next_deadline() == 1.0
+        scheduler.remove(tester)
+        assert scheduler.next_wakeup() is None
+
+    def wakeups(self, align, slack):
+        # count the wakeups of a simulated loop of 50 objects
+        clock = VirtualClock()
+        rand = random.Random(2)
+        scheduler = Scheduler(clock=clock)
+        fires = []
+        for x in range(50):
+            clock.advance( rand.choice( (0.125, 0.25, 0.375) ) ) # made at different times
+            an_every = Every( rand.choice( (1, 2, 4, 8) ), clock=clock )
+            if align:
+                an_every.align()
+            scheduler.add( an_every, fires.append, slack=slack )
+        start = clock.now()
+        count = 0
+        while clock.now() < start + 600:
+            if scheduler.run_pending():
+                count += 1
+            scheduler.wait()
+        return count, len(fires)
+
+    def testFewerWakeups(self):
+        plain, plain_fires = self.wakeups(align=False, slack=0)
+        aligned, aligned_fires = self.wakeups(align=True, slack=0)
+        assert aligned * 5 < plain, "Far fewer wakeups, %s vs %s" % (aligned, plain)
+        assert aligned <= 601, "At most one per second, saw %s" % aligned
+        slacked, slacked_fires = self.wakeups(align=False, slack=0.5)
+        assert slacked * 2 < plain, "Slack shares wakeups too, %s vs %s" % (slacked, plain)
+        assert abs(plain_fires - slacked_fires) < 50, "Without losing fires, %s vs %s" % (plain_fires, slacked_fires)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import sys, os
+from every.every import Every
+from every.clock import VirtualClock
+import time, math, random
+
+try:
+    import numpy
+    from every.array import EveryArray
+except ImportError:
+    numpy = None
+
+@unittest.skipUnless(numpy, "needs numpy")
+class EveryArrayTests(unittest.TestCase):
+
+    patterns = [ 0.5, (0.5, 0.1), (0.3, 0.2, 0.1), (1, 0), (0.2, 0.4, 0), 0.25 ]
+
+    def testInitialState(self):
+        channels = EveryArray( self.patterns, now=100.0 )
+        assert channels.intervals.shape == (6, 3), "Padded to the longest pattern"
+        assert list(channels.lengths) == [1, 2, 3, 2, 3, 1]
+        assert list(channels.running) == [True, True, True, False, False, True], "Timers don't run till .start()"
+
+        fired = channels.poll(100.001)
+        assert list(fired) == [True, True, True, False, False, True], "Periodics fire instantly"
+        assert list(channels.i) == [0, 0, 0, 1, 2, 0], "Then .i is 0"
+
+    def testStart(self):
+        channels = EveryArray( [ (1, 0), (0.5, 0.5, 0) ], now=100.0 )
+        channels.start( [1], now=100.0 )
+        assert list( channels.poll_indices(100.6) ) == [1]
+        assert channels.i[1] == 1
+        assert list( channels.poll_indices(101.1) ) == [1]
+        assert not channels.running[1], "Finished"
+        assert list( channels.poll_indices(110) ) == [], "Never started"
+
+    def testMatchesEvery(self):
+        # drive Every objects and the array with the same fake clock, and irregular polling
+        clock = VirtualClock(1000.0)
+        rand = random.Random(1)
+        everies = [ Every( *(a_pattern if isinstance(a_pattern, tuple) else (a_pattern,)), clock=clock ) for a_pattern in self.patterns ]
+        channels = EveryArray( self.patterns, clock=clock )
+
+        for step in range(2000):
+            if step == 100:
+                # start the timers
+                for channel in (3, 4):
+                    everies[channel].start()
+                channels.start( [3, 4], now=clock.time )
+            if step == 500:
+                # change a pattern, to a longer one
+                everies[0].interval = (0.1, 0.2, 0.3, 0.4)
+                channels.set_interval( 0, (0.1, 0.2, 0.3, 0.4), now=clock.time )
+
+            # sometimes stall for several intervals
+            clock.advance(rand.choice( (0.01, 0.03, 0.07, 1.3) ))
+            want = [ an_every() for an_every in everies ]
+            fired = channels.poll()
+            assert list(fired) == want, "step %s: %s != %s" % (step, list(fired), want)
+            assert list(channels.i) == [ an_every.i for an_every in everies ]
+            assert list(channels.last) == [ an_every.last for an_every in everies ], "Same drift correction, exactly"
+            assert list(channels.running) == [ an_every.running for an_every in everies ]
+
+    def testDeadlines(self):
+        channels = EveryArray( [ 0.5, (1, 0) ], now=100.0 )
+        channels.poll(100.0)
+        deadlines = channels.deadlines()
+        assert deadlines[0] == 100.5
+        assert math.isnan( deadlines[1] ), "Not running"
+
+if __name__ == "__main__":
+    unittest.main() # run all tests
@@ -0,0 +1,131 @@
+import unittest
+import sys, os
+from every.batch import Batcher
+from every.clock import VirtualClock
+from concurrent.futures import ThreadPoolExecutor
+import time, math, threading
+
+class BatcherTests(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.batches = []
+
+    def testInterval(self):
+        clock = self.clock
+        batch = Batcher( self.batches.append, interval=1, clock=clock )
+        assert not batch(), "Nothing to flush"
+        batch.add('a')
+        batch.add('b')
+        clock.advance(0.5)
+        assert not batch(), "Not yet"
+        clock.advance(0.5)
+        assert batch(), "Interval is up"
+        assert self.batches == [ ['a', 'b'] ], "One bulk call, saw %s" % self.batches
+        assert len(batch) == 0
+
+        clock.advance(1)
+        assert not batch(), "Empty batches aren't flushed"
+        assert len(self.batches) == 1
+
+    def testMaxItems(self):
+        clock = self.clock
+        batch = Batcher( self.batches.append, interval=1, max_items=3, clock=clock )
+        assert [ batch.add(x) for x in range(7) ] == [False, False, True, False, False, True, False]
+        assert self.batches == [ [0,1,2], [3,4,5] ]
+
+        # the flush restarted the interval
+        clock.advance(0.75)
+        assert not batch()
+        clock.advance(0.25)
+        assert batch() and self.batches[-1] == [6]
+
+    def testMaxBytes(self):
+        batch = Batcher( self.batches.append, interval=1, max_bytes=10, clock=self.clock )
+        batch.add(b'12345')
+        assert batch.bytes == 5
+        assert not batch.add(b'1234')
+        assert batch.add(b'1'), "Hit 10 bytes"
+        assert len(self.batches) == 1 and batch.bytes == 0
+
+    def testMaxLatency(self):
+        clock = self.clock
+        batch = Batcher( self.batches.append, interval=10, max_latency=0.25, clock=clock )
+        clock.advance(1)
+        assert not batch(), "Latency timer isn't running while empty"
+        batch.add('a')
+        clock.advance(0.125)
+        batch.add('b') # doesn't restart the latency timer
+        clock.advance(0.125)
+        assert batch(), "The first item has waited max_latency"
+        assert self.batches == [ ['a', 'b'] ]
+        clock.advance(1)
+        assert not batch()
+
+    def testClose(self):
+        batch = Batcher( self.batches.append, interval=10, clock=self.clock )
+        batch.add('a')
+        batch.close()
+        assert self.batches == [ ['a'] ]
+
+    def testBackPressure(self):
+        # a flush that is slower than the fill rate
+        release = threading.Event()
+        started = []
+        def slow_flush(items):
+            started.append( list(items) )
+            release.wait(5)
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            batch = Batcher( slow_flush, interval=10, max_items=2, executor=executor, high_water=3, clock=self.clock )
+            assert not batch.add(1)
+            assert batch.add(2), "Flushes in the background"
+            assert batch.add(3) == False and batch.add(4) == False, "Still flushing: items collect"
+            assert batch.wanted
+            assert batch.stalls == 0
+
+            # high water: add() has to wait
+            threading.Timer(0.05, release.set).start()
+            start = time.monotonic()
+            assert batch.add(5), "Flushed, after waiting"
+            assert time.monotonic() - start >= 0.04, "Waited for the slow flush"
+            assert batch.stalls == 1
+            batch.close()
+            assert started == [ [1, 2], [3, 4, 5] ], "Nothing lost, in order, saw %s" % started
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def testFlushError(self):
+        def broken(items):
+            raise ValueError("broken")
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            batch = Batcher( broken, interval=10, max_items=1, executor=executor, clock=self.clock )
+            batch.add(1)
+            self.assertRaises( ValueError, batch.close )
+        finally:
+            executor.shutdown()
+
+    def testInlineFlushError(self):
+        clock = self.clock
+        fail = [True]
+        def flaky(items):
+            if fail[0]:
+                raise ValueError("broken")
+            self.batches.append(items)
+        batch = Batcher( flaky, interval=1, max_items=2, max_bytes=100, max_latency=0.5, clock=clock )
+        batch.add('a')
+        self.assertRaises( ValueError, batch.add, 'bc' )
+        assert len(batch) == 2 and batch.bytes == 3, "Put back, saw %s %s" % (len(batch), batch.bytes)
+        assert batch.flushes == 0
+
+        fail[0] = False
+        clock.advance(0.5)
+        assert batch(), "Tried again at max_latency"
+        assert self.batches == [ ['a', 'bc'] ], "Nothing lost, saw %s" % self.batches
+        assert len(batch) == 0 and batch.bytes == 0 and batch.flushes == 1
+
+if __name__ == '__main__':
+    unittest.main()
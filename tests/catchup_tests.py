@@ -0,0 +1,104 @@
+import unittest
+import sys, os
+from every.every import Every, Timer, COALESCE, BURST, SKIP
+from every.clock import VirtualClock, TicksMsClock
+from every.stats import TimerStats
+import time, math
+
+class CatchupTests(unittest.TestCase):
+
+    def testCoalesceIsDefault(self):
+        clock = VirtualClock(1000.0)
+        tester = Every(1.0, clock=clock)
+        assert tester.catchup == COALESCE
+        tester.start()
+        clock.advance(3.25) # 2 whole intervals missed
+        assert tester()
+        assert tester.missed == 2, "Reports the missed intervals, saw %s" % tester.missed
+        assert tester.last == clock.time - 0.25, "Same drift correction as always"
+        assert not tester(), "Only fires once"
+        clock.advance(0.75)
+        assert tester()
+        assert tester.missed == 0
+
+    def testBurst(self):
+        clock = VirtualClock(1000.0)
+        tester = Every(1.0, 0.5, clock=clock, catchup=BURST)
+        tester.start()
+        clock.advance(3.25) # 1 + 0.5 + 1 + 0.5, then 0.25 into the next 1.0
+        fires = 0
+        while tester():
+            fires += 1
+            assert fires < 10
+        assert fires == 4, "One fire per missed interval, saw %s" % fires
+        assert tester.i == 0 and tester.last == clock.time - 0.25, "Back in phase"
+        clock.advance(0.75)
+        assert tester(), "On schedule again"
+
+    def testBurstTimer(self):
+        clock = VirtualClock(1000.0)
+        tester = Timer(1.0, 0.5, clock=clock, catchup=BURST)
+        tester.start()
+        clock.advance(10)
+        assert [ tester() for x in range(4) ] == [True, True, False, False], "Each step, then done"
+        assert not tester.running
+
+    def testSkipToPhase(self):
+        clock = VirtualClock(1000.0)
+        pattern = (0.5, 0.1, 0.2, 0.3) # period 1.1
+        tester = Every(*pattern, clock=clock, catchup=SKIP)
+        tester.start()
+        clock.advance(1.1 * 5 + 0.65) # 5 periods, then in step 2
+        assert tester()
+        assert tester.i == 2, "Jumped straight to the step now is in, saw %s" % tester.i
+        assert math.isclose(tester.last, clock.time - 0.05), "In phase, saw %s" % (clock.time - tester.last)
+        assert tester.missed == 5 * 4 + 1, "Skipped steps, saw %s" % tester.missed
+        assert not tester(), "No trickle of fires"
+        clock.advance(0.151)
+        assert tester() and tester.i == 3, "Then on schedule"
+
+        # compare: coalesce takes many polls to get back in phase
+        coalesce = Every(*pattern, clock=clock)
+        coalesce.start()
+        clock.advance(1.1 * 5 + 0.65)
+        polls = 0
+        while coalesce():
+            polls += 1
+        assert polls > 1, "Trickles, %s" % polls
+
+    def testSkipTimer(self):
+        clock = VirtualClock(1000.0)
+        tester = Timer(1.0, 0.5, 2, clock=clock, catchup=SKIP)
+        tester.start()
+        clock.advance(1.6)
+        assert tester()
+        assert tester.i == 2 and tester.running
+        assert math.isclose(tester.last, clock.time - 0.1)
+        clock.advance(100)
+        assert tester()
+        assert not tester.running, "Past the end: done"
+        assert not tester()
+
+    def testSkipWraparound(self):
+        period = 1 << 12
+        ticks = [ period - 100 ]
+        clock = TicksMsClock(lambda: ticks[0], period)
+        tester = Every(0.1, 0.05, clock=clock, catchup=SKIP)
+        tester.start()
+        ticks[0] = clock.add(ticks[0], 1620) # 10 periods, + 0.12
+        assert tester()
+        assert tester.i == 1 and tester.last == clock.add(ticks[0], -20)
+
+    def testStatsUseMissed(self):
+        clock = VirtualClock(1000.0)
+        tester = Every(1.0, clock=clock, catchup=BURST)
+        tester.stats = TimerStats()
+        tester.start()
+        clock.advance(3.5)
+        while tester():
+            pass
+        assert tester.stats.fires == 3
+        assert tester.stats.missed == 0, "Burst doesn't drop any"
+
+if __name__ == "__main__":
+    unittest.main() # run all tests
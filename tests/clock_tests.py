@@ -0,0 +1,125 @@
+import unittest
+import sys, os
+from every.every import Every, Timer
+from every import lightweight_every, lightweight_timer
+from every.clock import MonotonicClock, NsClock, TicksMsClock, VirtualClock, monotonic_clock
+from every.wait import wait
+import time
+
+class FakeTicksMs(object):
+    # a ticks_ms() we control, with a small period so we can wrap around
+    def __init__(self, start):
+        self.ticks = start
+    def __call__(self):
+        return self.ticks
+
+class ClockTests(unittest.TestCase):
+
+    def testDefault(self):
+        tester = Every(0.5)
+        assert tester.clock is monotonic_clock
+        assert isinstance(tester.last, float), "Still time.monotonic() floats"
+        assert tester.interval == (0.5,)
+
+    def testNsClock(self):
+        clock = NsClock()
+        tester = Every(0.05, 0.03, clock=clock)
+        assert tester.interval == (0.05, 0.03), "Public interval is still seconds"
+        assert isinstance(tester.last, int) and isinstance(tester.deadline(), int), "But the ticks are integer nanoseconds"
+
+        assert tester(), "Instantly true"
+        start = time.monotonic()
+        hits = []
+        while len(hits) < 2 and time.monotonic() - start < 1:
+            if tester():
+                hits.append( time.monotonic() - start )
+                assert isinstance(tester.last, int), "Integer drift math"
+        # real clock, so only lower bounds (a busy machine can be late)
+        assert hits[0] >= 0.049, "First at 0.05, saw %s" % hits
+        assert hits[1] >= 0.079, "Then 0.03 more, saw %s" % hits
+        assert 0 < tester.remaining() <= 0.05, "Remaining is seconds, saw %s" % tester.remaining()
+
+    def testTicksMsWraparound(self):
+        period = 1 << 12 # 4.096 seconds
+        ticks_ms = FakeTicksMs(period - 300)
+        clock = TicksMsClock(ticks_ms, period)
+
+        tester = Every(0.25, 0.1, clock=clock)
+        assert tester(), "Instantly true"
+        hits = []
+        for step in range(1000): # 1 second, across the wrap
+            ticks_ms.ticks = clock.add(ticks_ms.ticks, 1)
+            if tester():
+                hits.append( (step+1, tester.i, tester.last) )
+        assert [ step for step,i,last in hits ] == [250, 350, 600, 700, 950], "Fires on time across the wrap, saw %s" % hits
+        assert all( 0 <= last < period for step,i,last in hits ), ".last stays in range"
+
+        # drift correction across the wrap
+        tester.start()
+        ticks_ms.ticks = clock.add(ticks_ms.ticks, 260)
+        assert tester()
+        assert tester.last == clock.add(ticks_ms.ticks, -10), "Drift corrected, saw %s" % tester.last
+
+    def testTicksMsTimer(self):
+        period = 1 << 12
+        ticks_ms = FakeTicksMs(period - 50)
+        clock = TicksMsClock(ticks_ms, period)
+        tester = Timer(0.1, clock=clock)
+        tester.start()
+        ticks_ms.ticks = clock.add(ticks_ms.ticks, 99)
+        assert tester.remaining() == 0.001
+        assert not tester()
+        ticks_ms.ticks = clock.add(ticks_ms.ticks, 1)
+        assert tester()
+        assert not tester.running
+
+    def testLightweight(self):
+        period = 1 << 12
+        ticks_ms = FakeTicksMs(period - 50)
+        clock = TicksMsClock(ticks_ms, period)
+
+        tester = lightweight_every.Every(0.1, clock)
+        assert tester.interval == 100, "Lightweight .interval is in ticks"
+        assert tester()
+        ticks_ms.ticks = clock.add(ticks_ms.ticks, 130)
+        assert tester()
+        assert tester.last == clock.add(ticks_ms.ticks, -30), "Drift corrected across the wrap"
+        assert tester.remaining() == 0.07
+
+        timer = lightweight_timer.Timer(0.1, clock)
+        timer.start()
+        ticks_ms.ticks = clock.add(ticks_ms.ticks, 100)
+        assert timer()
+
+    def testWaitMixedClocks(self):
+        fast = Every(0.03, clock=NsClock())
+        slow = lightweight_every.Every(0.2)
+        fast()
+        slow()
+        start = time.monotonic()
+        wait(fast, slow)
+        # real clocks, so loose: at least the fast one, and well short of the slow one
+        slept = time.monotonic() - start
+        assert 0.029 <= slept < 0.15, "Slept for the earliest, actually %s" % slept
+
+    def testVirtualClock(self):
+        clock = VirtualClock()
+        assert clock.now() == 0.0 and clock.period == 0
+        time.sleep(0.01)
+        assert clock.now() == 0.0, "Doesn't move by itself"
+        assert clock.advance(0.5) == 0.5 and clock.now() == 0.5
+        clock.sleep(0.25)
+        assert clock.now() == 0.75, "sleep() advances"
+        assert VirtualClock(100.0).now() == 100.0
+
+        # all the kinds of objects
+        everies = [ Every(0.5, clock=clock), lightweight_every.Every(0.5, clock), Timer(0.5, clock=clock), lightweight_timer.Timer(0.5, clock) ]
+        for an_every in everies[2:]:
+            an_every.start()
+        assert [ an_every() for an_every in everies ] == [True, True, False, False]
+        clock.advance(0.5)
+        assert [ an_every() for an_every in everies ] == [True, True, True, True]
+        assert [ an_every() for an_every in everies ] == [False, False, False, False]
+
+if __name__ == "__main__":
+    unittest.main() # run all tests
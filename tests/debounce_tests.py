@@ -0,0 +1,124 @@
+import unittest
+import sys, os
+from every.debounce import Debounce, Throttle, SlottedDebounce, SlottedThrottle
+from every.clock import VirtualClock, TicksMsClock
+import time, math, gc
+
+class FakeTicksMs(object):
+    # a ticks_ms() we control
+    def __init__(self, start):
+        self.ticks = start
+    def __call__(self):
+        return self.ticks
+
+class DebounceTests(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock()
+
+    def feed(self, tester, inputs, step=0.125):
+        # one input per step, the results
+        results = []
+        for raw in inputs:
+            results.append( tester(raw) )
+            self.clock.advance(step)
+        return results
+
+    def testTrailing(self):
+        tester = Debounce(0.25, clock=self.clock)
+        # bouncy press, then held, then released
+        results = self.feed( tester, [1,0,1,1,1,1,0,0,0] )
+        assert results == [False,False,False,False,True,False,False,False,True], "Once it holds still for 0.25, saw %s" % results
+        assert tester.value == 0
+
+    def testTrailingGlitch(self):
+        tester = Debounce(0.25, clock=self.clock)
+        results = self.feed( tester, [0,1,0,0,0,0] )
+        assert True not in results, "A short glitch is ignored, saw %s" % results
+        assert tester.value == False
+
+    def testLeading(self):
+        tester = Debounce(0.25, leading=True, clock=self.clock)
+        results = self.feed( tester, [1,0,1,1,0,0,0] )
+        assert results == [True,False,False,False,True,False,False], "Immediately, then a lockout, saw %s" % results
+
+    def testLeadingMissedRelease(self):
+        # released during the lockout: reported when the lockout ends
+        tester = Debounce(0.25, leading=True, clock=self.clock)
+        results = self.feed( tester, [1,0,0,0] )
+        assert results == [True,False,True,False], "saw %s" % results
+        assert tester.value == 0
+
+    def testValues(self):
+        tester = Debounce(0.25, value='low', clock=self.clock)
+        results = self.feed( tester, ['low','mid','mid','mid','high','high','high'] )
+        assert results == [False,False,False,True,False,False,True]
+        assert tester.value == 'high'
+
+    def testSharedNow(self):
+        tester = Debounce(0.5)
+        tester(True, 100.0)
+        assert not tester(True, 100.25)
+        assert tester(True, 100.5), "Fires at the given now"
+
+class ThrottleTests(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock()
+
+    def feed(self, tester, inputs, step=0.25):
+        results = []
+        for trigger in inputs:
+            results.append( tester(trigger) )
+            self.clock.advance(step)
+        return results
+
+    def testHeld(self):
+        tester = Throttle(1, clock=self.clock)
+        results = self.feed( tester, [True] * 12 )
+        assert results == [True,False,False,False] * 3, "At most once per interval, saw %s" % results
+
+    def testLeadingOnly(self):
+        tester = Throttle(1, trailing=False, clock=self.clock)
+        results = self.feed( tester, [True,True,False,False, False,True,False,False] )
+        assert results == [True,False,False,False, False,True,False,False], "saw %s" % results
+
+    def testTrailing(self):
+        tester = Throttle(1, clock=self.clock)
+        results = self.feed( tester, [True,True,False,False, False,False,False,False] )
+        assert results == [True,False,False,False, True,False,False,False], "The 2nd trigger comes out at the end, saw %s" % results
+
+    def testTrailingOnly(self):
+        tester = Throttle(1, leading=False, clock=self.clock)
+        results = self.feed( tester, [True,False,False,False, False,False] )
+        assert results == [False,False,False,False, True,False], "Only at the end of the interval, saw %s" % results
+
+    def testNeither(self):
+        self.assertRaises( Exception, Throttle, 1, leading=False, trailing=False )
+
+class AllocationTests(unittest.TestCase):
+
+    def testNothingRetained(self):
+        ticks = FakeTicksMs(0)
+        clock = TicksMsClock( ticks_ms=ticks, period=1 << 12 )
+        debounce = SlottedDebounce(0.05, clock=clock)
+        throttle = SlottedThrottle(0.1, clock=clock)
+        for x in range(100):
+            ticks.ticks = x
+            debounce(x % 20 < 10)
+            throttle(x % 3 == 0)
+        gc.collect()
+        blocks = sys.getallocatedblocks()
+        for x in range(10000):
+            ticks.ticks = x % (1 << 12)
+            debounce(x % 20 < 10)
+            throttle(x % 3 == 0)
+        gc.collect()
+        assert sys.getallocatedblocks() - blocks < 10, "Saw %s more blocks" % (sys.getallocatedblocks() - blocks)
+
+    def testSlotted(self):
+        assert not hasattr( SlottedDebounce(0.1), '__dict__' )
+        assert not hasattr( SlottedThrottle(0.1), '__dict__' )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,104 +1,79 @@
 import unittest
 import sys, os
 from every.every import Every
+from every.clock import VirtualClock
 import time, math
 
+# each pass of a polling loop takes this long, on the VirtualClock
+Step = 0.0005
+
 class PeriodAndDurationTests(unittest.TestCase):
+    # on a VirtualClock: polling loops advance it by Step, instead of spinning on the real time
     def setUp(self):
-        # we are going to be tricky, and make it here, so it's start is now
-        # when we test it, other tests may have run, using up its time!
-        self.start_tester = Every(0.05)
-
-    def test0Sanity_monotonic(self):
-        # make sure our assumptions hold
+        self.clock = VirtualClock()
+        self.start_tester = Every(0.05, clock=self.clock)
 
-        now = time.monotonic()
-        dumywork = 0
-        for x in range(1,100):
-            dumywork += 1
-        finished = time.monotonic()
-        assert now != finished, "Time actually passes according to monotonic()"
-        assert finished - now < 0.005, "But, we can get a lot of work done in 0.05 (actual %s)" % (finished-now)
+    def now(self):
+        # a pass of the polling loop
+        return self.clock.advance(Step)
 
     def testSimpleTimer(self):
         # does a basic behavior work
+        clock = self.clock
 
-        tenth = Every(0.05, 0)
-        start=time.monotonic()
-
+        tenth = Every(0.05, 0, clock=clock)
         assert not tenth(), "Does not fire instantly"
-        assert math.isclose(time.monotonic()-start, 0, rel_tol=0.01, abs_tol=0.001),"First test doesn't block or take time, saw %s != %s " % (time.monotonic()-start)
 
-        start=time.monotonic()
+        start=clock.now()
         tenth.start()
         finished = None
-        while( not finished and time.monotonic() - start < 1):
+        while( not finished and self.now() - start < 1):
             if tenth():
-                finished = time.monotonic()
+                finished = clock.now()
                 break
 
-        assert math.isclose(finished-start, 0.05, rel_tol=0.1, abs_tol=0.0), "Elapsed ~0.05, actually %s" % (finished-start)
+        assert math.isclose(finished-start, 0.05, rel_tol=0.0, abs_tol=Step), "Elapsed ~0.05, actually %s" % (finished-start)
 
     def testSimpleEvery(self):
         # does a basic behavior work at all?
+        clock = self.clock
 
-        tenth = Every(0.1)
-        start=time.monotonic()
+        tenth = Every(0.1, clock=clock)
+        start=clock.now()
         finished = None
-        while( not finished and time.monotonic() - start < 1):
+        while( not finished and clock.now() - start < 1):
             if tenth():
-                finished = time.monotonic()
+                finished = clock.now()
                 break
+            self.now()
 
-        assert math.isclose(finished-start, 0.0, rel_tol=0.1, abs_tol=0.001), "1st period is instantly, actually %s" % (finished-start)
+        assert finished == start, "1st period is instantly, actually %s" % (finished-start)
 
-        start=time.monotonic()
         finished = None
-        while( not finished and time.monotonic() - start < 1):
+        while( not finished and self.now() - start < 1):
             if tenth():
-                finished = time.monotonic()
+                finished = clock.now()
                 break
 
-        assert math.isclose(finished-start, 0.1, rel_tol=0.1, abs_tol=0.0), "Elapsed ~0.1, actually %s" % (finished-start)
-
-    def testNonBlocking(self):
-        # a major claim!
-
-        fifdred = Every(0.05)
-
-        start = time.monotonic()
-        fifdred() # expire immediately 1st time
-
-        # yes, already tested, but if you are debugging, you'll want to know
-        assert math.isclose(time.monotonic()-start, 0.0, rel_tol=0.1, abs_tol=0.001), "1st period is instantly, actually %s" % (finished-start)
-
-        # might as well test till expired
-        ct = 0
-        last = time.monotonic()
-        while not fifdred() and time.monotonic()-start < 1:
-            ct+=1
-            now = time.monotonic()
-            assert math.isclose(now-last, 0.0, rel_tol=0.1, abs_tol=0.001), "Doesn't block (loop # %s), actually %s" % (ct, now-last)
-            last = time.monotonic()
-        # I got 56,000 loops!
-        assert ct > 1,"Ran a polling loop, i.e., didn't block for %s>1 times" % ct
+        assert math.isclose(finished-start, 0.1, rel_tol=0.0, abs_tol=Step), "Elapsed ~0.1, actually %s" % (finished-start)
 
     def testFirstInterval(self):
         # do we provide an interval == first interval in patterns?
         # (cf. timers require .start(), and .start() causes "use first interval")
 
-        tester = Every(0.05, 0.1) # simple case
+        clock = self.clock
+        tester = Every(0.05, 0.1, clock=clock) # simple case
 
         # on instant start, we'll get true immediately
         assert tester(),"Instantly true"
         assert tester.i==0,"After the first hit, we are at .i==0, saw %s" % tester.i
 
         # the next interval should be the first one
-        start = time.monotonic()
+        start = clock.now()
         hit = None
-        while not hit and time.monotonic()-start < 1:
+        while not hit and self.now()-start < 1:
             if tester():
-                hit = time.monotonic()
+                hit = clock.now()
 
         assert hit,"Should have hit"
         assert tester.i==1,"After the second hit, we are at .i==1, saw %s" % tester.i
@@ -106,49 +81,49 @@ class PeriodAndDurationTests(unittest.TestCase):
 
         # and double check that the 2nd is the second
         hit = None
-        while not hit and time.monotonic()-start < 1:
+        while not hit and self.now()-start < 1:
             if tester():
-                hit = time.monotonic()
+                hit = clock.now()
         assert tester.i==0,"After the third hit, we are at .i==0, saw %s" % tester.i
         # actually we measure 1st+2nd here:
         assert math.isclose(hit-start, 0.15, rel_tol=0.1, abs_tol=0.0), "1st elapsed ~0.15, actually %s" % (hit-start)
 
     def testRunning(self):
-        start = time.monotonic()
-        tester = Every(0.05, 0)
+        clock = self.clock
+        start = clock.now()
+        tester = Every(0.05, 0, clock=clock)
         assert tester.running == False,"Timers aren't running till .start()"
 
         tester.start()
         assert tester.running == True,"Timers are running after .start()"
 
         hit = None
-        while not hit and time.monotonic()-start < 1:
+        while not hit and self.now()-start < 1:
             if tester():
-                hit = time.monotonic()
+                hit = clock.now()
         assert hit
         assert tester.running == False,"Timers aren't running after last interval"
 
     def testEveries(self):
-        # because Every takes time, we are going to test a bunch of things in parallel
-        # I had to tune math.isclose( ... rel_tol=x ) to match my systems performance. yuk
-        
+        # a bunch of things in parallel
+        clock = self.clock
         everies = []
 
         # periodics
         # we cause these to NOT fire instantly ( .start() ), so no 1st 0 duration:
-        everies.append( (Every(0.1), 0.1, 0.1, 0.1) ) # also checks that it repeats
-        everies.append( (Every(0.1, 0.15), 0.1, 0.15, 0.1, 0.15, 0.1) ) # also checks that it repeats
+        everies.append( (Every(0.1, clock=clock), 0.1, 0.1, 0.1) ) # also checks that it repeats
+        everies.append( (Every(0.1, 0.15, clock=clock), 0.1, 0.15, 0.1, 0.15, 0.1) ) # also checks that it repeats
         # don't get too long, it takes the total just to run the tests!
-        everies.append( (Every(0.1, 0.15, 0.2, 0.1), 0.1, 0.15, 0.2, 0.1, 0.1) )
+        everies.append( (Every(0.1, 0.15, 0.2, 0.1, clock=clock), 0.1, 0.15, 0.2, 0.1, 0.1) )
 
         # durations, put a fake -1, 
         # which makes us keep trying for a firing, 
         # but means it shouldn't actually fire,
         # and which we handle special below
-        everies.append( ( Every(0.1, 0), 0.1, -1 ))
-        everies.append( ( Every(0.2, 0.15, 0.1, 0), 0.2, 0.15, 0.1, -1 ))
+        everies.append( ( Every(0.1, 0, clock=clock), 0.1, -1 ))
+        everies.append( ( Every(0.2, 0.15, 0.1, 0, clock=clock), 0.2, 0.15, 0.1, -1 ))
 
-        start = time.monotonic()
+        start = clock.now()
         results = []
         done = False
 
@@ -157,11 +132,11 @@ class PeriodAndDurationTests(unittest.TestCase):
             # Also, this causes it to NOT fire instantly
             an_every.start()
 
-        while not done and time.monotonic()-start < 1.0:
+        while not done and self.now()-start < 1.0:
             # will always run 1.0 seconds, because we don't try to test if everybody is finished
             i = 0
             done = True
-            elapsed = time.monotonic()
+            elapsed = clock.now()
             for an_every, *want in everies:
                 if len( results ) <= i:
                     results.append( [ start ] ) # an extra for deltas!
@@ -199,39 +174,42 @@ class PeriodAndDurationTests(unittest.TestCase):
 
         for i,an_actual in enumerate(actual):
             if len(want) > i:
-                isclose.append( math.isclose(an_actual, want[i], rel_tol=0.1, abs_tol=0.001) )
+                isclose.append( math.isclose(an_actual, want[i], rel_tol=0.0, abs_tol=Step * 2) )
                 is_ok = is_ok and isclose[-1]
 
         assert is_ok and len(actual) == len(want), "Expected %s to be ~ %s, but got %s (%s)" % (prefix_msg, want, actual, isclose)
 
     def testLastIsStart(self):
-        tester = Every(0.05)
+        clock = self.clock
+        tester = Every(0.05, clock=clock)
 
         # again, instantly starts
-        now = time.monotonic() - 0.05 
-        assert math.isclose(tester.last-now, 0, rel_tol=0.01, abs_tol=0.001),"After constructor, expected .last == now, saw %s != %s " % (tester.last,now)
-        time.sleep(0.05) # make things different
+        now = clock.now() - 0.05
+        assert tester.last == now,"After constructor, expected .last == now, saw %s != %s " % (tester.last,now)
+        clock.advance(0.05) # make things different
         tester.start()
         # But, .start() won't fire till first duration
-        now = time.monotonic()
-        # (test vs 0, because we really want to test digits of significance)
-        assert math.isclose(tester.last-now, 0, rel_tol=0.01, abs_tol=0.001),"After .start(), expected .last == now, saw %s != %s " % (tester.last,now)
+        now = clock.now()
+        assert tester.last == now,"After .start(), expected .last == now, saw %s != %s " % (tester.last,now)
 
     def testStart(self):
-        test_start = time.monotonic()
+        # made in setUp, other time may have gone by
+        self.clock.advance(0.5)
+        test_start = self.clock.now()
 
         hit_at = None
-        while( time.monotonic() - test_start < 1):
+        while( self.now() - test_start < 1):
             if self.start_tester():
-                hit_at = time.monotonic()
+                hit_at = self.clock.now()
                 break
         assert hit_at, "Expected to expire at least once!" # sanity
 
     def testSetInterval(self):
-        test_start = time.monotonic()
+        clock = self.clock
+        test_start = clock.now()
 
-        unchanged = Every(0.05)
-        changed = Every(0.05)
+        unchanged = Every(0.05, clock=clock)
+        changed = Every(0.05, clock=clock)
         changed.interval = 0.1
 
         hit_at = {
@@ -240,18 +218,87 @@ class PeriodAndDurationTests(unittest.TestCase):
             }
 
         # let the slowest happen twice
-        while( time.monotonic() - test_start < 0.24):
+        while( clock.now() - test_start < 0.24):
             if unchanged():
-                #print("<<hit unchagned", time.monotonic() - test_start )
-                hit_at['unchanged'].append( time.monotonic() - test_start )
+                hit_at['unchanged'].append( clock.now() - test_start )
             if changed():
-                #print("<<hit chagned", time.monotonic() - test_start )
-                hit_at['changed'].append( time.monotonic() - test_start )
+                hit_at['changed'].append( clock.now() - test_start )
+            self.now()
 
         self.do_intervals_match( 'unchanged', hit_at['unchanged'], [ 0.0, 0.05, 0.1, 0.15, 0.2 ] )
-        print( "ci", changed.interval)
         self.do_intervals_match( 'changed', hit_at['changed'], [ 0.0, 0.1, 0.2] )
         
 
+    def testDeadline(self):
+        clock = self.clock
+        tester = Every(0.05, 0.1, clock=clock)
+        # before the first (instant) fire, we are "waiting" on the last interval
+        assert math.isclose(tester.deadline(), tester.last + 0.1, abs_tol=0.0001), "Waiting on last interval, saw %s" % tester.deadline()
+        assert tester.remaining() == 0, "Already expired"
+
+        tester.start()
+        assert math.isclose(tester.deadline(), tester.last + 0.05, abs_tol=0.0001), "After .start(), first interval"
+        assert math.isclose(tester.remaining(), 0.05, abs_tol=0.000001), "All of the first interval left, saw %s" % tester.remaining()
+
+        timer = Every(0.05, 0, clock=clock)
+        assert timer.deadline() is None, "Timers have no deadline till .start()"
+        assert timer.remaining() is None
+        timer.start()
+        assert math.isclose(timer.deadline(), timer.last + 0.05, abs_tol=0.0001)
+
+        while not timer() and self.now() - timer.last < 1:
+            pass
+        assert timer.deadline() is None, "Finished timers have no deadline"
+
+    def testSharedNow(self):
+        # the caller supplies the clock reading
+        tester = Every(0.5, 0.25)
+        tester.start(100.0)
+        assert tester.last == 100.0
+        assert not tester(100.49), "Not yet"
+        assert tester(100.5), "Fires at the given now"
+        assert tester.last == 100.5
+        assert not tester(100.74), "Next is 0.25 later"
+        assert tester(100.75), "Fires at the given now"
+        assert tester.remaining(101.0) == 0.25
+
+        timer = Every(1, 0)
+        timer.start(100.0)
+        assert timer.last == 100.0
+        assert not timer(100.5)
+        assert timer(101.0), "Same as .start(), then 1 second of monotonic()"
+
+    def testNonBlocking(self):
+        # a major claim! a call that isn't due returns False right away, it doesn't wait till it is
+        clock = self.clock
+        tester = Every(0.05, 0, clock=clock)
+        tester.start()
+
+        ct = 0
+        while True:
+            before = clock.now()
+            fired = tester()
+            assert clock.now() == before, "Returned without waiting"
+            if fired:
+                break
+            ct+=1
+            self.now()
+        assert ct > 1,"Ran a polling loop, i.e., didn't block for %s>1 times" % ct
+        assert math.isclose(clock.now(), 0.05, abs_tol=Step), "It fired, at %s" % clock.now()
+
+class RealClockTests(unittest.TestCase):
+    # smoke tests on the real time.monotonic(), with room for a busy machine
+
+    def testSimpleEvery(self):
+        tenth = Every(0.05)
+        assert tenth(), "1st period is instantly"
+        start = time.monotonic()
+        finished = None
+        while( not finished and time.monotonic() - start < 1):
+            if tenth():
+                finished = time.monotonic()
+        assert finished and finished - start >= 0.05 - 0.001, "Not early, actually %s" % (finished-start)
+        assert finished - start < 0.5, "Not very late, actually %s" % (finished-start)
+
 if __name__ == "__main__":
     unittest.main() # run all tests
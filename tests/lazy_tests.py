@@ -0,0 +1,142 @@
+import unittest
+import sys, os
+from every.every import Every, Timer, BURST, SKIP
+from every.clock import VirtualClock, TicksMsClock
+import time, math
+
+class LazyTests(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock()
+
+    def fires(self, tester, duration, step=0.125):
+        # the times it fired, polling every step
+        clock = self.clock
+        end = clock.now() + duration
+        fired = []
+        while clock.now() <= end:
+            if tester():
+                fired.append( clock.now() )
+            clock.advance(step)
+        return fired
+
+    def testRepeatsLikeTuple(self):
+        clock = self.clock
+        expect = self.fires( Every(0.5, 0.25, 1, clock=clock), 10 )
+        self.clock = clock = VirtualClock()
+        tester = Every( [0.5, 0.25, 1], clock=clock )
+        assert len(tester._ticks) == 1, "One interval at a time"
+        assert self.fires(tester, 10) == expect, "A list repeats like the tuple"
+
+    def testGenerator(self):
+        # a generator runs once: like a timer's trailing 0, but it is running to start with
+        clock = self.clock
+        tester = Every( (0.25 * x for x in range(1, 4)), clock=clock )
+        assert self.fires(tester, 5) == [0.0, 0.25, 0.75, 1.5], "Fires, then waits 0.25, 0.5, 0.75, then stops"
+        assert not tester.running and tester.deadline() is None
+
+    def testFunction(self):
+        # exponential backoff, that gives up
+        clock = self.clock
+        tester = Every( lambda step: 0.125 * 2**step if step < 4 else 0, clock=clock )
+        assert self.fires(tester, 5) == [0.0, 0.125, 0.375, 0.875, 1.875]
+        assert not tester.running
+
+    def testYieldedZeroStops(self):
+        tester = Every( [0.25, 0.25, 0, 0.25], clock=self.clock )
+        assert self.fires(tester, 2) == [0.0, 0.25, 0.5]
+
+    def testTimer(self):
+        clock = self.clock
+        tester = Timer( [0.25, 0.5], clock=clock )
+        assert not tester.running and self.fires(tester, 1) == [], "Waits for .start()"
+
+        tester.start()
+        start = clock.now()
+        assert [ x - start for x in self.fires(tester, 2) ] == [0.25, 0.75], "Once through"
+        assert not tester.running
+
+        tester.start()
+        start = clock.now()
+        assert [ x - start for x in self.fires(tester, 2) ] == [0.25, 0.75], "A list starts over"
+
+    def testTimerGenerator(self):
+        clock = self.clock
+        tester = Timer( iter([0.25, 0.5, 0.25]), clock=clock )
+        tester.start()
+        assert self.fires(tester, 0.5) == [0.25], "The first interval isn't lost"
+        tester.start()
+        start = clock.now()
+        assert [ x - start for x in self.fires(tester, 2) ] == [0.5, 0.75], "A generator carries on"
+
+    def testBurst(self):
+        clock = self.clock
+        for catchup in (BURST, SKIP):
+            tester = Every( [0.25, 0.5], clock=clock, catchup=catchup )
+            tester.start()
+            clock.advance(0.875)
+            assert tester() and tester() and not tester(), "Each interval (%s)" % catchup
+            clock.advance(10)
+
+    def testTicks(self):
+        clock = TicksMsClock( ticks_ms=lambda: 1000, period=1 << 16 )
+        tester = Every( [0.25, 0.5], clock=clock )
+        assert tester._ticks == [250]
+
+    def testLong(self):
+        # nothing materialized
+        tester = Every( 0.001 * x for x in range(1, 10**9) )
+        assert len(tester._ticks) == 1
+
+    def testOtherNumbers(self):
+        # numbers that aren't int/float are still plain patterns
+        from fractions import Fraction
+        clock = self.clock
+        for number in (Fraction(1, 2), ) + self.numpy_numbers():
+            tester = Every(number, clock=clock)
+            assert tester._ticks.__class__ is tuple, "Not lazy: %r" % number
+            assert tester() and tester.deadline() == clock.now() + 0.5, "%r" % number
+            tester = Every(number, number, clock=clock)
+            assert tester._ticks.__class__ is tuple
+
+    def numpy_numbers(self):
+        try:
+            import numpy
+        except ImportError:
+            return ()
+        return (numpy.float32(0.5), numpy.float64(0.5))
+
+    def testSetter(self):
+        clock = self.clock
+        tester = Every(1, clock=clock)
+        tester.interval = [0.25, 0.5]
+        assert tester.interval[0] == [0.25, 0.5] and tester._ticks == [0.25]
+        assert self.fires(tester, 1) == [0.0, 0.25, 0.75, 1.0], "Repeats"
+
+        tester.interval = (0.25 * x for x in range(1, 3))
+        assert self.fires(tester, 2) == [1.125, 1.375, 1.875], "A generator, once"
+
+        tester.interval = lambda step: 0.5
+        assert tester()
+        tester.interval = 0.5
+        assert tester._ticks == (0.5,), "Back to a plain interval"
+        self.assertRaises( Exception, setattr, tester, 'interval', object() )
+
+    def testStringsArentSources(self):
+        # iterable, but not a pattern of characters
+        for bad in ( "1.5", b"1.5", bytearray(b"1.5") ):
+            self.assertRaises( TypeError, Every, bad, clock=self.clock )
+            self.assertRaises( TypeError, Every, bad, 0, clock=self.clock )
+        tester = Every(0.5, clock=self.clock)
+        self.assertRaises( TypeError, setattr, tester, 'interval', "0.25" )
+
+    def testRefused(self):
+        tester = Every( [0.25], clock=self.clock )
+        self.assertRaises( Exception, tester.seek, 1 )
+        self.assertRaises( Exception, tester.align )
+        self.assertRaises( Exception, Every, [0.25], 1 )
+        from every.stream import fires
+        self.assertRaises( Exception, list, fires( [tester], end=1 ) )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,91 +1,90 @@
 import unittest
 import sys, os
 from every.lightweight_every import Every
-import time, math
+from every.clock import VirtualClock
+import math
 
-class LightweightEveryTests(unittest.TestCase):
+# each pass of a polling loop takes this long, on the VirtualClock
+Step = 0.0005
 
-    def test0Sanity_monotonic(self):
-        # make sure our assumptions hold
+class LightweightEveryTests(unittest.TestCase):
+    # on a VirtualClock: polling loops advance it by Step, instead of spinning on the real time
+    def setUp(self):
+        self.clock = VirtualClock()
 
-        now = time.monotonic()
-        dumywork = 0
-        for x in range(1,100):
-            dumywork += 1
-        finished = time.monotonic()
-        assert now != finished, "Time actually passes according to monotonic()"
-        assert finished - now < 0.005, "But, we can get a lot of work done in 0.05 (actual %s)" % (finished-now)
+    def now(self):
+        # a pass of the polling loop
+        return self.clock.advance(Step)
 
     def testInitialState(self):
-        tester = Every(0.05)
-        start=time.monotonic()
+        tester = Every(0.05, clock=self.clock)
 
         assert tester(), "Does fire instantly"
 
     def testRepeats(self):
+        clock = self.clock
         want_interval = 0.05
-        tester = Every(want_interval)
+        tester = Every(want_interval, clock=clock)
 
-        start=time.monotonic()
+        start=clock.now()
         finished = []
         # so, three times, immediate, and 2 durations
-        while( time.monotonic() - start < want_interval * 2):
+        while( clock.now() - start < want_interval * 2 + Step):
             if tester():
-                finished.append(time.monotonic() - start)
+                finished.append(clock.now() - start)
+            self.now()
 
         self.do_intervals_match( 'unchanged', finished, [0, want_interval, 2*want_interval] )
 
     def testSetLast(self):
         # there is no .start(), but you can use .last=
+        clock = self.clock
         want_interval = 0.05
-        tester = Every(want_interval)
+        tester = Every(want_interval, clock=clock)
         
         # make it go off at 0.025
-        tester.last = time.monotonic() - want_interval/2
+        tester.last = clock.now() - want_interval/2
 
-        start=time.monotonic()
+        start=clock.now()
         finished = None
-        while( not finished and time.monotonic() - start < want_interval * 2):
+        while( not finished and self.now() - start < want_interval * 2):
             if tester():
-                finished = time.monotonic()
+                finished = clock.now()
                 break
 
         assert finished,"It fired"
-        assert math.isclose(finished-start, want_interval/2, rel_tol=0.1, abs_tol=0.001), "Did its duration %s, actually %s" % (want_interval/2, finished-start)
+        assert math.isclose(finished-start, want_interval/2, rel_tol=0.0, abs_tol=Step), "Did its duration %s, actually %s" % (want_interval/2, finished-start)
 
     def testNonBlocking(self):
-        # a major claim!
-        want_interval = 0.05
-        tester = Every(want_interval)
-
-        start = time.monotonic()
+        # a major claim! a call that isn't due returns False right away, it doesn't wait till it is
+        clock = self.clock
+        tester = Every(0.05, clock=clock)
         tester() # get rid of immediate firing
-        now = time.monotonic()
-        assert math.isclose(now-start, 0.0, rel_tol=0.1, abs_tol=0.001), "Doesn't block at first (immedate), actually %s" % (ct, now-start)
 
-
-        # might as well test till expired
         ct = 0
-        last = time.monotonic()
-        while not tester() and time.monotonic()-start < want_interval*2:
+        while True:
+            before = clock.now()
+            fired = tester()
+            assert clock.now() == before, "Returned without waiting"
+            if fired:
+                break
             ct+=1
-            now = time.monotonic()
-            assert math.isclose(now-last, 0.0, rel_tol=0.1, abs_tol=0.001), "Doesn't block (loop # %s), actually %s" % (ct, now-last)
-            last = time.monotonic()
-        # I got 56,000 loops!
+            self.now()
         assert ct > 1,"Ran a polling loop, i.e., didn't block for %s>1 times" % ct
+        assert math.isclose(clock.now(), 0.05, abs_tol=Step), "It fired, at %s" % clock.now()
 
     def testSetInterval(self):
-        test_start = time.monotonic()
+        clock = self.clock
+        test_start = clock.now()
 
         unchanged_interval = 0.05
         changed_interval = unchanged_interval * 2
 
-        unchanged = Every(unchanged_interval)
+        unchanged = Every(unchanged_interval, clock=clock)
 
-        changed = Every(unchanged_interval)
+        changed = Every(unchanged_interval, clock=clock)
         changed.interval = changed_interval
-        changed.last = time.monotonic() # it was tweaked for immediate for unchanged_interval
+        changed.last = clock.now() # it was tweaked for immediate for unchanged_interval
         # That prevents the immediate firing!
 
         hit_at = {
@@ -94,17 +93,15 @@ class LightweightEveryTests(unittest.TestCase):
             }
 
         # let the slowest happen twice
-        while( time.monotonic() - test_start < unchanged_interval * 2 + unchanged_interval/2.0 ):
+        while( clock.now() - test_start < unchanged_interval * 2 + unchanged_interval/2.0 ):
             if unchanged():
-                #print("<<hit unchagned", time.monotonic() - test_start )
-                hit_at['unchanged'].append( time.monotonic() - test_start )
+                hit_at['unchanged'].append( clock.now() - test_start )
             if changed():
-                #print("<<hit chagned", time.monotonic() - test_start )
-                hit_at['changed'].append( time.monotonic() - test_start )
+                hit_at['changed'].append( clock.now() - test_start )
+            self.now()
 
         # we are recording elapsed from start (not interval), thus the 2*
         self.do_intervals_match( 'unchanged', hit_at['unchanged'], [0, unchanged_interval, 2*unchanged_interval] )
-        print( "ci", changed.interval)
         self.do_intervals_match( 'changed', hit_at['changed'], [changed_interval] )
 
     def do_intervals_match(self, prefix_msg, actual, want ):
@@ -114,10 +111,25 @@ class LightweightEveryTests(unittest.TestCase):
 
         for i,an_actual in enumerate(actual):
             if len(want) > i:
-                isclose.append( math.isclose(an_actual, want[i], rel_tol=0.1, abs_tol=0.001) )
+                isclose.append( math.isclose(an_actual, want[i], rel_tol=0.0, abs_tol=Step * 2) )
                 is_ok = is_ok and isclose[-1]
 
         assert is_ok and len(actual) == len(want), "Expected %s to be ~ %s, but got %s (%s)" % (prefix_msg, want, actual, isclose)
 
+    def testDeadline(self):
+        tester = Every(0.05, clock=self.clock)
+        assert tester.remaining() == 0, "Fires instantly"
+        tester()
+        assert math.isclose(tester.deadline(), tester.last + 0.05, abs_tol=0.0001)
+        assert math.isclose(tester.remaining(), 0.05, abs_tol=0.000001), "All of the interval left, saw %s" % tester.remaining()
+
+    def testSharedNow(self):
+        tester = Every(0.5)
+        now = tester.last + 0.5
+        assert tester(now), "Fires at the given now"
+        assert not tester(now + 0.49)
+        assert tester.remaining(now + 0.25) == 0.25
+        assert tester(now + 0.5)
+
 if __name__ == "__main__":
     unittest.main() # run all tests
@@ -1,105 +1,107 @@
 import unittest
 import sys, os
 from every.lightweight_timer import Timer
-import time, math
+from every.clock import VirtualClock
+import math
 
-class LightweightTimerTests(unittest.TestCase):
+# each pass of a polling loop takes this long, on the VirtualClock
+Step = 0.0005
 
-    def test0Sanity_monotonic(self):
-        # make sure our assumptions hold
+class LightweightTimerTests(unittest.TestCase):
+    # on a VirtualClock: polling loops advance it by Step, instead of spinning on the real time
+    def setUp(self):
+        self.clock = VirtualClock()
 
-        now = time.monotonic()
-        dumywork = 0
-        for x in range(1,100):
-            dumywork += 1
-        finished = time.monotonic()
-        assert now != finished, "Time actually passes according to monotonic()"
-        assert finished - now < 0.005, "But, we can get a lot of work done in 0.05 (actual %s)" % (finished-now)
+    def now(self):
+        # a pass of the polling loop
+        return self.clock.advance(Step)
 
     def testInitialState(self):
-        tester = Timer(0.05)
-        start=time.monotonic()
+        tester = Timer(0.05, clock=self.clock)
 
         assert not tester(), "Does not fire instantly"
         assert tester.running == False, "Not running initially"
 
     def testNotStart(self):
+        clock = self.clock
         want_interval = 0.05
-        tester = Timer(want_interval)
+        tester = Timer(want_interval, clock=clock)
         # NB: we don't .start
 
-        start=time.monotonic()
+        start=clock.now()
         finished = None
-        while( not finished and time.monotonic() - start < want_interval * 2):
+        while( not finished and self.now() - start < want_interval * 2):
             if tester():
-                finished = time.monotonic()
+                finished = clock.now()
                 break
 
         assert not finished,"It never fired, saw interval %s" % ( (finished if finished else 0) -start)
 
     def testStart(self):
+        clock = self.clock
         want_interval = 0.05
-        tester = Timer(want_interval)
+        tester = Timer(want_interval, clock=clock)
 
         tester.start()
-        start=time.monotonic()
+        start=clock.now()
         finished = None
-        while( not finished and time.monotonic() - start < want_interval * 2):
+        while( not finished and self.now() - start < want_interval * 2):
             if tester():
-                finished = time.monotonic()
+                finished = clock.now()
                 break
 
         assert finished,"It fired"
-        assert math.isclose(finished-start, want_interval, rel_tol=0.1, abs_tol=0.001), "Did its duration %s, actually %s" % (want_interval, finished-start)
+        assert math.isclose(finished-start, want_interval, rel_tol=0.0, abs_tol=Step), "Did its duration %s, actually %s" % (want_interval, finished-start)
 
     def testNonBlocking(self):
-        # a major claim!
-        want_interval = 0.05
-        tester = Timer(want_interval)
-
-        start = time.monotonic()
-        tester.start() 
+        # a major claim! a call that isn't due returns False right away, it doesn't wait till it is
+        clock = self.clock
+        tester = Timer(0.05, clock=clock)
+        tester.start()
 
-        # might as well test till expired
         ct = 0
-        last = time.monotonic()
-        while not tester() and time.monotonic()-start < want_interval*2:
+        while True:
+            before = clock.now()
+            fired = tester()
+            assert clock.now() == before, "Returned without waiting"
+            if fired:
+                break
             ct+=1
-            now = time.monotonic()
-            assert math.isclose(now-last, 0.0, rel_tol=0.1, abs_tol=0.001), "Doesn't block (loop # %s), actually %s" % (ct, now-last)
-            last = time.monotonic()
-        # I got 56,000 loops!
+            self.now()
         assert ct > 1,"Ran a polling loop, i.e., didn't block for %s>1 times" % ct
+        assert math.isclose(clock.now(), 0.05, abs_tol=Step), "It fired, at %s" % clock.now()
 
     def testRunning(self):
+        clock = self.clock
         want_interval = 0.05
-        tester = Timer(want_interval)
+        tester = Timer(want_interval, clock=clock)
         assert not tester.running,"Timer isn't running initially"
 
         tester.start()
-        start=time.monotonic()
+        start=clock.now()
 
         assert tester.running,"Timer is running after .start()"
 
         finished = None
-        while( not finished and time.monotonic() - start < want_interval * 2):
+        while( not finished and self.now() - start < want_interval * 2):
             if tester():
-                finished = time.monotonic()
+                finished = clock.now()
                 break
 
         assert finished,"It fired"
         assert not tester.running, "Timer isn't running after it is done"
 
     def testSetInterval(self):
-        test_start = time.monotonic()
+        clock = self.clock
+        test_start = clock.now()
 
         unchanged_interval = 0.05
         changed_interval = unchanged_interval * 2
 
-        unchanged = Timer(unchanged_interval)
+        unchanged = Timer(unchanged_interval, clock=clock)
         unchanged.start()
 
-        changed = Timer(unchanged_interval)
+        changed = Timer(unchanged_interval, clock=clock)
         changed.interval = changed_interval
         changed.start()
 
@@ -109,16 +111,14 @@ class LightweightTimerTests(unittest.TestCase):
             }
 
         # let the slowest happen twice
-        while( time.monotonic() - test_start < unchanged_interval * 2 + unchanged_interval/2.0 ):
+        while( clock.now() - test_start < unchanged_interval * 2 + unchanged_interval/2.0 ):
             if unchanged():
-                #print("<<hit unchagned", time.monotonic() - test_start )
-                hit_at['unchanged'].append( time.monotonic() - test_start )
+                hit_at['unchanged'].append( clock.now() - test_start )
             if changed():
-                #print("<<hit chagned", time.monotonic() - test_start )
-                hit_at['changed'].append( time.monotonic() - test_start )
+                hit_at['changed'].append( clock.now() - test_start )
+            self.now()
 
         self.do_intervals_match( 'unchanged', hit_at['unchanged'], [unchanged_interval] )
-        print( "ci", changed.interval)
         self.do_intervals_match( 'changed', hit_at['changed'], [changed_interval] )
 
     def do_intervals_match(self, prefix_msg, actual, want ):
@@ -128,10 +128,27 @@ class LightweightTimerTests(unittest.TestCase):
 
         for i,an_actual in enumerate(actual):
             if len(want) > i:
-                isclose.append( math.isclose(an_actual, want[i], rel_tol=0.1, abs_tol=0.001) )
+                isclose.append( math.isclose(an_actual, want[i], rel_tol=0.0, abs_tol=Step * 2) )
                 is_ok = is_ok and isclose[-1]
 
         assert is_ok and len(actual) == len(want), "Expected %s to be ~ %s, but got %s (%s)" % (prefix_msg, want, actual, isclose)
 
+    def testDeadline(self):
+        tester = Timer(0.05, clock=self.clock)
+        assert tester.deadline() is None, "No deadline till .start()"
+        assert tester.remaining() is None
+        tester.start()
+        assert math.isclose(tester.deadline(), tester.last + 0.05, abs_tol=0.0001)
+        assert math.isclose(tester.remaining(), 0.05, abs_tol=0.000001), "All of the duration left, saw %s" % tester.remaining()
+
+    def testSharedNow(self):
+        tester = Timer(0.5)
+        tester.start(100.0)
+        assert tester.last == 100.0
+        assert tester.remaining(100.25) == 0.25
+        assert not tester(100.49)
+        assert tester(100.5), "Fires at the given now"
+        assert not tester.running
+
 if __name__ == "__main__":
     unittest.main() # run all tests
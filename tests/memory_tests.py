@@ -0,0 +1,124 @@
+import unittest
+import sys, os, platform, tracemalloc
+from every.every import Every, Timer, SlottedEvery, SlottedTimer, COALESCE, SKIP
+from every.clock import VirtualClock
+from every import lightweight_every, lightweight_timer
+
+# bytes for the object itself, 64-bit CPython (sys.getsizeof: header + 8 per slot)
+# keep in sync with the README
+Budget = {
+    SlottedEvery : 88,
+    SlottedTimer : 88,
+    lightweight_every.SlottedEvery : 56,
+    lightweight_timer.SlottedTimer : 64,
+    }
+
+Regular = {
+    SlottedEvery : Every,
+    SlottedTimer : Timer,
+    lightweight_every.SlottedEvery : lightweight_every.Every,
+    lightweight_timer.SlottedTimer : lightweight_timer.Timer,
+    }
+
+# everything allocated per object (tracemalloc, bytes_per_object()), 64-bit CPython 3.11
+# including the float for .last, and the interval tuple, with a little room. Keep in sync with the README
+Whole = [
+    # class, interval, budget
+    ( Every, (1.5,), 224 ),
+    ( Timer, (1.5,), 232 ),
+    ( Every, (0.5, 0.1), 224 ),
+    ( SlottedEvery, (1.5,), 176 ),
+    ( SlottedTimer, (1.5,), 184 ),
+    ( SlottedEvery, (0.5, 0.1), 184 ),
+    ( lightweight_every.Every, (1.5,), 144 ),
+    ( lightweight_every.SlottedEvery, (1.5,), 104 ),
+    ( lightweight_timer.Timer, (1.5,), 128 ),
+    ( lightweight_timer.SlottedTimer, (1.5,), 88 ),
+    ]
+
+def bytes_per_object(a_class, interval=(1.5,), count=10000):
+    # everything allocated per object, including its dict, floats and tuples
+    tracemalloc.start()
+    objects = [ a_class(*interval) for x in range(count) ]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / count
+
+class SlottedTests(unittest.TestCase):
+
+    def testNoDict(self):
+        for a_class in Budget:
+            tester = a_class(1.5)
+            assert not hasattr(tester, '__dict__'), "%s has no __dict__" % a_class.__name__
+            self.assertRaises(AttributeError, setattr, tester, 'something', 1)
+            assert hasattr( Regular[a_class](1.5), '__dict__' ), "The usual %s does" % Regular[a_class].__name__
+
+    def testPublicAttributes(self):
+        tester = SlottedEvery(0.5, 0.1)
+        assert tester.interval == (0.5, 0.1)
+        assert tester.i == 1
+        assert tester.running
+        assert tester()
+        tester.interval = 0.2
+        assert tester.interval == (0.2,)
+
+        timer = SlottedTimer(0.5)
+        assert timer.interval == (0.5, 0)
+        assert not timer.running
+        timer.start()
+        assert timer.running
+
+        tester = lightweight_timer.SlottedTimer(0.5)
+        tester.start()
+        assert tester.running and tester.interval == 0.5 and tester.last
+
+    def testExtra(self):
+        # .stats, .catchup, .missed and ._offsets are only stored (in ._extra) when they are needed
+        clock = VirtualClock()
+        tester = SlottedEvery(0.5, clock=clock)
+        assert tester.stats is None and tester.catchup == COALESCE and tester.missed == 0
+        assert tester()
+        clock.advance(0.5)
+        assert tester()
+        tester.stats = None
+        tester.catchup = COALESCE
+        assert tester._extra is None, "Nothing extra for the defaults"
+
+        clock.advance(1.25)
+        assert tester() and tester.missed == 1, "Late, saw %s" % tester.missed
+        assert tester._extra is not None
+        clock.advance(0.25)
+        assert tester() and tester.missed == 0
+
+        assert SlottedEvery(0.5, catchup=SKIP).catchup == SKIP
+
+        # nor the prefix sums, for patterns and timers that don't seek
+        for tester in ( SlottedEvery(0.5, 0.25, clock=clock), SlottedTimer(0.5, clock=clock) ):
+            tester.start()
+            clock.advance(0.5)
+            assert tester()
+            assert tester._extra is None, "Nothing extra for %s" % (tester.interval,)
+        assert '_offsets' not in SlottedEvery.__slots__
+
+    @unittest.skipUnless( platform.python_implementation() == 'CPython' and sys.maxsize > 2**32, "64-bit CPython sizes")
+    def testBudget(self):
+        for a_class, budget in Budget.items():
+            size = sys.getsizeof( a_class(1.5) )
+            assert size <= budget, "%s.%s is %s bytes, budget %s" % (a_class.__module__, a_class.__name__, size, budget)
+
+    @unittest.skipUnless( platform.python_implementation() == 'CPython' and sys.maxsize > 2**32, "64-bit CPython sizes")
+    def testWholeBudget(self):
+        # sys.getsizeof() doesn't see what the object points to (tuples, floats), this does
+        for a_class, interval, budget in Whole:
+            size = bytes_per_object(a_class, interval)
+            assert size <= budget, "%s.%s%s is %s bytes, budget %s" % (a_class.__module__, a_class.__name__, interval, size, budget)
+
+    @unittest.skipUnless( platform.python_implementation() == 'CPython', "CPython memory")
+    def testSmallerThanRegular(self):
+        for a_class in Budget:
+            slotted = bytes_per_object(a_class)
+            regular = bytes_per_object(Regular[a_class])
+            assert slotted < regular, "%s: %s < %s bytes per object" % (a_class.__name__, slotted, regular)
+
+if __name__ == "__main__":
+    unittest.main() # run all tests
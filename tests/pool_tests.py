@@ -0,0 +1,130 @@
+import unittest
+import sys, os
+from every.every import Every, Timer
+from every.pool import PoolScheduler, SKIP_IF_RUNNING, QUEUE, CONCURRENT
+import time, math, threading
+
+class PoolSchedulerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+        self.calls = []
+        self.running = 0
+        self.most_running = 0
+
+    def tearDown(self):
+        self.release.set()
+
+    def slow(self, an_every):
+        # blocks till self.release
+        with self.lock:
+            self.calls.append(an_every)
+            self.running += 1
+            self.most_running = max(self.most_running, self.running)
+        self.release.wait(5)
+        with self.lock:
+            self.running -= 1
+
+    def fire_twice(self, scheduler, an_every):
+        # fire at 1000.0, and again at 1001.0, without waiting for the callbacks
+        an_every.start(999.0)
+        scheduler.reschedule(an_every)
+        assert scheduler.run_pending(1000.0) == 1
+        assert scheduler.run_pending(1001.0) == 1, "Fires even though the callback is still running"
+
+    def wait_for(self, predicate):
+        start = time.monotonic()
+        while not predicate():
+            assert time.monotonic() - start < 5, "Timed out"
+            time.sleep(0.001)
+
+    def testDoesntWait(self):
+        scheduler = PoolScheduler(max_workers=2)
+        fast_calls = []
+        slow = scheduler.add( Every(1), self.slow )
+        fast = scheduler.add( Every(1), lambda an_every: fast_calls.append(an_every) )
+        for an_every in (slow, fast):
+            an_every.start(999.0)
+            scheduler.reschedule(an_every)
+
+        start = time.monotonic()
+        assert scheduler.run_pending(1000.0) == 2
+        assert time.monotonic() - start < 0.5, "Didn't wait for the slow callback"
+        self.wait_for( lambda: fast_calls )
+        assert scheduler.busy(slow) == 1 and scheduler.busy(fast) == 0
+
+        self.release.set()
+        scheduler.shutdown()
+        assert scheduler.busy(slow) == 0
+        assert self.calls == [slow]
+
+    def testSkipIfRunning(self):
+        scheduler = PoolScheduler(max_workers=4)
+        tester = scheduler.add( Every(1), self.slow ) # default overlap
+        self.fire_twice(scheduler, tester)
+        assert scheduler.skipped[tester] == 1, "Dropped the 2nd, saw %s" % scheduler.skipped[tester]
+        self.release.set()
+        scheduler.shutdown()
+        assert len(self.calls) == 1
+
+    def testQueue(self):
+        scheduler = PoolScheduler(max_workers=4)
+        tester = scheduler.add( Every(1), self.slow, overlap=QUEUE )
+        self.fire_twice(scheduler, tester)
+        assert scheduler.queued[tester] == 1
+        self.release.set()
+        scheduler.shutdown()
+        assert len(self.calls) == 2, "Ran both, saw %s" % len(self.calls)
+        assert self.most_running == 1, "One at a time"
+        assert scheduler.skipped[tester] == 0
+
+    def testConcurrent(self):
+        scheduler = PoolScheduler(max_workers=4)
+        tester = scheduler.add( Every(1), self.slow, overlap=CONCURRENT )
+        self.fire_twice(scheduler, tester)
+        self.wait_for( lambda: self.running == 2 )
+        assert scheduler.busy(tester) == 2
+        self.release.set()
+        scheduler.shutdown()
+        assert len(self.calls) == 2
+
+    def testError(self):
+        errors = []
+        class Recorder(PoolScheduler):
+            def error(self, an_every, exception):
+                errors.append( (an_every, exception) )
+        def broken(an_every):
+            raise ValueError("broken")
+
+        scheduler = Recorder(max_workers=1)
+        tester = scheduler.add( Timer(1), broken )
+        scheduler.start(tester, 999.0)
+        scheduler.run_pending(1000.0)
+        scheduler.shutdown()
+        assert len(errors) == 1 and errors[0][0] is tester and isinstance(errors[0][1], ValueError)
+        assert scheduler.busy(tester) == 0, "Still cleaned up"
+
+    def testSubmitFails(self):
+        scheduler = PoolScheduler(max_workers=1)
+        tester = scheduler.add( Every(1), self.slow )
+        scheduler.shutdown()
+        tester.start(999.0)
+        scheduler.reschedule(tester)
+        self.assertRaises( RuntimeError, scheduler.run_pending, 1000.0 ) # can't submit after shutdown
+        assert scheduler.busy(tester) == 0, "Not counted as running"
+        assert self.calls == []
+        assert scheduler.next_deadline() is not None, "Still scheduled"
+
+    def testRemove(self):
+        scheduler = PoolScheduler(max_workers=1)
+        tester = scheduler.add( Every(1), self.slow, overlap=QUEUE )
+        self.fire_twice(scheduler, tester)
+        scheduler.remove(tester)
+        self.release.set()
+        scheduler.shutdown()
+        assert len(self.calls) == 1, "Queued callbacks dropped"
+        assert len(scheduler) == 0
+
+if __name__ == '__main__':
+    unittest.main()
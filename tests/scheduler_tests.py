@@ -0,0 +1,185 @@
+import unittest
+import sys, os
+from every.every import Every, Timer
+from every.lightweight_every import Every as LightweightEvery
+from every.lightweight_timer import Timer as LightweightTimer
+from every.scheduler import Scheduler
+from every.clock import VirtualClock
+import time, math, random
+
+# each pass of a polling loop takes this long, on the VirtualClock
+Step = 0.0005
+
+class SchedulerTests(unittest.TestCase):
+    # on a VirtualClock: polling loops advance it by Step, instead of spinning on the real time
+    def setUp(self):
+        self.clock = VirtualClock()
+
+    def now(self):
+        # a pass of the polling loop
+        return self.clock.advance(Step)
+
+    def run_for(self, scheduler, duration):
+        start = self.clock.now()
+        while self.clock.now() - start < duration:
+            scheduler.run_pending()
+            self.now()
+
+    def testFiresOnlyDue(self):
+        hits = {}
+        def hit(an_every):
+            hits[an_every] = hits.get(an_every, 0) + 1
+
+        clock = self.clock
+        scheduler = Scheduler(clock=clock)
+        fast = scheduler.add( Every(0.05, clock=clock), hit )
+        slow = scheduler.add( Every(10, clock=clock), hit )
+        scheduler.run_pending() # both fire instantly
+        assert hits == { fast:1, slow:1 }, "Both fire instantly, saw %s" % hits
+
+        # lots of never-due objects don't get called
+        called = []
+        class Spy(Every):
+            def __call__(self, now=None):
+                called.append(self)
+                return super().__call__(now)
+        idle = [ Spy(100, clock=clock) for x in range(100) ]
+        for an_every in idle:
+            an_every.start()
+            scheduler.add( an_every, hit )
+
+        self.run_for(scheduler, 0.12)
+        assert hits[fast] == 3, "fast fired at 0, 0.05, 0.1, saw %s" % hits[fast]
+        assert hits[slow] == 1
+        assert called == [], "Not-due objects are never polled, saw %s" % len(called)
+
+    def testTimerStartRestart(self):
+        hits = []
+        clock = self.clock
+        scheduler = Scheduler(clock=clock)
+        timer = scheduler.add( Timer(0.05, clock=clock), hits.append )
+        assert scheduler.next_deadline() is None, "Timers aren't scheduled till .start()"
+
+        start = clock.now()
+        scheduler.start( timer )
+        while not hits and self.now() - start < 1:
+            scheduler.run_pending()
+        assert math.isclose(clock.now()-start, 0.05, abs_tol=Step), "Fired after ~0.05, actually %s" % (clock.now()-start)
+        assert scheduler.next_deadline() is None, "Finished timers drop out"
+
+        # restart halfway: the old entry is stale
+        start = clock.now()
+        scheduler.start( timer )
+        self.run_for(scheduler, 0.03)
+        scheduler.start( timer )
+        while len(hits) < 2 and self.now() - start < 1:
+            scheduler.run_pending()
+        assert math.isclose(clock.now()-start, 0.08, abs_tol=Step * 2), "Restart fired after ~0.08, actually %s" % (clock.now()-start)
+        assert len(scheduler.heap) <= 1, "stale entries are discarded as they come up"
+
+    def testReschedule(self):
+        hits = []
+        scheduler = Scheduler(clock=self.clock)
+        tester = scheduler.add( Every(10, clock=self.clock), hits.append )
+        scheduler.run_pending()
+        assert len(hits) == 1
+
+        # shorter interval behind the scheduler's back, then tell it
+        tester.interval = 0.05
+        scheduler.reschedule( tester )
+        self.run_for(scheduler, 0.07)
+        assert len(hits) == 3, "Fires immediately on .interval=, then at 0.05, saw %s" % len(hits)
+
+    def testWaitVirtual(self):
+        # VirtualClock.sleep() just advances it, to exactly the deadline
+        clock = self.clock
+        hits = []
+        scheduler = Scheduler(clock=clock)
+        scheduler.add( Every(0.25, clock=clock), hits.append )
+        scheduler.run_pending()
+        assert scheduler.wait() == 0.25
+        assert clock.now() == 0.25
+        assert scheduler.run_pending() == 1, "And it's due"
+        assert scheduler.wait(max_sleep=0.125) == 0.125, "Limited by max_sleep"
+
+    def testWait(self):
+        # the real clock: only lower bounds, a busy machine can oversleep
+        hits = []
+        scheduler = Scheduler()
+        scheduler.add( Every(0.05), hits.append )
+        scheduler.run_pending()
+
+        start = time.monotonic()
+        slept = scheduler.wait()
+        assert time.monotonic()-start >= 0.045, "Slept till the deadline, actually %s" % (time.monotonic()-start)
+        assert scheduler.run_pending() == 1, "And it's due"
+
+        start = time.monotonic()
+        assert scheduler.wait(max_sleep=0.01) == 0.01, "Limited by max_sleep"
+        assert time.monotonic()-start >= 0.009
+
+    def testCallbackRaises(self):
+        # a callback that raises once: reported, and the object keeps firing
+        errors = []
+        class Quiet(Scheduler):
+            def error(self, an_every, exception):
+                errors.append(exception)
+        fires = []
+        def flaky(an_every):
+            fires.append( self.clock.now() )
+            if len(fires) == 1:
+                raise ValueError("once")
+        scheduler = Quiet(clock=self.clock)
+        tester = scheduler.add( Every(0.25, clock=self.clock), flaky )
+        scheduler.add( Every(0.25, clock=self.clock), lambda an_every: None )
+        self.run_for(scheduler, 1.01)
+        assert len(errors) == 1 and isinstance(errors[0], ValueError)
+        assert len(fires) == 5, "Still fires, saw %s" % fires
+        assert len(scheduler) == 2 and scheduler.next_deadline() is not None
+
+    def testLightweight(self):
+        hits = []
+        clock = self.clock
+        scheduler = Scheduler(clock=clock)
+        periodic = scheduler.add( LightweightEvery(0.05, clock=clock), hits.append )
+        timer = scheduler.add( LightweightTimer(0.03, clock=clock), hits.append )
+        scheduler.start( timer )
+        self.run_for(scheduler, 0.06)
+        assert hits == [ periodic, timer, periodic ], "Lightweight objects work too, saw %s" % hits
+
+    def testRemove(self):
+        hits = []
+        scheduler = Scheduler(clock=self.clock)
+        tester = scheduler.add( Every(0.01, clock=self.clock), hits.append )
+        scheduler.run_pending()
+        scheduler.remove( tester )
+        self.run_for(scheduler, 0.03)
+        assert len(hits) == 1, "Removed objects don't fire"
+        assert len(scheduler) == 0
+
+    def testSimulatedHours(self):
+        # a big workload, 2 hours of it, without waiting: sleep (advance) from deadline to deadline
+        clock = self.clock
+        rand = random.Random(1)
+        hits = {}
+        def hit(an_every):
+            hits[an_every] = hits.get(an_every, 0) + 1
+
+        scheduler = Scheduler(clock=clock)
+        # intervals that are exact in binary, so no float fuzz
+        everies = [ scheduler.add( Every( rand.choice( (2.5, 5, 10, 30, 60, 300) ), clock=clock), hit ) for x in range(100) ]
+        for an_every in everies:
+            scheduler.start(an_every)
+
+        hours = 2 * 60 * 60
+        while clock.now() < hours:
+            scheduler.run_pending()
+            scheduler.wait()
+        scheduler.run_pending() # the ones due at exactly `hours`
+
+        for an_every in everies:
+            want = hours / an_every.interval[0]
+            assert hits[an_every] == want, "Every fire, %s != %s" % (hits[an_every], want)
+
+if __name__ == "__main__":
+    unittest.main() # run all tests
@@ -0,0 +1,104 @@
+import unittest
+import sys, os
+from every.every import Every, Timer, SKIP
+from every.clock import VirtualClock, TicksMsClock
+import time, math
+
+def walk(pattern, seconds):
+    # the slow way: (step, seconds into it), or (index of the 0, None) for a finished timer
+    i = 0
+    while True:
+        if pattern[i] == 0:
+            return i, None
+        if seconds < pattern[i]:
+            return i, seconds
+        seconds -= pattern[i]
+        i = (i + 1) % len(pattern)
+
+class SeekTests(unittest.TestCase):
+
+    def testOffsets(self):
+        assert Every(0.5)._offsets is None, "Not for a single interval"
+        assert Every(1, 2, 3)._offsets == (0, 1, 3, 6), "Prefix sums, saw %s" % (Every(1, 2, 3)._offsets,)
+        assert Timer(1, 2)._offsets == (0, 1, 3), "Stop at the 0"
+        assert Every(1, 0, 3)._offsets == (0, 1), "Stop at the first 0"
+        tester = Every(1, 2)
+        assert tester._extra is None, "Not compiled till needed"
+        assert tester._offsets == (0, 1, 3)
+        tester.interval = (4, 5, 6)
+        assert tester._offsets == (0, 4, 9, 15), "Recompiled by .interval="
+
+    def testStepAtMatchesWalking(self):
+        pattern = tuple( 1 + (x % 7) for x in range(200) ) # integers, so exact
+        tester = Every(*pattern)
+        period = sum(pattern)
+        for seconds in (0, 1, 2, 3, 100, period - 1, period, period + 1, 5 * period + 333, 12345):
+            periods, i, into = tester._step_at(seconds)
+            expect_i, expect_into = walk(pattern, seconds)
+            assert (i, into) == (expect_i, expect_into), "At %s, saw %s %s, expected %s %s" % (seconds, i, into, expect_i, expect_into)
+            assert periods == seconds // period
+
+        timer = Timer(*pattern)
+        for seconds in (0, 1, 100, period - 1):
+            periods, i, into = timer._step_at(seconds)
+            assert (i, into) == walk(pattern, seconds)
+        periods, i, into = timer._step_at(period + 5)
+        assert i == len(pattern), "Finished timer is at its 0, saw %s" % i
+
+    def testSeek(self):
+        clock = VirtualClock(1000.0)
+        tester = Every(0.5, 0.25, 1, 0.25, clock=clock) # period 2
+        assert tester.seek(2 * 10 + 0.875) is tester
+        assert tester.i == 2, "In the 3rd step, saw %s" % tester.i
+        assert tester.last == clock.time - 0.125, "Started 0.125 ago, saw %s" % (clock.time - tester.last)
+        assert tester.remaining() == 0.875
+        clock.advance(0.875)
+        assert tester() and tester.i == 3
+
+        tester.seek(0)
+        assert tester.i == 0 and tester.last == clock.time, "Like .start()"
+
+        tester = Every(2, clock=clock)
+        tester.seek(5)
+        assert tester.i == 0 and tester.last == clock.time - 1, "Single interval"
+
+    def testSeekTimer(self):
+        clock = VirtualClock(1000.0)
+        tester = Timer(1, 2, clock=clock)
+        assert not tester.running
+        tester.seek(1.5)
+        assert tester.running and tester.i == 1, "Seek runs it"
+        assert tester.last == clock.time - 0.5
+        tester.seek(3)
+        assert not tester.running and tester.i == 2, "Past the end, it is finished"
+        assert not tester()
+
+    def testSeekNow(self):
+        clock = VirtualClock(1000.0)
+        tester = Every(1, 2, clock=clock)
+        tester.seek(1.5, now=50)
+        assert tester.i == 1 and tester.last == 49.5, "Relative to the now given"
+
+    def testSeekTicks(self):
+        clock = TicksMsClock( ticks_ms=lambda: 10, period=1 << 12 )
+        tester = Every(1, 0.5, clock=clock)
+        tester.seek(4.2) # 1.5 * 2, 1.0, then 0.2 into the 0.5
+        assert tester.i == 1, "Saw %s" % tester.i
+        assert tester.last == (10 - 200) & ((1 << 12) - 1), "Integer and wrapped, saw %s" % tester.last
+
+    def testSkipLongPattern(self):
+        # the SKIP catch-up uses the same search
+        clock = VirtualClock(1000.0)
+        pattern = tuple( 1 + (x % 7) for x in range(500) )
+        tester = Every(*pattern, clock=clock, catchup=SKIP)
+        tester.start()
+        elapsed = 3 * sum(pattern) + 1234
+        clock.advance(elapsed)
+        assert tester()
+        i, into = walk(pattern, elapsed)
+        assert tester.i == i, "Saw %s, expected %s" % (tester.i, i)
+        assert tester.last == clock.time - into
+        assert tester.missed == 3 * len(pattern) + i - 1, "Steps skipped, saw %s" % tester.missed
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import sys, os
+from every.every import Every, Timer
+from every.scheduler import Scheduler
+from every.selector import TimerSelector
+from every.clock import VirtualClock
+import time, socket, selectors
+
+class FakeSelector(selectors.DefaultSelector):
+    # "blocks" by advancing a VirtualClock by the timeout
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+        self.timeouts = []
+
+    def select(self, timeout=None):
+        self.timeouts.append(timeout)
+        if timeout:
+            self.clock.advance(timeout)
+        return []
+
+class TimeoutTests(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.scheduler = Scheduler(clock=self.clock)
+        self.fake = FakeSelector(self.clock)
+        self.sel = TimerSelector( self.scheduler, self.fake )
+        self.fires = []
+
+    def tearDown(self):
+        self.sel.close()
+
+    def testNoTimerfd(self):
+        # not the time.monotonic() clock
+        assert self.sel.timerfd is None
+
+    def testTimeout(self):
+        sel = self.sel
+        assert sel.timeout() is None, "Nothing scheduled: forever"
+        assert sel.timeout(2) == 2
+        self.scheduler.start( self.scheduler.add( Every(0.5, clock=self.clock), self.fires.append ) )
+        assert sel.timeout() == 0.5
+        assert sel.timeout(0.25) == 0.25, "No more than the given timeout"
+
+    def testSelect(self):
+        sel = self.sel
+        self.scheduler.start( self.scheduler.add( Every(0.5, clock=self.clock), self.fires.append ) )
+        self.scheduler.start( self.scheduler.add( Every(0.75, clock=self.clock), self.fires.append, slack=0.25 ) )
+        for x in range(4):
+            assert sel.select() == []
+        assert self.fake.timeouts == [0.5, 0.5, 0.5, 0.5], "Blocks exactly till the next wakeup, saw %s" % self.fake.timeouts
+        assert self.clock.now() == 2.0
+        assert len(self.fires) == 6, "Slack shares the 1.0 and 2.0 wakeups, saw %s" % len(self.fires)
+
+    def testCallbackRaises(self):
+        fires = []
+        def flaky(an_every):
+            fires.append( self.clock.now() )
+            raise ValueError("always")
+        self.scheduler.error = lambda an_every, exception: None
+        self.scheduler.start( self.scheduler.add( Every(0.5, clock=self.clock), flaky ) )
+        for x in range(3):
+            self.sel.select()
+        assert fires == [0.5, 1.0, 1.5], "Keeps firing, saw %s" % fires
+
+class RealSelectorTests(unittest.TestCase):
+    # real clock and sockets
+
+    def check(self, sel):
+        fires = []
+        a, b = socket.socketpair()
+        try:
+            sel.register( a, selectors.EVENT_READ, 'a' )
+            sel.scheduler.start( sel.scheduler.add( Timer(0.05), fires.append ) )
+
+            # wakes for the timer, no I/O
+            start = time.monotonic()
+            assert sel.select(timeout=1) == []
+            elapsed = time.monotonic() - start
+            assert len(fires) == 1, "Fired"
+            assert 0.045 <= elapsed < 0.5, "Woke for the deadline, after %s" % elapsed
+
+            # wakes for the I/O
+            b.send(b'x')
+            ready = sel.select(timeout=1)
+            assert [ key.data for key, events in ready ] == ['a'], "Only the I/O, saw %s" % ready
+            a.recv(1)
+
+            # nothing due, no I/O
+            start = time.monotonic()
+            assert sel.select(timeout=0.02) == []
+            assert time.monotonic() - start >= 0.015
+        finally:
+            sel.close()
+            a.close()
+            b.close()
+
+    def testComputedTimeout(self):
+        self.check( TimerSelector(timerfd=False) )
+
+    def testTimerfd(self):
+        if not hasattr(os, 'timerfd_create'):
+            self.skipTest("No os.timerfd_create (linux, python 3.13+)")
+        sel = TimerSelector()
+        assert sel.timerfd is not None and sel.fileno() == sel.timerfd
+        self.check(sel)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import sys, os
+from every.every import Every, Timer
+from every.shards import ShardedScheduler
+import time, math
+
+# callbacks are pickled to the shards, so module-level
+
+def pid(an_every):
+    return os.getpid()
+
+def index(an_every):
+    return an_every.i
+
+def broken(an_every):
+    raise ValueError("broken")
+
+class ShardedSchedulerTests(unittest.TestCase):
+
+    def collect(self, shards, count, duration=5):
+        # at least count results, or give up after duration
+        results = []
+        start = time.monotonic()
+        while len(results) < count and time.monotonic() - start < duration:
+            results += shards.results(timeout=0.05)
+        return results
+
+    def testSpreadsOverShards(self):
+        shards = ShardedScheduler(processes=2, report=0.05)
+        try:
+            everies = [ shards.add( Every(0.01), pid ) for x in range(4) ]
+            assert len(shards) == 4
+            assert sorted(shards.loads) == [2, 2], "Balanced, saw %s" % shards.loads
+
+            results = self.collect(shards, 40)
+            assert len(results) >= 40, "Saw %s results" % len(results)
+            pids = set( result for an_every, i, result in results )
+            assert len(pids) == 2 and os.getpid() not in pids, "Ran in 2 other processes, saw %s" % pids
+            assert set( an_every for an_every, i, result in results ) == set(everies), "Results are for the parent's objects"
+
+            time.sleep(0.1)
+            stats = shards.stats()
+            assert sorted(stats.keys()) == [0, 1], "Stats from each shard, saw %s" % stats.keys()
+            assert stats[0]['fires'] > 0
+        finally:
+            shards.shutdown()
+        for process in shards.processes:
+            assert not process.is_alive()
+
+    def testControl(self):
+        shards = ShardedScheduler(processes=1)
+        try:
+            timer = shards.add( Timer(0.05, 0.05), index )
+            assert shards.results(timeout=0.2) == [], "Timers wait for .start()"
+
+            shards.start(timer)
+            results = self.collect(shards, 2)
+            assert [ (an_every, i) for an_every, i, result in results ] == [ (timer, 1), (timer, 2) ], "Both steps, saw %s" % results
+
+            shards.set_interval(timer, (0.02, 0))
+            shards.start(timer)
+            results = self.collect(shards, 1)
+            assert len(results) == 1
+
+            shards.remove(timer)
+            assert len(shards) == 0 and shards.loads == [0]
+        finally:
+            shards.shutdown()
+
+    def testError(self):
+        errors = []
+        class Recorder(ShardedScheduler):
+            def error(self, an_every, text):
+                errors.append( (an_every, text) )
+        shards = Recorder(processes=1)
+        try:
+            tester = shards.add( Timer(0.01), broken )
+            shards.start(tester)
+            start = time.monotonic()
+            while not errors and time.monotonic() - start < 5:
+                shards.results(timeout=0.05)
+            assert errors and errors[0][0] is tester and 'ValueError' in errors[0][1], "Saw %s" % errors
+        finally:
+            shards.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
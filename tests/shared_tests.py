@@ -0,0 +1,78 @@
+import unittest
+import sys, os
+from every.every import Every, Timer
+from every.shared import SharedTimers
+from every.clock import VirtualClock
+import time, multiprocessing
+
+def claim(table, duration, results):
+    # poll gate 0 as fast as we can, and report the .last of each fire we got
+    gate = table.gate(0)
+    got = []
+    end = time.monotonic() + duration
+    while time.monotonic() < end:
+        if gate():
+            got.append( gate.last )
+    results.put( (os.getpid(), got) )
+    table.close()
+
+class SharedTimersTests(unittest.TestCase):
+
+    def testLikeEvery(self):
+        # the same fires as the Every's
+        clock = VirtualClock()
+        patterns = [ 0.5, (0.5, 0.25), (0.75, 0) ]
+        table = SharedTimers( patterns, clock=clock )
+        try:
+            everies = [ Every(0.5, clock=clock), Every(0.5, 0.25, clock=clock), Timer(0.75, clock=clock) ]
+            gates = [ table.gate(k) for k in range(len(table)) ]
+            everies[2].start()
+            gates[2].start()
+            for step in range(40):
+                for an_every, gate in zip(everies, gates):
+                    fired = an_every()
+                    assert gate() == fired, "At %s, %s fired: %s" % (clock.now(), an_every.interval, fired)
+                    assert (gate.i, gate.last, gate.running) == (an_every.i, an_every.last, an_every.running)
+                clock.advance(0.125)
+            assert gates[1].deadline() == everies[1].deadline()
+            assert gates[2].remaining() is None
+        finally:
+            table.unlink()
+
+    def testSetInterval(self):
+        clock = VirtualClock()
+        table = SharedTimers( [1], steps=3, clock=clock )
+        try:
+            gate = table.gate(0)
+            assert gate()
+            gate.interval = (0.25, 0.5, 0)
+            assert gate.interval == (0.25, 0.5, 0) and not gate.running
+            self.assertRaises( Exception, table.set_interval, 0, (1, 2, 3, 4) )
+        finally:
+            table.unlink()
+
+    def testExactlyOnce(self):
+        # several processes polling one gate: each fire is seen by only one of them
+        table = SharedTimers( [0.02] )
+        results = multiprocessing.Queue()
+        try:
+            processes = [ multiprocessing.Process( target=claim, args=(table, 0.5, results) ) for x in range(4) ]
+            for process in processes:
+                process.start()
+            fires = []
+            for process in processes:
+                pid, got = results.get(timeout=10)
+                fires += got
+            for process in processes:
+                process.join()
+
+            assert len(fires) == len(set(fires)), "No fire claimed twice"
+            # at most one per interval, over the time the processes were polling
+            span = max(fires) - min(fires)
+            assert len(fires) <= round(span / 0.02) + 1, "%s fires in %s seconds" % (len(fires), span)
+            assert len(fires) >= 15, "About one per interval, saw %s" % len(fires)
+        finally:
+            table.unlink()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import sys, os
+from every.every import Every, Timer, SKIP
+from every.snapshot import dumps, loads, save, load, elapsed, HEADER, RECORD
+from every.clock import VirtualClock
+import time, tempfile
+
+class SnapshotTests(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock()
+
+    def make(self, clock):
+        return [
+            Every(1, clock=clock),
+            Every(0.5, 0.25, clock=clock, catchup=SKIP),
+            Timer(2, clock=clock), # never started
+            Timer(2, clock=clock), # started
+            Timer(0.5, clock=clock), # started, will finish while down
+            ]
+
+    def snapshot(self):
+        clock = self.clock
+        everies = self.make(clock)
+        everies[3].start()
+        everies[4].start()
+        clock.advance(0.25)
+        for an_every in everies:
+            an_every()
+        clock.advance(0.125) # 0.375 into the 1's, 0.125 into the 0.25 step
+        return everies, dumps(everies)
+
+    def testFormat(self):
+        everies, snapshot = self.snapshot()
+        # 4 distinct patterns
+        patterns = 8*1+2 + 8*2+2 + 8*2+2 + 8*2+2
+        assert len(snapshot) == HEADER.size + 5 * RECORD.size + patterns, "Compact, saw %s bytes" % len(snapshot)
+        self.assertRaises( Exception, loads, b'nope' + snapshot[4:] )
+
+    def testInPlace(self):
+        everies, snapshot = self.snapshot()
+
+        # restart: the clock has moved on, and the objects are made again
+        clock = VirtualClock(50.0)
+        again = self.make(clock)
+        assert loads( snapshot, again, down=10.0 ) is again
+
+        # as if the 10 seconds went by: phase kept, nothing is due now
+        assert again[0].deadline() == 50.625, "saw %s" % again[0].deadline()
+        assert again[1].catchup == SKIP
+        # 0.375 into the 0.75 period, +10 = 0.375 into the 14th period: in the 0.25 step, 0.125 into it
+        assert again[1].i == 1 and again[1].deadline() == 50.125, "saw %s %s" % (again[1].i, again[1].deadline())
+        assert not again[2].running, "Not started stays not started"
+        assert not any( an_every() for an_every in again[:3] ), "No stampede"
+
+        assert again[3].running and again[3].deadline() == 50.0, "Due now"
+        assert again[4].running and again[4].deadline() == 50.0, "Finished while down: due now"
+        assert again[4]() and not again[4].running, "fires once"
+
+    def testNew(self):
+        everies, snapshot = self.snapshot()
+        clock = VirtualClock(50.0)
+        again = loads( snapshot, clock=clock, down=0.5 )
+        assert [ an_every.interval for an_every in again ] == [ an_every.interval for an_every in everies ]
+        assert again[0].deadline() == 50.125
+        assert type(again[3]) is Every and not again[2].running, "Timers are Every(..., 0)"
+
+    def testMismatch(self):
+        everies, snapshot = self.snapshot()
+        self.assertRaises( Exception, loads, snapshot, everies[:2] )
+
+    def testFile(self):
+        clock = VirtualClock()
+        everies = [ Every( (1, 2, 4)[x % 3], clock=clock ) for x in range(1000) ]
+        for an_every in everies:
+            an_every.seek(0.5)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'timers.snap')
+            save( everies, path )
+            again = load( path, clock=clock, down=0.25 )
+        assert len(again) == 1000
+        assert all( an_every.remaining() == an_every.interval[0] - 0.75 for an_every in again )
+
+    def testElapsed(self):
+        snapshot = dumps( [Every(1)] )
+        down = elapsed(snapshot)
+        assert 0 <= down < 0.5, "Just made, saw %s" % down
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import sys, os
+from every.every import Every, Timer, SlottedEvery
+from every.clock import VirtualClock, TicksMsClock
+from every.stats import TimerStats, snapshots
+import math
+
+class StatsTests(unittest.TestCase):
+
+    def tearDown(self):
+        SlottedEvery.collect_stats = False
+        Every.collect_stats = False
+
+    def testOffByDefault(self):
+        tester = Every(0.01)
+        tester()
+        assert tester.stats is None, "No stats unless asked for"
+
+    def testLatenessAndMissed(self):
+        clock = VirtualClock(1000.0)
+        tester = Every(1.0, clock=clock)
+        tester.stats = TimerStats()
+        tester.start()
+
+        clock.advance(1.0) # on time
+        assert tester()
+        clock.advance(1.25) # late
+        assert tester()
+        clock.advance(0.75 + 3.5) # 3 intervals skipped, and 3.5 late
+        assert tester()
+
+        snapshot = tester.stats.snapshot()
+        assert snapshot['fires'] == 3
+        assert snapshot['missed'] == 3, "3 whole intervals went by without a fire, saw %s" % snapshot['missed']
+        assert math.isclose(snapshot['max'], 3.5), "Max lateness, saw %s" % snapshot['max']
+        assert snapshot['p50'] >= 0.25 and snapshot['p50'] < 0.5, "p50 is the upper edge of the bucket of 0.25, saw %s" % snapshot['p50']
+        assert math.isclose(snapshot['p99'], 3.5), "p99 is capped at max, saw %s" % snapshot['p99']
+        assert sum(snapshot['histogram'].values()) == 3
+
+    def testTimerNeverMisses(self):
+        clock = VirtualClock(1000.0)
+        tester = Timer(1.0, clock=clock)
+        tester.stats = TimerStats()
+        tester.start()
+        clock.advance(5)
+        assert tester()
+        assert tester.stats.missed == 0
+        assert math.isclose(tester.stats.max_late, 4.0)
+
+    def testIntegerClock(self):
+        # integer milliseconds, that a VirtualClock drives
+        virtual = VirtualClock()
+        clock = TicksMsClock( lambda: int(virtual.now() * 1000), 1 << 16 )
+        tester = Every(0.01, clock=clock)
+        tester.stats = TimerStats()
+        assert tester()
+        virtual.advance(0.013)
+        assert tester()
+        assert tester.stats.max_late == 0.003, "Lateness is seconds, saw %s" % tester.stats.max_late
+
+    def testGlobal(self):
+        clock = VirtualClock(1000.0)
+        tester = SlottedEvery(1.0, clock=clock)
+        other = Every(1.0, clock=clock)
+        Every.collect_stats = True # only Every and its subclasses
+        assert tester()
+        assert tester.stats is None, "Not an Every"
+        assert other()
+        assert other.stats.fires == 1, "Stats created on the fire"
+
+        SlottedEvery.collect_stats = True # everything
+        clock.advance(1)
+        assert tester()
+        assert tester.stats.fires == 1
+
+        result = snapshots( [tester, other], reset=True )
+        assert result[other]['fires'] == 1
+        assert other.stats.fires == 0, "Reset"
+
+    def testBuckets(self):
+        stats = TimerStats()
+        assert stats.bucket(0) == 0
+        assert stats.bucket(0.000001) == 0
+        assert stats.bucket(0.0000011) == 1
+        assert stats.bucket(0.000002) == 1, "Exact edge is in the lower bucket"
+        assert stats.bucket(1e9) == stats.Buckets - 1, "Everything bigger"
+
+if __name__ == "__main__":
+    unittest.main() # run all tests
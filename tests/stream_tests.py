@@ -0,0 +1,92 @@
+import unittest
+import sys, os
+from every.every import Every, Timer, BURST
+from every.lightweight_every import Every as LightweightEvery
+from every.lightweight_timer import Timer as LightweightTimer
+from every.clock import VirtualClock
+from every.stats import TimerStats
+from every.stream import fires
+import time, math, tracemalloc, itertools
+
+class StreamTests(unittest.TestCase):
+
+    def make(self, clock):
+        # intervals exact in binary, so a live loop polling every 1/64 second hits each deadline exactly
+        blink = Every(0.5, 0.25, clock=clock)
+        beep = Timer(1, 0.125, clock=clock)
+        beep.start()
+        slow = Every(0.75, clock=clock)
+        slow.start()
+        light = LightweightEvery(0.375, clock)
+        light_timer = LightweightTimer(2, clock)
+        light_timer.start()
+        return [blink, beep, slow, light, light_timer]
+
+    def testMatchesLive(self):
+        clock = VirtualClock()
+        everies = self.make(clock)
+        stream = list( fires(everies, end=10) )
+
+        live = []
+        while clock.now() <= 10:
+            for an_every in everies:
+                if an_every():
+                    live.append( (an_every, getattr(an_every, 'i', None), clock.now()) )
+            clock.advance(1/64)
+        assert stream == live, "Same fires, in the same order"
+
+    def testOriginalsUnchanged(self):
+        clock = VirtualClock()
+        everies = self.make(clock)
+        everies[0].stats = TimerStats()
+        before = [ (an_every.last, getattr(an_every, 'i', None)) for an_every in everies ]
+        assert len( list( fires(everies, end=100) ) ) > 100
+        assert before == [ (an_every.last, getattr(an_every, 'i', None)) for an_every in everies ]
+        assert everies[0].stats.fires == 0, "Doesn't record into your stats"
+
+    def testWindow(self):
+        clock = VirtualClock()
+        tester = Every(1, clock=clock)
+        tester.start()
+        assert [ when for an_every, i, when in fires( [tester], start=0, end=3 ) ] == [1, 2, 3], "End is inclusive"
+
+        # overdue objects fire at start, then keep their drift-correction
+        assert [ when for an_every, i, when in fires( [tester], start=2.5, end=5 ) ] == [2.5, 3, 4, 5]
+
+        timer = Timer(1, 1, clock=clock)
+        assert list( fires( [timer], end=100 ) ) == [], "Not running"
+        timer.start()
+        assert list( fires( [timer], end=100 ) ) == [ (timer, 1, 1), (timer, 2, 2) ], "Both steps, then done"
+
+    def testBurst(self):
+        clock = VirtualClock()
+        tester = Every(1, clock=clock, catchup=BURST)
+        tester.start()
+        assert [ when for an_every, i, when in fires( [tester], start=3, end=4 ) ] == [3, 3, 3, 4], "Catches up at start"
+
+    def testNudge(self):
+        # deadlines that aren't exact in binary: still each fire, at (about) the deadline
+        clock = VirtualClock(1000.0)
+        tester = Every(0.1, clock=clock)
+        tester.start()
+        whens = [ when for an_every, i, when in itertools.islice( fires([tester]), 1000 ) ]
+        assert len(whens) == 1000
+        assert math.isclose(whens[-1], 1100.0, abs_tol=0.000001), "Saw %s" % whens[-1]
+
+    def testConstantMemory(self):
+        clock = VirtualClock()
+        everies = [ Every(0.5 * (x + 1), clock=clock) for x in range(20) ]
+        stream = fires(everies) # forever
+        for fire in itertools.islice(stream, 1000):
+            pass
+        tracemalloc.start()
+        try:
+            for fire in itertools.islice(stream, 20000):
+                pass
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert peak < 10000, "Doesn't grow with the window, peak %s bytes" % peak
+
+if __name__ == '__main__':
+    unittest.main()
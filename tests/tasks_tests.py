@@ -0,0 +1,141 @@
+import unittest
+import sys, os
+from every.every import Every, Timer
+from every.lightweight_timer import SlottedTimer
+from every.tasks import Runner, Task
+from every.clock import VirtualClock, TicksMsClock
+import time, gc
+
+class FakeTicksMs(object):
+    # a ticks_ms() we control
+    def __init__(self, start):
+        self.ticks = start
+    def __call__(self):
+        return self.ticks
+
+class RunnerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = VirtualClock()
+        self.log = []
+
+    def blink(self, name, on, off, times):
+        for x in range(times):
+            self.log.append( (self.clock.now(), name, 'on') )
+            yield on
+            self.log.append( (self.clock.now(), name, 'off') )
+            yield off
+
+    def testSleeps(self):
+        runner = Runner(clock=self.clock)
+        runner.add( self.blink('a', 0.5, 0.25, 2) )
+        runner.add( self.blink('b', 1, 1, 1) )
+        assert len(runner) == 2
+        runner.run()
+        assert len(runner) == 0
+        assert self.log == [
+            (0.0, 'a', 'on'), (0.0, 'b', 'on'),
+            (0.5, 'a', 'off'), (0.75, 'a', 'on'), (1.0, 'b', 'off'), (1.25, 'a', 'off'),
+            ], "Interleaved, at the right times, saw %s" % self.log
+        assert self.clock.now() == 2.0, "Slept till the last yield ran out"
+
+    def testEvery(self):
+        clock = self.clock
+        steps = []
+        def pattern(an_every):
+            for x in range(4):
+                i = yield an_every
+                steps.append( (clock.now(), i) )
+        runner = Runner(clock=clock)
+        runner.add( pattern( Every(0.5, 0.25, clock=clock) ) )
+        runner.run()
+        assert steps == [ (0.0, 0), (0.5, 1), (0.75, 0), (1.25, 1) ], "Resumed on each fire, with .i, saw %s" % steps
+
+    def testTimerNotStarted(self):
+        clock = self.clock
+        timer = Timer(0.5, clock=clock)
+        done = []
+        def waiter():
+            yield timer
+            done.append( clock.now() )
+        runner = Runner(clock=clock)
+        runner.add( waiter() )
+        for x in range(3):
+            runner.run_once()
+            clock.advance(0.25)
+        assert not done, "Waits for .start()"
+        timer.start()
+        assert runner.next_deadline() == 0.5, "Looked at each pass"
+        runner.run_once()
+        assert runner.next_deadline() == 1.25, "Then at its deadline"
+        runner.run()
+        assert done == [1.25]
+
+    def testOnlyDue(self):
+        # a pass only touches the due tasks, and yield None waits for the next pass
+        clock = self.clock
+        resumes = []
+        def sleeper(name, seconds):
+            while True:
+                resumes.append(name)
+                yield seconds
+        def spinner():
+            while True:
+                resumes.append('spin')
+                yield
+        runner = Runner(clock=clock)
+        for x in range(10):
+            runner.add( sleeper(x, 10) )
+        runner.add( spinner() )
+        assert runner.run_once() == 11
+        del resumes[:]
+        clock.advance(1)
+        assert runner.run_once() == 1 and resumes == ['spin'], "Saw %s" % resumes
+
+    def testError(self):
+        errors = []
+        def broken():
+            yield 0.5
+            raise ValueError("broken")
+        class Quiet(Runner):
+            def error(self, task, e):
+                errors.append(e)
+        runner = Quiet(clock=self.clock)
+        runner.add( broken() )
+        runner.add( self.blink('a', 1, 1, 1) )
+        runner.run()
+        assert len(errors) == 1 and isinstance(errors[0], ValueError)
+        assert len(self.log) == 2, "The other task still ran"
+
+    def testNothingAllocated(self):
+        ticks = FakeTicksMs(0)
+        clock = TicksMsClock( ticks_ms=ticks, period=1 << 12 )
+        timer = SlottedTimer(0.003, clock=clock)
+        def sleeper():
+            while True:
+                yield 0.005
+        def waiter():
+            while True:
+                timer.start()
+                yield timer
+        runner = Runner(clock=clock)
+        runner.add( sleeper() )
+        runner.add( waiter() )
+        for x in range(100):
+            ticks.ticks = x
+            runner.run_once()
+        gc.collect()
+        blocks = sys.getallocatedblocks()
+        for x in range(10000):
+            ticks.ticks = x % (1 << 12)
+            runner.run_once()
+        gc.collect()
+        assert sys.getallocatedblocks() - blocks < 10, "Saw %s more blocks" % (sys.getallocatedblocks() - blocks)
+
+    def testSmall(self):
+        # the per-task cost, 64-bit CPython
+        assert not hasattr( Task(None), '__dict__' )
+        assert sys.getsizeof( Task(None) ) <= 64
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import sys, os
+from every.every import Every
+from every.threadsafe import ConcurrentEvery, ConcurrentTimer
+from every.clock import VirtualClock
+import time, threading
+
+class ConcurrentEveryTests(unittest.TestCase):
+
+    def setUp(self):
+        self.switch = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6) # switch threads as often as possible, to provoke races
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch)
+
+    def hammer(self, tester, clock, rounds, threads=8, polls=50, step=0.5):
+        # each round: advance the clock, then all the threads poll. Returns the fires per round
+        barrier = threading.Barrier(threads + 1)
+        fires = [0] * rounds
+        count_lock = threading.Lock()
+        errors = []
+
+        def poll():
+            try:
+                for a_round in range(rounds):
+                    barrier.wait()
+                    mine = sum( 1 for x in range(polls) if tester() )
+                    with count_lock:
+                        fires[a_round] += mine
+                    barrier.wait()
+            except Exception as e:
+                errors.append(e)
+                barrier.abort()
+
+        workers = [ threading.Thread(target=poll) for x in range(threads) ]
+        for worker in workers:
+            worker.start()
+        for a_round in range(rounds):
+            clock.advance(step)
+            barrier.wait() # go
+            barrier.wait() # done
+        for worker in workers:
+            worker.join()
+        assert not errors, errors
+        return fires
+
+    def testExactlyOnce(self):
+        clock = VirtualClock()
+        tester = ConcurrentEvery(0.5, clock=clock)
+        tester() # the immediate one
+        fires = self.hammer(tester, clock, 200)
+        assert fires == [1] * 200, "Exactly one thread sees each fire, saw %s" % [ x for x in fires if x != 1 ]
+
+    def testPatternSteps(self):
+        # .i doesn't skip: each round is one step of the pattern
+        clock = VirtualClock()
+        tester = ConcurrentEvery(0.5, 0.5, 0.5, clock=clock)
+        tester()
+        fires = self.hammer( tester, clock, 60, polls=20 )
+        assert sum(fires) == 60 and tester.i == 0, "saw %s fires, i=%s" % (sum(fires), tester.i)
+
+    def testTimer(self):
+        clock = VirtualClock()
+        tester = ConcurrentTimer(0.5, clock=clock)
+        assert not tester()
+        tester.start()
+        fires = self.hammer(tester, clock, 3)
+        assert fires == [1, 0, 0], "Once, saw %s" % fires
+
+    def testRealClock(self):
+        # free-running threads on the real clock: never more than one fire per interval
+        tester = ConcurrentEvery(0.01)
+        fired = []
+        end = time.monotonic() + 0.3
+        def poll():
+            while time.monotonic() < end:
+                if tester():
+                    fired.append( tester.last )
+        workers = [ threading.Thread(target=poll) for x in range(8) ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        span = max(fired) - min(fired)
+        assert len(fired) <= round(span / 0.01) + 1, "%s fires in %s seconds" % (len(fired), span)
+
+    def testSetInterval(self):
+        clock = VirtualClock()
+        tester = ConcurrentEvery(0.5, 0.5, 0.5, clock=clock)
+        tester.interval = 0.25
+        assert tester.interval == (0.25,) and tester.i == 0
+        assert tester.seek(0.375) is tester and tester.deadline() == 0.125
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import sys, os
+from every.every import Every, Timer
+from every.lightweight_timer import Timer as LightweightTimer
+from every.wait import wait
+from every.clock import VirtualClock
+import time, math
+
+class WaitTests(unittest.TestCase):
+    # on a VirtualClock, so the sleeps are exact (real sleeps overshoot on a busy machine)
+
+    def setUp(self):
+        self.clock = VirtualClock()
+
+    def testWaitEarliest(self):
+        clock = self.clock
+        slow = Every(0.25, clock=clock)
+        fast = Every(0.0625, clock=clock)
+        slow()
+        fast()
+
+        assert wait(slow, fast, clock=clock) == 0.0625
+        assert clock.now() == 0.0625, "Slept till the earliest, actually %s" % clock.now()
+        assert fast(), "And it is due"
+        assert not slow()
+
+    def testDueDoesNotSleep(self):
+        tester = Every(0.5, clock=self.clock) # fires instantly
+        assert wait(tester, clock=self.clock) == 0
+        assert self.clock.now() == 0, "Didn't sleep"
+
+    def testMaxSleep(self):
+        clock = self.clock
+        tester = Every(1, clock=clock)
+        tester.start()
+        assert wait(tester, max_sleep=0.125, clock=clock) == 0.125
+        assert clock.now() == 0.125, "Limited by max_sleep, actually %s" % clock.now()
+
+    def testNotRunning(self):
+        # nothing will fire
+        clock = self.clock
+        assert wait( Timer(0.05, clock=clock), LightweightTimer(0.05, clock=clock), clock=clock ) == 0, "Nothing to wait for"
+        assert clock.now() == 0
+        wait( Timer(0.05, clock=clock), max_sleep=0.125, clock=clock )
+        assert clock.now() == 0.125, "Only max_sleep, actually %s" % clock.now()
+
+    def testTimer(self):
+        clock = self.clock
+        tester = Timer(0.375, clock=clock)
+        tester.start()
+        wait(tester, clock=clock)
+        assert tester(), "Due after the wait"
+        assert clock.now() == 0.375, "Slept the duration, actually %s" % clock.now()
+
+    def testRealSleep(self):
+        # the default: really sleeps. Only a lower bound, a busy machine can oversleep
+        tester = Timer(0.02)
+        tester.start()
+        start = time.monotonic()
+        wait(tester)
+        assert time.monotonic() - start >= 0.019, "Slept, actually %s" % (time.monotonic()-start)
+        assert tester(), "Due after the wait"
+
+    def testVirtualClock(self):
+        # the clock's .sleep(): advances instead of sleeping
+        clock = VirtualClock()
+        slow = Every(1, clock=clock)
+        fast = Every(0.25, clock=clock)
+        slow()
+        fast()
+        start = time.monotonic()
+        assert wait(slow, fast, clock=clock) == 0.25
+        assert clock.now() == 0.25 and fast()
+        assert wait(slow, clock=clock, max_sleep=0.5) == 0.5
+        assert clock.now() == 0.75
+        assert time.monotonic() - start < 0.1, "Didn't really sleep"
+
+if __name__ == "__main__":
+    unittest.main() # run all tests
@@ -0,0 +1,113 @@
+import unittest
+import sys, os
+from every.wheel import TimingWheel
+from every.clock import VirtualClock
+import random
+
+# a wheel tick. Powers of 2, so the float math is exact
+Resolution = 1/1024
+# each pass of a polling loop takes this long, on the VirtualClock
+Step = Resolution / 2
+
+class TimingWheelTests(unittest.TestCase):
+    # on a VirtualClock: polling loops advance it by Step, instead of spinning on the real time
+    def setUp(self):
+        self.clock = VirtualClock()
+
+    def now(self):
+        # a pass of the polling loop
+        return self.clock.advance(Step)
+
+    def testInitialState(self):
+        wheel = TimingWheel(clock=self.clock)
+        tester = wheel.timer(0.05)
+
+        assert not tester(), "Does not fire instantly"
+        assert tester.running == False, "Not running initially"
+        assert tester.interval == (0.05, 0), "Like Timer, a trailing 0"
+
+    def testStart(self):
+        want_interval = 50 * Resolution
+        wheel = TimingWheel(resolution=Resolution, clock=self.clock)
+        tester = wheel.timer(want_interval)
+
+        tester.start()
+        assert tester.running,"Timer is running after .start()"
+        start=self.clock.now()
+        finished = None
+        while( not finished and self.now() - start < want_interval * 2):
+            if tester():
+                finished = self.clock.now()
+                break
+
+        assert finished,"It fired"
+        assert not tester.running, "Timer isn't running after it is done"
+        assert finished-start == want_interval, "Did its duration %s, actually %s" % (want_interval, finished-start)
+        assert not tester(), "Only fires once"
+
+    def testPattern(self):
+        wheel = TimingWheel(resolution=Resolution, clock=self.clock)
+        tester = wheel.timer(20 * Resolution, 30 * Resolution)
+        tester.start()
+
+        start = self.clock.now()
+        hits = []
+        while self.now() - start < 100 * Resolution:
+            if tester():
+                hits.append( (self.clock.now() - start, tester.i) )
+
+        assert [ i for elapsed,i in hits ] == [1,2], "Steps like Timer's .i, saw %s" % hits
+        assert [ elapsed / Resolution for elapsed,i in hits ] == [20, 50], "At the ends of the steps, saw %s" % hits
+
+    def testRestartAbandons(self):
+        wheel = TimingWheel(resolution=Resolution, clock=self.clock)
+        tester = wheel.timer(30 * Resolution)
+
+        start = self.clock.now()
+        tester.start()
+        while self.now() - start < 20 * Resolution:
+            assert not tester()
+        tester.start() # abandon the first one
+        restarted = self.clock.now()
+
+        finished = None
+        while not finished and self.now() - start < 200 * Resolution:
+            if tester():
+                finished = self.clock.now()
+        assert finished-restarted == 30 * Resolution, "Fired relative to the restart, actually %s" % (finished-restarted)
+
+    def testCancel(self):
+        wheel = TimingWheel(resolution=Resolution, clock=self.clock)
+        tester = wheel.timer(10 * Resolution)
+        tester.start()
+        tester.cancel()
+        start = self.clock.now()
+        while self.now() - start < 30 * Resolution:
+            assert not tester(), "Cancelled timers don't fire"
+        assert not tester.running
+
+    def testLevelsAndOverflow(self):
+        # tiny wheel, so most timers have to cascade down, or come from overflow
+        self.levels_and_overflow(levels=2)
+
+    def testOneLevel(self):
+        # no levels to cascade from: everything past one turn is in the overflow
+        self.levels_and_overflow(levels=1)
+
+    def levels_and_overflow(self, levels):
+        clock = VirtualClock()
+        wheel = TimingWheel(resolution=Resolution, slots=4, levels=levels, clock=clock)
+        timers = [ wheel.timer( random.randrange(1, 81) * Resolution ) for x in range(200) ]
+        for a_timer in timers:
+            a_timer.start()
+
+        fired = []
+        while clock.advance(Step) < 100 * Resolution:
+            for a_timer in wheel.advance():
+                fired.append( (clock.now() - a_timer.due, a_timer) )
+
+        assert len(fired) == len(timers), "levels=%s: all fired once, saw %s" % (levels, len(fired))
+        assert all( late == 0 for late,a_timer in fired ), "On their tick, saw %s" % sorted( set( late for late,a_timer in fired ) )
+
+if __name__ == "__main__":
+    unittest.main() # run all tests